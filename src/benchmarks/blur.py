@@ -0,0 +1,61 @@
+import argparse
+
+import cv2
+
+from src.modules.background import BlurBackground, BackgroundProcessor
+from src.modules.segmentation.segmenters.registry import get_segmenter
+
+from .common import DEFAULT_MODEL_PATHS, person_mask, parse_resolution, synthetic_frames
+from .compositing import measure
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Стоимость размытия фона относительно сегментации")
+
+    parser.add_argument('--resolutions', type=parse_resolution, nargs='+', default=[(1280, 720), (1920, 1080)], help='Разрешения кадров, WxH')
+    parser.add_argument('--strengths', type=float, nargs='+', default=[10.0, 25.0, 50.0], help='Сигма размытия в пикселях полного разрешения')
+    parser.add_argument('--frames', type=int, default=50, help='Количество замеров')
+    parser.add_argument('--backend', type=str, default=None, help='Бэкенд сегментации для сравнения; по умолчанию не замеряется')
+    parser.add_argument('--model_path', type=str, default=None, help='Путь до модели сегментации')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    segmentor = None
+    if args.backend:
+        segmentor = get_segmenter(args.backend)(model_path=args.model_path or str(DEFAULT_MODEL_PATHS[args.backend]))
+
+    print(f"{'resolution':>10} {'case':>28} {'p50, ms':>9} {'p95, ms':>9} {'of segm.':>9}")
+
+    for size in args.resolutions:
+        frame = synthetic_frames(1, size)[0]
+        mask = person_mask(size)
+
+        cases = {}
+        if segmentor is not None:
+            cases["segmentation"] = lambda: segmentor.segment(frame)
+
+        for strength in args.strengths:
+            effect = BlurBackground(strength)
+            unmasked = BlurBackground(strength, mask_person=False)
+            processor = BackgroundProcessor(effect, 'soft')
+
+            cases[f"full-res GaussianBlur s={strength:g}"] = lambda s=strength: cv2.GaussianBlur(frame, (0, 0), s)
+            cases[f"pyramid s={strength:g}"] = lambda e=unmasked: e.render(frame)
+            cases[f"pyramid, masked s={strength:g}"] = lambda e=effect: e.render(frame, mask)
+            cases[f"composite, soft s={strength:g}"] = lambda p=processor: p.apply(frame, mask.copy())
+
+        reference = None
+        for name, fn in cases.items():
+            p50, p95 = measure(fn, args.frames)
+            reference = reference or (p50 if name == "segmentation" else None)
+
+            share = f"{p50 / reference:9.1%}" if reference else f"{'-':>9}"
+            print(f"{size[0]}x{size[1]:<5} {name:>28} {p50:9.2f} {p95:9.2f} {share}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import sys
+import json
+import argparse
+import platform
+from datetime import datetime, timezone
+from importlib import metadata
+
+from .stats import peak_rss_mb
+from .suite import bench_effects, bench_pipeline, bench_segmentors, build_frame_sets
+from .common import parse_resolution
+from .compare import compare_results
+
+TRACKED_PACKAGES = ("numpy", "opencv-python", "ultralytics", "torch", "mediapipe", "onnxruntime")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Набор замеров производительности конвейера обработки кадров")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Выполнить замеры")
+    run.add_argument('--backends', type=str, nargs='+', default=['yolo', 'mediapipe'], help='Бэкенды сегментации')
+    run.add_argument('--resolutions', type=parse_resolution, nargs='+', default=[(640, 480), (1280, 720), (1920, 1080)], help='Разрешения кадров, WxH')
+    run.add_argument('--sources', type=str, nargs='*', default=[], help='Записанные видео или директории изображений')
+    run.add_argument('--no_synthetic', action='store_true', help='Не использовать синтетические кадры')
+    run.add_argument('--frames', type=int, default=100, help='Количество кадров в наборе')
+    run.add_argument('--suites', type=str, nargs='+', default=['segmentor', 'effect', 'pipeline'], choices=['segmentor', 'effect', 'pipeline'], help='Группы замеров')
+    run.add_argument('--output', type=str, default=None, help='Путь для сохранения результатов в JSON')
+    run.add_argument('--baseline', type=str, default=None, help='Базовые результаты для проверки регрессий')
+    run.add_argument('--threshold', type=float, default=0.1, help='Допустимое относительное ухудшение')
+
+    compare = subparsers.add_parser("compare", help="Сравнить результаты с базовыми")
+    compare.add_argument('baseline', type=str, help='Базовые результаты')
+    compare.add_argument('current', type=str, help='Текущие результаты')
+    compare.add_argument('--threshold', type=float, default=0.1, help='Допустимое относительное ухудшение')
+
+    return parser.parse_args()
+
+
+def environment() -> dict:
+    """Собирает сведения об окружении, влияющие на сравнимость результатов
+
+    :return dict: Версии Python, платформы и ключевых пакетов
+    """
+    packages = {}
+    for package in TRACKED_PACKAGES:
+        try:
+            packages[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            packages[package] = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "packages": packages,
+    }
+
+
+def run(args) -> dict:
+    frame_sets = build_frame_sets(args.sources, args.resolutions, args.frames, synthetic=not args.no_synthetic)
+
+    results = []
+    if 'segmentor' in args.suites:
+        results += bench_segmentors(args.backends, frame_sets)
+    if 'effect' in args.suites:
+        results += bench_effects(frame_sets)
+    if 'pipeline' in args.suites:
+        results += bench_pipeline(args.backends, frame_sets)
+
+    return {
+        "meta": environment(),
+        "peak_rss_mb": peak_rss_mb(),
+        "results": results,
+    }
+
+
+def print_results(report: dict) -> None:
+    print(f"{'case':<60} {'p50, ms':>9} {'p95, ms':>9} {'p99, ms':>9} {'fps':>8}")
+
+    for case in report["results"]:
+        if "error" in case:
+            print(f"{case['name']:<60} {case['error']}")
+            continue
+
+        print(f"{case['name']:<60} {case['p50_ms']:9.2f} {case['p95_ms']:9.2f} {case['p99_ms']:9.2f} {case['fps']:8.1f}")
+
+    if report["peak_rss_mb"] is not None:
+        print(f"Пиковый RSS: {report['peak_rss_mb']:.1f} MB")
+
+
+def print_comparison(rows: list[dict]) -> bool:
+    """Печатает сравнение и возвращает признак найденных регрессий
+
+    :param list[dict] rows: Строки сравнения
+    :return bool: True, если есть хотя бы одна регрессия
+    """
+    regressions = [row for row in rows if row["regression"]]
+
+    for row in rows:
+        if row["error"] is not None:
+            print(f"{'РЕГРЕССИЯ' if row['regression'] else 'ОШИБКА'} {row['name']}: {row['error']}")
+        elif row["regression"]:
+            print(
+                f"РЕГРЕССИЯ {row['name']} {row['metric']}: "
+                f"{row['baseline']:.2f} -> {row['current']:.2f} ({row['change']:+.1%})"
+            )
+
+    compared = sum(row["metric"] is not None for row in rows)
+    print(f"Сравнено метрик: {compared}, регрессий: {len(regressions)}")
+    return bool(regressions)
+
+
+def main():
+    args = parse_args()
+
+    if args.command == "compare":
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.current, encoding="utf-8") as f:
+            current = json.load(f)
+
+        sys.exit(1 if print_comparison(compare_results(baseline, current, args.threshold)) else 0)
+
+    report = run(args)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+        sys.exit(1 if print_comparison(compare_results(baseline, report, args.threshold)) else 0)
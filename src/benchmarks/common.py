@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.config.path import DEFAULT_MODEL_PATHS
+from src.utils.frames import synthetic_frames
+from src.dataset_tools.extensions import ImageExtensions
+
+
+def parse_resolution(value: str) -> tuple[int, int]:
+    """Разбирает разрешение вида '1920x1080'
+
+    :param str value: Строка с разрешением
+    :return tuple[int, int]: Ширина и высота
+    """
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def person_mask(size: tuple[int, int]) -> np.ndarray:
+    """Строит бинарную маску силуэта, совпадающую с синтетическими кадрами
+
+    :param tuple[int, int] size: Ширина и высота кадра
+    :return np.ndarray: Маска (H, W)
+    """
+    width, height = size
+    mask = np.zeros((height, width), dtype=np.uint8)
+
+    cv2.ellipse(mask, (width // 2, int(height * 0.35)), (width // 14, height // 8), 0, 0, 360, 1, -1)
+    cv2.ellipse(mask, (width // 2, height), (width // 6, height // 2), 0, 180, 360, 1, -1)
+
+    return mask
+
+
+def load_frames(source: str | Path | None, count: int, size: tuple[int, int] | None = None) -> list[np.ndarray]:
+    """Загружает кадры из видеофайла, директории изображений или генерирует синтетические
+
+    :param str | Path | None source: Путь до видео или директории изображений; None — синтетические кадры
+    :param int count: Максимальное количество кадров
+    :param tuple[int, int] | None size: Ширина и высота, к которым приводятся кадры
+    :raises FileNotFoundError: Если источник не найден или не содержит кадров
+    :return list[np.ndarray]: Кадры (H, W, 3) в формате RGB
+    """
+    if source is None:
+        return synthetic_frames(count, size or (1280, 720))
+
+    source = Path(source)
+    frames = []
+
+    if source.is_dir():
+        extensions = ImageExtensions.get_extensions()
+        paths = sorted(p for p in source.iterdir() if p.suffix.lower() in extensions)
+
+        for path in paths[:count]:
+            image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if image is not None:
+                frames.append(image)
+
+    elif source.is_file():
+        cap = cv2.VideoCapture(str(source))
+        while len(frames) < count:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+
+    if not frames:
+        raise FileNotFoundError(f"Не удалось загрузить кадры из источника: {source}")
+
+    frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+
+    if size is not None:
+        frames = [cv2.resize(frame, size, interpolation=cv2.INTER_AREA) for frame in frames]
+
+    return frames
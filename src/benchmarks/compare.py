@@ -0,0 +1,85 @@
+# Метрика -> True, если рост значения означает ухудшение
+METRICS = {
+    "p50_ms": True,
+    "p95_ms": True,
+    "p99_ms": True,
+    "fps": False,
+    "peak_rss_mb": True,
+}
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1) -> list[dict]:
+    """Сравнивает результаты двух прогонов набора замеров
+
+    Замер базовых результатов, которого нет в текущих или который завершился ошибкой,
+    считается регрессией. Ошибки, которых не было в базовых результатах, добавляются
+    в сравнение отдельными строками.
+
+    :param dict baseline: Сохраненные базовые результаты
+    :param dict current: Текущие результаты
+    :param float threshold: Допустимое относительное ухудшение метрики
+    :return list[dict]: Строки сравнения с флагом регрессии для каждой общей метрики,
+        пропавшего замера и новой ошибки; у строк ошибок metric равен None
+    """
+    rows = []
+
+    baseline_cases = {case["name"]: case for case in baseline.get("results", []) if "error" not in case}
+    current_cases = {case["name"]: case for case in current.get("results", []) if "error" not in case}
+
+    baseline_errors = {case["name"] for case in baseline.get("results", []) if "error" in case}
+    current_errors = {case["name"]: case["error"] for case in current.get("results", []) if "error" in case}
+
+    baseline_cases["process"] = {"peak_rss_mb": baseline.get("peak_rss_mb")}
+    current_cases["process"] = {"peak_rss_mb": current.get("peak_rss_mb")}
+
+    reported_errors = set()
+
+    for name, base_case in baseline_cases.items():
+        case = current_cases.get(name)
+        if case is None:
+            # Ошибка бэкенда записывается одним замером на все наборы кадров: segmentor/yolo
+            error_name = next((e for e in current_errors if name == e or name.startswith(e + "/")), None)
+            reported_errors.add(error_name)
+
+            rows.append(_error_row(
+                name,
+                current_errors[error_name] if error_name else "замер отсутствует в текущих результатах",
+                regression=True,
+            ))
+            continue
+
+        for metric, higher_is_worse in METRICS.items():
+            base_value, value = base_case.get(metric), case.get(metric)
+            if not base_value or value is None:
+                continue
+
+            change = (value - base_value) / base_value
+            regression = change > threshold if higher_is_worse else change < -threshold
+
+            rows.append({
+                "name": name,
+                "metric": metric,
+                "baseline": base_value,
+                "current": value,
+                "change": change,
+                "regression": regression,
+                "error": None,
+            })
+
+    for name, error in current_errors.items():
+        if name not in reported_errors and name not in baseline_errors:
+            rows.append(_error_row(name, error, regression=False))
+
+    return rows
+
+
+def _error_row(name: str, error: str, regression: bool) -> dict:
+    return {
+        "name": name,
+        "metric": None,
+        "baseline": None,
+        "current": None,
+        "change": None,
+        "regression": regression,
+        "error": error,
+    }
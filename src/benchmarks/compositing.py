@@ -0,0 +1,71 @@
+import time
+import argparse
+from collections.abc import Callable
+
+import cv2
+import numpy as np
+
+from src.modules.background import BackgroundProcessor, SolidColorBackground
+
+from .common import person_mask, parse_resolution, synthetic_frames
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Латентность наложения фона при жестком и мягком смешивании")
+
+    parser.add_argument('--resolutions', type=parse_resolution, nargs='+', default=[(1280, 720), (1920, 1080)], help='Разрешения кадров, WxH')
+    parser.add_argument('--frames', type=int, default=100, help='Количество замеров')
+    parser.add_argument('--feather_radius', type=int, default=3, help='Радиус размытия границы маски')
+
+    return parser.parse_args()
+
+
+def measure(fn: Callable[[], object], count: int) -> tuple[float, float]:
+    """Замеряет латентность функции
+
+    :param Callable[[], object] fn: Замеряемая функция
+    :param int count: Количество замеров
+    :return tuple[float, float]: p50 и p95 латентности в миллисекундах
+    """
+    fn()
+
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return float(np.percentile(latencies, 50)), float(np.percentile(latencies, 95))
+
+
+def main():
+    args = parse_args()
+    effect = SolidColorBackground((0, 120, 60))
+
+    print(f"{'resolution':>10} {'mode':>18} {'p50, ms':>9} {'p95, ms':>9}")
+
+    for size in args.resolutions:
+        frame = synthetic_frames(1, size)[0]
+        mask = person_mask(size)
+        confidence = cv2.GaussianBlur(mask.astype(np.float32), (9, 9), 0)
+        background = effect.make_background(frame)
+
+        hard = BackgroundProcessor(effect, 'hard')
+        soft = BackgroundProcessor(effect, 'soft', args.feather_radius)
+
+        cases = {
+            "np.where": lambda: np.where(mask[..., np.newaxis] != 0, frame, background).astype(np.uint8),
+            "hard": lambda: hard.apply(frame, mask),
+            # Новая маска на каждом кадре, как при инференсе на каждом кадре
+            "soft": lambda: soft.apply(frame, mask.copy()),
+            "soft, same mask": lambda: soft.apply(frame, mask),
+            "soft, confidence": lambda: soft.apply(frame, confidence.copy()),
+        }
+
+        for name, fn in cases.items():
+            p50, p95 = measure(fn, args.frames)
+            print(f"{size[0]}x{size[1]:<5} {name:>18} {p50:9.2f} {p95:9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+import time
+import argparse
+
+import numpy as np
+
+from src.utils.metrics import mask_iou, boundary_iou
+from src.modules.segmentation import ScaledSegmenter
+from src.modules.segmentation.segmenters.registry import SEGMENTERS, get_segmenter
+
+from .common import DEFAULT_MODEL_PATHS, load_frames, parse_resolution
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Латентность и Boundary IoU в зависимости от размера инференса")
+
+    parser.add_argument('--model', type=str, default='mediapipe', choices=sorted(SEGMENTERS), help='Модель')
+    parser.add_argument('--model_path', type=str, default=None, help='Путь до весов модели')
+    parser.add_argument('--source', type=str, default=None, help='Видео или директория изображений; по умолчанию синтетические кадры')
+    parser.add_argument('--frames', type=int, default=50, help='Количество кадров')
+    parser.add_argument('--resolution', type=parse_resolution, default=(1920, 1080), help='Разрешение входных кадров, WxH')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[256, 384, 512, 640, 960], help='Размеры инференса')
+    parser.add_argument('--upsampling', type=str, nargs='+', default=['nearest', 'guided'], help='Способы увеличения маски')
+
+    return parser.parse_args()
+
+
+def measure(segmentor, frames: list[np.ndarray]) -> tuple[list[np.ndarray], np.ndarray]:
+    """Прогоняет кадры через сегментатор, замеряя время каждого вызова
+
+    :param segmentor: Сегментатор
+    :param list[np.ndarray] frames: Входные кадры
+    :return tuple[list[np.ndarray], np.ndarray]: Маски и латентности в миллисекундах
+    """
+    masks = []
+    latencies = []
+
+    for frame in frames:
+        start = time.perf_counter()
+        masks.append(segmentor.segment(frame))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return masks, np.asarray(latencies)
+
+
+def main():
+    args = parse_args()
+
+    frames = load_frames(args.source, args.frames, args.resolution)
+    model_path = args.model_path or DEFAULT_MODEL_PATHS[args.model]
+    backend = get_segmenter(args.model)(model_path=model_path)
+
+    # Прогрев, чтобы первый вызов не искажал замеры
+    backend.warmup(frames[0].shape[:2])
+
+    references, latencies = measure(backend, frames)
+    print(f"{'size':>8} {'upsampling':>10} {'p50, ms':>9} {'p95, ms':>9} {'IoU':>7} {'bIoU':>7}")
+    print(f"{'full':>8} {'-':>10} {np.percentile(latencies, 50):9.2f} {np.percentile(latencies, 95):9.2f} {1:7.3f} {1:7.3f}")
+
+    for size in args.sizes:
+        for upsampling in args.upsampling:
+            masks, latencies = measure(ScaledSegmenter(backend, size, upsampling), frames)
+
+            iou = np.mean([mask_iou(m, r) for m, r in zip(masks, references)])
+            biou = np.mean([boundary_iou(m, r) for m, r in zip(masks, references)])
+
+            print(
+                f"{size:>8} {upsampling:>10} {np.percentile(latencies, 50):9.2f} "
+                f"{np.percentile(latencies, 95):9.2f} {iou:7.3f} {biou:7.3f}"
+            )
+
+
+if __name__ == '__main__':
+    main()
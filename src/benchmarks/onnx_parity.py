@@ -0,0 +1,60 @@
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from src.config.path import SEGMENTATION_YOLO_PATH
+from src.utils.metrics import mask_iou
+from src.modules.segmentation.segmenters import YOLOSegmenter, YOLOOnnxSegmenter
+
+from .common import load_frames, parse_resolution
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Сравнение масок YOLOSegmenter и YOLOOnnxSegmenter")
+
+    parser.add_argument('--model_path', type=str, default=str(SEGMENTATION_YOLO_PATH), help='Путь до .pt весов')
+    parser.add_argument('--source', type=str, default=None, help='Видео или директория изображений; по умолчанию синтетические кадры')
+    parser.add_argument('--frames', type=int, default=50, help='Количество кадров')
+    parser.add_argument('--resolution', type=parse_resolution, default=None, help='Разрешение входных кадров, WxH')
+    parser.add_argument('--tolerance', type=float, default=0.95, help='Минимально допустимый средний IoU')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    frames = load_frames(args.source, args.frames, args.resolution)
+
+    reference = YOLOSegmenter(args.model_path)
+    candidate = YOLOOnnxSegmenter(args.model_path)
+
+    ious = []
+    latencies = {"ultralytics": [], "onnxruntime": []}
+
+    for frame in frames:
+        start = time.perf_counter()
+        expected = reference.segment(frame)
+        latencies["ultralytics"].append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        actual = candidate.segment(frame)
+        latencies["onnxruntime"].append((time.perf_counter() - start) * 1000)
+
+        ious.append(mask_iou(actual, expected))
+
+    for name, values in latencies.items():
+        print(f"{name:>12}: p50 {np.percentile(values, 50):.2f} ms, p95 {np.percentile(values, 95):.2f} ms")
+
+    mean_iou = float(np.mean(ious))
+    print(f"IoU: mean {mean_iou:.4f}, min {np.min(ious):.4f}, tolerance {args.tolerance}")
+
+    if mean_iou < args.tolerance:
+        print("Маски ONNX-модели расходятся с ultralytics сильнее допустимого")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
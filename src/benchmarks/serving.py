@@ -0,0 +1,158 @@
+import time
+import argparse
+import http.client
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from src.config import ServingConfig, SegmenterConfig
+from src.serving import InferenceService
+from src.modules.segmentation.segmenters.registry import SEGMENTERS
+
+from .common import DEFAULT_MODEL_PATHS, load_frames, parse_resolution
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест сервиса сегментации: пропускная способность с батчами и без")
+
+    parser.add_argument('--url', type=str, default=None, help='Адрес запущенного сервиса; по умолчанию сервис запускается в текущем процессе')
+    parser.add_argument('--model', type=str, default='yolo', choices=sorted(SEGMENTERS), help='Модель')
+    parser.add_argument('--model_path', type=str, default=None, help='Путь до весов модели')
+    parser.add_argument('--max_batch', type=int, nargs='+', default=[1, 8], help='Размеры батча для сравнения; 1 — без объединения запросов')
+    parser.add_argument('--batch_window_ms', type=float, default=5.0, help='Окно сбора батча, мс')
+    parser.add_argument('--source', type=str, default=None, help='Видео или директория изображений; по умолчанию синтетические кадры')
+    parser.add_argument('--resolution', type=parse_resolution, default=(640, 480), help='Разрешение изображений, WxH')
+    parser.add_argument('--requests', type=int, default=200, help='Количество запросов')
+    parser.add_argument('--concurrency', type=int, default=16, help='Количество одновременных клиентов')
+    parser.add_argument('--format', type=str, default='raw', choices=['raw', 'png'], help='Формат изображений в запросах')
+
+    return parser.parse_args()
+
+
+def encode_payloads(frames: list[np.ndarray], fmt: str) -> list[tuple[bytes, dict[str, str]]]:
+    """Кодирует кадры в тела запросов
+
+    :param list[np.ndarray] frames: Кадры (H, W, 3) в формате RGB
+    :param str fmt: 'raw' — байты RGB, 'png' — PNG
+    :return list[tuple[bytes, dict[str, str]]]: Тело и заголовки каждого запроса
+    """
+    payloads = []
+
+    for frame in frames:
+        h, w = frame.shape[:2]
+        if fmt == 'png':
+            _, png = cv2.imencode(".png", cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+            payloads.append((png.tobytes(), {"Content-Type": "image/png"}))
+        else:
+            headers = {"Content-Type": "application/octet-stream", "X-Width": str(w), "X-Height": str(h)}
+            payloads.append((np.ascontiguousarray(frame).tobytes(), headers))
+
+    return payloads
+
+
+def load_test(url: str, payloads: list[tuple[bytes, dict[str, str]]], requests: int, concurrency: int) -> dict:
+    """Отправляет запросы с заданным количеством одновременных клиентов
+
+    Каждый клиент использует одно постоянное соединение и отправляет следующий запрос
+    сразу после получения ответа.
+
+    :param str url: Адрес сервиса
+    :param list payloads: Тела и заголовки запросов, отправляемые по кругу
+    :param int requests: Общее количество запросов
+    :param int concurrency: Количество одновременных клиентов
+    :return dict: Пропускная способность, перцентили латентности и количество ошибок
+    """
+    address = urlsplit(url)
+    counter = iter(range(requests))
+
+    def client() -> tuple[list[float], int]:
+        conn = http.client.HTTPConnection(address.hostname, address.port, timeout=60)
+        latencies, errors = [], 0
+
+        for i in counter:
+            body, headers = payloads[i % len(payloads)]
+            start = time.perf_counter()
+
+            conn.request("POST", "/segment", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+
+            if response.status == 200:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+
+        conn.close()
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: client(), range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.asarray([latency for result in results for latency in result[0]])
+    errors = sum(result[1] for result in results)
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)) if latencies.size else float("nan"),
+        "p95_ms": float(np.percentile(latencies, 95)) if latencies.size else float("nan"),
+        "errors": errors,
+    }
+
+
+def main():
+    args = parse_args()
+
+    frames = load_frames(args.source, min(args.requests, 32), args.resolution)
+    payloads = encode_payloads(frames, args.format)
+
+    print(f"{'max_batch':>9} {'rps':>8} {'p50, ms':>9} {'p95, ms':>9} {'errors':>7} {'mean batch':>10}")
+
+    if args.url is not None:
+        result = load_test(args.url, payloads, args.requests, args.concurrency)
+        print(f"{'-':>9} {result['rps']:8.1f} {result['p50_ms']:9.1f} {result['p95_ms']:9.1f} {result['errors']:7d} {'-':>10}")
+        return
+
+    baseline = None
+    for max_batch in args.max_batch:
+        config = ServingConfig(
+            segmenter=SegmenterConfig(
+                model=args.model,
+                model_path=args.model_path or str(DEFAULT_MODEL_PATHS[args.model]),
+                warmup=True,
+            ),
+            port=0,
+            max_batch=max_batch,
+            batch_window_ms=args.batch_window_ms,
+            max_queue=max(64, args.concurrency),
+        )
+
+        service = InferenceService(config)
+        service.start()
+        try:
+            # Первые запросы прогревают батчи разных размеров и не учитываются
+            load_test(service.url, payloads, args.concurrency * 2, args.concurrency)
+            warmup_sizes = service.stats()["batch_sizes"]
+
+            result = load_test(service.url, payloads, args.requests, args.concurrency)
+            sizes = {
+                size: count - warmup_sizes.get(size, 0)
+                for size, count in service.stats()["batch_sizes"].items()
+            }
+        finally:
+            service.stop()
+
+        mean_batch = sum(size * count for size, count in sizes.items()) / max(1, sum(sizes.values()))
+        baseline = baseline or result["rps"]
+
+        print(
+            f"{max_batch:>9} {result['rps']:8.1f} {result['p50_ms']:9.1f} {result['p95_ms']:9.1f} "
+            f"{result['errors']:7d} {mean_batch:10.2f}  x{result['rps'] / baseline:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+HEAVY_MODULES = ("torch", "ultralytics", "mediapipe", "onnxruntime")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Время импорта, загрузки модели и первого кадра для каждого бэкенда")
+
+    parser.add_argument('--backends', type=str, nargs='+', default=['yolo', 'yolo_onnx', 'mediapipe'], help='Бэкенды сегментации')
+    parser.add_argument('--resolution', type=str, default='1280x720', help='Разрешение кадра, WxH')
+    parser.add_argument('--frames', type=int, default=10, help='Количество кадров для установившейся латентности')
+    parser.add_argument('--output', type=str, default=None, help='Путь для сохранения результатов в JSON')
+    parser.add_argument('--child', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--warmup', action='store_true', help=argparse.SUPPRESS)
+
+    return parser.parse_args()
+
+
+def measure_backend(backend: str, resolution: str, frames: int, warmup: bool) -> dict:
+    """Замеряет этапы запуска бэкенда; должна выполняться в новом интерпретаторе
+
+    :param str backend: Название бэкенда
+    :param str resolution: Разрешение кадра, WxH
+    :param int frames: Количество кадров для установившейся латентности
+    :param bool warmup: Выполнять ли прогрев перед первым кадром
+    :return dict: Длительности этапов в миллисекундах
+    """
+    start = time.perf_counter()
+    import src.pipeline  # noqa: F401
+    app_import = time.perf_counter() - start
+    heavy_after_app = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    from src.modules.segmentation.segmenters.registry import get_segmenter
+
+    from .common import DEFAULT_MODEL_PATHS, parse_resolution, synthetic_frames
+
+    start = time.perf_counter()
+    segmenter_cls = get_segmenter(backend)
+    backend_import = time.perf_counter() - start
+
+    start = time.perf_counter()
+    segmenter = segmenter_cls(model_path=str(DEFAULT_MODEL_PATHS[backend]))
+    model_load = time.perf_counter() - start
+
+    size = parse_resolution(resolution)
+    images = synthetic_frames(frames + 1, size)
+
+    warmup_time = 0.0
+    if warmup:
+        start = time.perf_counter()
+        segmenter.warmup((size[1], size[0]))
+        warmup_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    segmenter.segment(images[0])
+    first_frame = time.perf_counter() - start
+
+    latencies = []
+    for image in images[1:]:
+        start = time.perf_counter()
+        segmenter.segment(image)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+
+    return {
+        "backend": backend,
+        "warmup": warmup,
+        "app_import_ms": app_import * 1000,
+        "heavy_modules_after_app_import": heavy_after_app,
+        "backend_import_ms": backend_import * 1000,
+        "model_load_ms": model_load * 1000,
+        "warmup_ms": warmup_time * 1000,
+        "first_frame_ms": first_frame * 1000,
+        "steady_frame_ms": latencies[len(latencies) // 2] * 1000 if latencies else None,
+    }
+
+
+def run_child(backend: str, resolution: str, frames: int, warmup: bool) -> dict:
+    """Запускает замер в отдельном процессе, чтобы импорты не были закэшированы
+
+    :param str backend: Название бэкенда
+    :param str resolution: Разрешение кадра, WxH
+    :param int frames: Количество кадров для установившейся латентности
+    :param bool warmup: Выполнять ли прогрев перед первым кадром
+    :raises RuntimeError: Если дочерний процесс завершился с ошибкой
+    :return dict: Длительности этапов в миллисекундах
+    """
+    cmd = [
+        sys.executable, "-m", "src.benchmarks.startup",
+        "--child", backend,
+        "--resolution", resolution,
+        "--frames", str(frames),
+    ]
+    if warmup:
+        cmd.append("--warmup")
+
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Замер бэкенда {backend} завершился с ошибкой:\n{proc.stderr}")
+
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+
+    if args.child:
+        print(json.dumps(measure_backend(args.child, args.resolution, args.frames, args.warmup)))
+        return
+
+    results = []
+    print(f"{'backend':>10} {'warmup':>6} {'app, ms':>8} {'import, ms':>10} {'load, ms':>9} {'warmup, ms':>10} {'first, ms':>9} {'steady, ms':>10}")
+
+    for backend in args.backends:
+        for warmup in (False, True):
+            try:
+                result = run_child(backend, args.resolution, args.frames, warmup)
+            except RuntimeError as e:
+                print(e)
+                break
+
+            results.append(result)
+            print(
+                f"{backend:>10} {str(warmup):>6} {result['app_import_ms']:8.1f} {result['backend_import_ms']:10.1f} "
+                f"{result['model_load_ms']:9.1f} {result['warmup_ms']:10.1f} {result['first_frame_ms']:9.1f} "
+                f"{result['steady_frame_ms']:10.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
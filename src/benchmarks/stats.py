@@ -0,0 +1,48 @@
+import sys
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def summarize(latencies_ms: Sequence[float], wall_time_s: float | None = None) -> dict[str, float]:
+    """Считает перцентили латентности и устойчивый FPS
+
+    :param Sequence[float] latencies_ms: Латентности в миллисекундах
+    :param float | None wall_time_s: Общее время прогона; по умолчанию сумма латентностей
+    :return dict[str, float]: p50/p95/p99/mean в миллисекундах, количество замеров и FPS
+    """
+    samples = np.asarray(latencies_ms, dtype=np.float64)
+
+    if samples.size == 0:
+        return {"count": 0}
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    wall_time_s = wall_time_s if wall_time_s is not None else samples.sum() / 1000
+
+    return {
+        "count": int(samples.size),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "fps": float(samples.size / wall_time_s) if wall_time_s > 0 else 0.0,
+    }
+
+
+def peak_rss_mb() -> float | None:
+    """Возвращает пиковый объем резидентной памяти процесса
+
+    :return float | None: Пиковый RSS в мегабайтах или None, если платформа не поддерживает замер
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux возвращает килобайты, macOS — байты
+    if sys.platform == "darwin":
+        return peak / 2**20
+
+    return peak / 2**10
@@ -0,0 +1,219 @@
+import time
+from pathlib import Path
+from dataclasses import dataclass
+from collections.abc import Callable, Iterable, Sequence
+
+import cv2
+import numpy as np
+
+from src.config import PipelineConfig, SegmenterConfig, BackgroundConfig
+from src.pipeline import FramePipeline, PipelinedRunner
+from src.modules.background import BlurBackground, ImageBackground, BackgroundEffect
+from src.modules.background import BackgroundProcessor, SolidColorBackground
+from src.modules.segmentation.segmenters.registry import get_segmenter
+
+from .stats import summarize
+from .common import DEFAULT_MODEL_PATHS, load_frames, person_mask, synthetic_frames
+
+
+@dataclass
+class FrameSet:
+    """Набор кадров одного источника и разрешения.
+
+    :param str name: Название набора вида 'источник@WxH'
+    :param list[np.ndarray] frames: Кадры (H, W, 3) в формате RGB
+    :param np.ndarray mask: Маска силуэта для замеров наложения фона (H, W)
+    """
+    name: str
+    frames: list[np.ndarray]
+    mask: np.ndarray
+
+
+def build_frame_sets(
+    sources: Sequence[str],
+    resolutions: Sequence[tuple[int, int]],
+    count: int,
+    synthetic: bool = True,
+) -> list[FrameSet]:
+    """Формирует наборы кадров для каждого источника и разрешения
+
+    :param Sequence[str] sources: Пути до видео или директорий изображений
+    :param Sequence[tuple[int, int]] resolutions: Разрешения (W, H)
+    :param int count: Количество кадров в наборе
+    :param bool synthetic: Добавлять ли синтетические кадры
+    :return list[FrameSet]: Наборы кадров
+    """
+    frame_sets = []
+
+    for size in resolutions:
+        tag = f"{size[0]}x{size[1]}"
+        mask = person_mask(size)
+
+        if synthetic:
+            frame_sets.append(FrameSet(f"synthetic@{tag}", synthetic_frames(count, size), mask))
+
+        for source in sources:
+            frame_sets.append(FrameSet(f"{Path(source).name}@{tag}", load_frames(source, count, size), mask))
+
+    return frame_sets
+
+
+def time_calls(fn: Callable[[object], object], items: Iterable, warmup: int = 1) -> tuple[list[float], float]:
+    """Замеряет латентность функции на каждом элементе
+
+    :param Callable[[object], object] fn: Замеряемая функция
+    :param Iterable items: Аргументы вызовов
+    :param int warmup: Количество первых вызовов, не попадающих в замер
+    :return tuple[list[float], float]: Латентности в миллисекундах и общее время в секундах
+    """
+    items = list(items)
+
+    for item in items[:warmup]:
+        fn(item)
+
+    latencies = []
+    wall_start = time.perf_counter()
+
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return latencies, time.perf_counter() - wall_start
+
+
+def bench_segmentors(backends: Sequence[str], frame_sets: Sequence[FrameSet]) -> list[dict]:
+    """Замеряет латентность каждого бэкенда сегментации на всех наборах кадров
+
+    :param Sequence[str] backends: Названия бэкендов
+    :param Sequence[FrameSet] frame_sets: Наборы кадров
+    :return list[dict]: Результаты замеров
+    """
+    results = []
+
+    for backend in backends:
+        try:
+            start = time.perf_counter()
+            segmenter = get_segmenter(backend)(model_path=str(DEFAULT_MODEL_PATHS[backend]))
+            load_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            results.append({"name": f"segmentor/{backend}", "error": f"{type(e).__name__}: {e}"})
+            continue
+
+        for frame_set in frame_sets:
+            latencies, wall = time_calls(segmenter.segment, frame_set.frames)
+            results.append({
+                "name": f"segmentor/{backend}/{frame_set.name}",
+                "load_ms": load_ms,
+                **summarize(latencies, wall),
+            })
+
+    return results
+
+
+def benchmark_effects() -> dict[str, BackgroundEffect]:
+    """Возвращает эффекты фона, участвующие в замерах
+
+    :return dict[str, BackgroundEffect]: Эффекты по названию
+    """
+    image = synthetic_frames(1, (1600, 1200), seed=1)[0]
+
+    return {
+        "solid_color": SolidColorBackground((0, 120, 60)),
+        "image_stretch": ImageBackground(image, "stretch"),
+        "image_fill": ImageBackground(image, "fill"),
+        "blur": BlurBackground(),
+    }
+
+
+def bench_effects(frame_sets: Sequence[FrameSet]) -> list[dict]:
+    """Замеряет отрисовку фона и наложение с жестким и мягким смешиванием
+
+    :param Sequence[FrameSet] frame_sets: Наборы кадров
+    :return list[dict]: Результаты замеров
+    """
+    results = []
+
+    for name, effect in benchmark_effects().items():
+        for frame_set in frame_sets:
+            latencies, wall = time_calls(lambda frame: effect.render(frame, frame_set.mask), frame_set.frames)
+            results.append({"name": f"effect/{name}/{frame_set.name}/render", **summarize(latencies, wall)})
+
+            for blending in ("hard", "soft"):
+                processor = BackgroundProcessor(effect, blending)
+                latencies, wall = time_calls(lambda frame: processor.apply(frame, frame_set.mask.copy()), frame_set.frames)
+                results.append({"name": f"effect/{name}/{frame_set.name}/{blending}", **summarize(latencies, wall)})
+
+    return results
+
+
+def bench_pipeline(backends: Sequence[str], frame_sets: Sequence[FrameSet], pipelined: bool = True) -> list[dict]:
+    """Замеряет этапы FramePipeline и устойчивый FPS последовательного и конвейерного режимов
+
+    :param Sequence[str] backends: Названия бэкендов
+    :param Sequence[FrameSet] frame_sets: Наборы кадров
+    :param bool pipelined: Замерять ли также PipelinedRunner
+    :return list[dict]: Результаты замеров
+    """
+    results = []
+
+    def convert(frame: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+
+    for backend in backends:
+        config = PipelineConfig(
+            segmenter=SegmenterConfig(model=backend, model_path=str(DEFAULT_MODEL_PATHS[backend])),
+            background=BackgroundConfig(SolidColorBackground((0, 120, 60))),
+        )
+
+        try:
+            pipeline = FramePipeline(config)
+        except Exception as e:
+            results.append({"name": f"pipeline/{backend}", "error": f"{type(e).__name__}: {e}"})
+            continue
+
+        for frame_set in frame_sets:
+            pipeline.process(frame_set.frames[0])
+            stages: dict[str, list[float]] = {"segment": [], "composite": [], "convert": [], "total": []}
+
+            wall_start = time.perf_counter()
+            for frame in frame_set.frames:
+                t0 = time.perf_counter()
+                mask = pipeline.segment(frame)
+                t1 = time.perf_counter()
+                out = pipeline.composite(frame, mask)
+                t2 = time.perf_counter()
+                convert(out)
+                t3 = time.perf_counter()
+
+                stages["segment"].append((t1 - t0) * 1000)
+                stages["composite"].append((t2 - t1) * 1000)
+                stages["convert"].append((t3 - t2) * 1000)
+                stages["total"].append((t3 - t0) * 1000)
+            wall = time.perf_counter() - wall_start
+
+            for stage, latencies in stages.items():
+                results.append({
+                    "name": f"pipeline/{backend}/{frame_set.name}/{stage}",
+                    **summarize(latencies, wall if stage == "total" else None),
+                })
+
+            if not pipelined:
+                continue
+
+            runner = PipelinedRunner(pipeline, postprocess=convert)
+            intervals = []
+
+            wall_start = last = time.perf_counter()
+            for _ in runner.run(frame_set.frames):
+                now = time.perf_counter()
+                intervals.append((now - last) * 1000)
+                last = now
+            wall = time.perf_counter() - wall_start
+
+            results.append({
+                "name": f"pipelined/{backend}/{frame_set.name}/total",
+                **summarize(intervals, wall),
+            })
+
+    return results
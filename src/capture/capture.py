@@ -1,3 +1,4 @@
+import logging
 import contextlib
 from collections.abc import Iterable, Iterator
 
@@ -5,16 +6,25 @@ import cv2
 import numpy as np
 
 from src.config.camera import CameraConfig
+from src.capture.reader import LatestFrameReader
 from src.capture.exceptions import CameraOpenError, CameraReadError
 
+logger = logging.getLogger(__name__)
+
 
 class CameraFrameCapture(Iterable[np.ndarray]):
 
     def __init__(self, config: CameraConfig | None = None):
         self.config = config or CameraConfig()
         self._cap: cv2.VideoCapture | None = None
+        self._reader: LatestFrameReader | None = None
         self._is_open: bool = False
 
+    @property
+    def dropped_frames(self) -> int:
+        """Количество кадров, пропущенных в фоновом режиме чтения"""
+        return self._reader.dropped_frames if self._reader is not None else 0
+
     def open(self) -> None:
         """Выполняет подключение к источнику видео
 
@@ -42,12 +52,26 @@ class CameraFrameCapture(Iterable[np.ndarray]):
         self._cap = cap
         self._is_open = True
 
+        if self.config.threaded:
+            self._reader = LatestFrameReader(cap, self.config.buffer_size, self.config.read_timeout)
+            self._reader.start()
+
     def close(self) -> None:
         """Выполняет отключение от источника видео"""
 
+        released = True
+        if self._reader is not None:
+            released = self._reader.stop()
+            self._reader = None
+
         if self._cap is not None:
-            with contextlib.suppress(Exception):
-                self._cap.release()
+            if released:
+                with contextlib.suppress(Exception):
+                    self._cap.release()
+            else:
+                # Освобождение источника во время чтения в другом потоке небезопасно;
+                # источник закроется при удалении последней ссылки после завершения чтения
+                logger.warning("Поток чтения кадров не завершился, источник видео не освобожден")
 
         self._cap = None
         self._is_open = False
@@ -61,6 +85,9 @@ class CameraFrameCapture(Iterable[np.ndarray]):
         if not self._is_open:
             self.open()
 
+        if self._reader is not None:
+            return self._reader.read(self.config.convert_to_rgb)
+
         ok, frame = self._cap.read()
         if not ok:
             raise CameraReadError("Не удалось прочитать кадр из источника")
@@ -0,0 +1,128 @@
+import threading
+
+import cv2
+import numpy as np
+
+from src.capture.exceptions import CameraReadError
+
+
+class LatestFrameReader:
+
+    def __init__(self, cap: cv2.VideoCapture, buffer_size: int = 3, timeout: float = 1.0):
+        self._cap = cap
+        self._timeout = timeout
+
+        self._buffers: list[np.ndarray | None] = [None] * max(2, buffer_size)
+        self._latest: int = -1
+        self._fresh: bool = False
+        self._error: Exception | None = None
+
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._captured_frames: int = 0
+        self._dropped_frames: int = 0
+
+    @property
+    def captured_frames(self) -> int:
+        """Количество кадров, прочитанных из источника"""
+        return self._captured_frames
+
+    @property
+    def dropped_frames(self) -> int:
+        """Количество кадров, вытесненных более свежими до того, как их забрал потребитель"""
+        return self._dropped_frames
+
+    def start(self) -> None:
+        """Запускает фоновый поток чтения кадров"""
+        if self._thread is not None:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="camera-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> bool:
+        """Останавливает фоновый поток чтения кадров
+
+        Поток завершается после текущего чтения из источника, которое ожидается не дольше таймаута.
+
+        :return bool: True, если поток завершился; False, если он все еще внутри чтения из источника
+        """
+        self._stop_event.set()
+
+        with self._cond:
+            self._cond.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout=self._timeout)
+            if self._thread.is_alive():
+                return False
+
+        self._thread = None
+        return True
+
+    def read(self, convert_to_rgb: bool = False) -> np.ndarray:
+        """Возвращает самый свежий кадр, ожидая его появления при необходимости
+
+        :param bool convert_to_rgb: Конвертировать ли BGR в RGB
+        :raises CameraReadError: При ошибке чтения или отсутствии нового кадра дольше таймаута
+        :return np.ndarray: Копия самого свежего кадра
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._fresh or self._error is not None or self._stop_event.is_set(),
+                timeout=self._timeout,
+            )
+
+            if not self._fresh:
+                if self._error is not None:
+                    raise CameraReadError("Не удалось прочитать кадр из источника") from self._error
+                if not ready:
+                    raise CameraReadError("Превышено время ожидания кадра из источника")
+                raise CameraReadError("Чтение кадров остановлено")
+
+            frame = self._buffers[self._latest]
+
+            if convert_to_rgb:
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            else:
+                frame = frame.copy()
+
+            self._fresh = False
+
+        return frame
+
+    def _run(self) -> None:
+        """Читает кадры в кольцо буферов, публикуя только последний прочитанный"""
+        while not self._stop_event.is_set():
+            # Потребитель копирует кадр под блокировкой, поэтому достаточно писать
+            # в любой буфер, кроме опубликованного последним
+            idx = (self._latest + 1) % len(self._buffers)
+            buffer = self._buffers[idx]
+
+            try:
+                ok, frame = self._cap.read(buffer) if buffer is not None else self._cap.read()
+            except Exception as e:
+                ok, frame = False, None
+                self._error = e
+
+            if not ok:
+                with self._cond:
+                    self._error = self._error or EOFError("Источник не вернул кадр")
+                    self._cond.notify_all()
+                return
+
+            if frame is not buffer:
+                self._buffers[idx] = frame
+
+            with self._cond:
+                if self._fresh:
+                    self._dropped_frames += 1
+
+                self._latest = idx
+                self._fresh = True
+                self._captured_frames += 1
+
+                self._cond.notify_all()
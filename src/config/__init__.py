@@ -1,9 +1,16 @@
+from .roi import ROIConfig
 from .path import ROOT_PATH, SEGMENTATION_MP_PATH, SEGMENTATION_YOLO_PATH
 from .path import SEGMENTATION_WEIGHTS_PATH
 from .camera import CameraConfig
+from .metrics import MetricsConfig
+from .serving import ServingConfig
+from .governor import GovernorConfig
 from .pipeline import PipelineConfig
+from .temporal import TemporalConfig
 from .segmenter import SegmenterConfig
+from .streaming import StreamingConfig
 from .background import BackgroundConfig
+from .multi_stream import MultiStreamConfig
 
 __all__ = [
     'ROOT_PATH',
@@ -12,6 +19,13 @@ __all__ = [
     'SEGMENTATION_MP_PATH',
     'CameraConfig',
     'SegmenterConfig',
+    'TemporalConfig',
+    'ROIConfig',
     'BackgroundConfig',
     'PipelineConfig',
+    'MetricsConfig',
+    'GovernorConfig',
+    'MultiStreamConfig',
+    'StreamingConfig',
+    'ServingConfig',
 ]
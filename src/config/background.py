@@ -1,3 +1,4 @@
+from typing import Literal
 from dataclasses import dataclass
 
 from src.modules.background import BackgroundEffect
@@ -5,9 +6,19 @@ from src.modules.background import BackgroundEffect
 
 @dataclass
 class BackgroundConfig:
+    """Параметры замены фона.
+
+    :param BackgroundEffect effect: Эффект фона
+    :param str blending: Смешивание кадра и фона: жесткий выбор по маске или по мягкой альфа-маске
+    :param int feather_radius: Радиус размытия границы маски для мягкого смешивания, пиксели
+    """
     effect: BackgroundEffect
+    blending: Literal['hard', 'soft'] = 'hard'
+    feather_radius: int = 3
 
     def asdict(self):
         return {
             "effect": self.effect,
+            "blending": self.blending,
+            "feather_radius": self.feather_radius,
         }
@@ -10,9 +10,15 @@ class CameraConfig:
     :param int | None height: Целевая высота кадра
     :param int | None fps: Целевая частота кадров
     :param bool convert_to_rgb: Конвертировать ли BGR в RGB
+    :param bool threaded: Читать ли кадры в фоновом потоке, отдавая только самый свежий кадр
+    :param int buffer_size: Количество переиспользуемых буферов кадров в фоновом режиме
+    :param float read_timeout: Максимальное время ожидания нового кадра в фоновом режиме, с
     """
     source: int | str = 0
     width: int | None = None
     height: int | None = None
     fps: int | None = None
     convert_to_rgb: bool = True
+    threaded: bool = False
+    buffer_size: int = 3
+    read_timeout: float = 1.0
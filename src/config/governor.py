@@ -0,0 +1,28 @@
+from dataclasses import field, dataclass
+
+
+@dataclass
+class GovernorConfig:
+    """Параметры адаптации качества под целевую частоту кадров.
+
+    :param float ema_alpha: Коэффициент экспоненциального сглаживания латентности этапов
+    :param float degrade_ratio: Качество снижается, когда сглаженная стоимость кадра превышает бюджет в degrade_ratio раз
+    :param float upgrade_ratio: Качество повышается, когда стоимость кадра ниже бюджета в upgrade_ratio раз
+    :param int cooldown: Количество кадров после решения, в течение которых новые решения не принимаются
+    :param int upgrade_patience: Количество кадров подряд ниже порога повышения, необходимое для повышения качества
+    :param list[int] inference_sizes: Размеры большей стороны кадра для инференса по убыванию качества
+    :param list[int] intervals: Интервалы между ключевыми кадрами по убыванию качества
+    :param list[float] confidences: Пороги уверенности YOLO по убыванию качества
+    :param list[str] model_fallbacks: Пути до более легких моделей того же бэкенда по убыванию качества
+    :param bool effect_quality: Снижать ли качество наложения фона
+    """
+    ema_alpha: float = 0.1
+    degrade_ratio: float = 1.0
+    upgrade_ratio: float = 0.7
+    cooldown: int = 30
+    upgrade_patience: int = 90
+    inference_sizes: list[int] = field(default_factory=lambda: [640, 512, 384, 320, 256])
+    intervals: list[int] = field(default_factory=lambda: [2, 3, 4, 6])
+    confidences: list[float] = field(default_factory=lambda: [0.35, 0.45])
+    model_fallbacks: list[str] = field(default_factory=list)
+    effect_quality: bool = True
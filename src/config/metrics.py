@@ -0,0 +1,23 @@
+from typing import Literal
+from dataclasses import field, dataclass
+
+
+@dataclass
+class MetricsConfig:
+    """Параметры сбора метрик конвейера.
+
+    :param bool enabled: Собирать ли метрики; при выключенном сборе замеры не выполняются
+    :param list[str] sinks: Приемники снимков: строки журнала, JSON-файл или эндпоинт Prometheus
+    :param float interval: Период выгрузки снимков, с
+    :param int window: Количество последних замеров этапа, по которым считаются перцентили
+    :param str json_path: Путь до JSON-файла со снимком для приемника 'json'
+    :param str prometheus_host: Адрес эндпоинта /metrics для приемника 'prometheus'
+    :param int prometheus_port: Порт эндпоинта /metrics; 0 — выбрать свободный
+    """
+    enabled: bool = False
+    sinks: list[Literal['log', 'json', 'prometheus']] = field(default_factory=lambda: ['log'])
+    interval: float = 5.0
+    window: int = 1000
+    json_path: str = 'metrics.json'
+    prometheus_host: str = '127.0.0.1'
+    prometheus_port: int = 9100
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+from .camera import CameraConfig
+from .segmenter import SegmenterConfig
+from .background import BackgroundConfig
+
+
+@dataclass
+class MultiStreamConfig:
+    """Параметры конвейера для нескольких источников видео с общей моделью сегментации.
+
+    :param list[CameraConfig] cameras: Параметры источников видео
+    :param SegmenterConfig segmenter: Параметры общей модели сегментации
+    :param list[BackgroundConfig] backgrounds: Параметры фона для каждого источника;
+        один элемент применяется ко всем источникам
+    :param int composite_workers: Количество потоков для наложения фона; 0 — по числу источников
+    """
+    cameras: list[CameraConfig]
+    segmenter: SegmenterConfig
+    backgrounds: list[BackgroundConfig]
+    composite_workers: int = 0
@@ -6,3 +6,15 @@ WEIGHTS_PATH = ROOT_PATH / "weights"
 SEGMENTATION_WEIGHTS_PATH = WEIGHTS_PATH / "segmentation"
 SEGMENTATION_YOLO_PATH = SEGMENTATION_WEIGHTS_PATH / "yolo11n-seg.pt"
 SEGMENTATION_MP_PATH = SEGMENTATION_WEIGHTS_PATH / "selfie_multiclass_256x256.tflite"
+SEGMENTATION_VARIANTS_PATH = SEGMENTATION_WEIGHTS_PATH / "variants"
+
+# Веса бэкендов сегментации по умолчанию
+DEFAULT_MODEL_PATHS = {
+    "yolo": SEGMENTATION_YOLO_PATH,
+    "yolo_onnx": SEGMENTATION_YOLO_PATH,
+    "mediapipe": SEGMENTATION_MP_PATH,
+}
+
+CACHE_PATH = ROOT_PATH / "cache"
+VIDEO_BACKGROUND_CACHE_PATH = CACHE_PATH / "video_backgrounds"
+PREDICTION_CACHE_PATH = CACHE_PATH / "predictions"
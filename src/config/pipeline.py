@@ -1,10 +1,30 @@
+from typing import Literal
 from dataclasses import dataclass
 
+from .metrics import MetricsConfig
+from .governor import GovernorConfig
 from .segmenter import SegmenterConfig
 from .background import BackgroundConfig
 
 
 @dataclass
 class PipelineConfig:
+    """Параметры конвейера обработки кадров.
+
+    :param SegmenterConfig segmenter: Параметры сегментации
+    :param BackgroundConfig background: Параметры замены фона
+    :param bool pipelined: Выполнять ли этапы конвейера параллельно в отдельных потоках
+    :param int queue_size: Максимальное количество кадров в очереди между этапами
+    :param str drop_policy: Поведение при заполненной очереди: ожидать, выбрасывать самый старый или новый кадр
+    :param MetricsConfig | None metrics: Параметры сбора метрик по этапам; None — сбор выключен
+    :param float | None target_fps: Целевая частота кадров, которую поддерживает регулятор качества; None — без регулятора
+    :param GovernorConfig | None governor: Параметры регулятора качества; None — значения по умолчанию
+    """
     segmenter: SegmenterConfig
     background: BackgroundConfig
+    pipelined: bool = False
+    queue_size: int = 2
+    drop_policy: Literal['block', 'drop_oldest', 'drop_newest'] = 'block'
+    metrics: MetricsConfig | None = None
+    target_fps: float | None = None
+    governor: GovernorConfig | None = None
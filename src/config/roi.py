@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ROIConfig:
+    """Параметры сегментации по области интереса.
+
+    :param float margin: Расширение рамки объектов с предыдущего кадра с каждой стороны, доля размера рамки
+    :param int refresh_interval: Интервал между полными проходами по кадру для поиска новых объектов
+    :param float min_area: Минимальная площадь рамки, доля площади кадра; меньшие рамки считаются потерей объекта
+    :param float max_area: Максимальная площадь области интереса, доля площади кадра; при большей выполняется полный проход
+    """
+    margin: float = 0.2
+    refresh_interval: int = 30
+    min_area: float = 0.002
+    max_area: float = 0.7
+
+    def asdict(self):
+        return {
+            "margin": self.margin,
+            "refresh_interval": self.refresh_interval,
+            "min_area": self.min_area,
+            "max_area": self.max_area,
+        }
@@ -1,14 +1,56 @@
 from typing import Literal
 from dataclasses import dataclass
 
+from .roi import ROIConfig
+from .temporal import TemporalConfig
+
 
 @dataclass
 class SegmenterConfig:
-    model: Literal['yolo', 'mediapipe']
+    """Параметры сегментации.
+
+    :param str model: Название модели сегментации
+    :param str | None model_path: Путь до весов модели
+    :param TemporalConfig | None temporal: Параметры сегментации по ключевым кадрам
+    :param ROIConfig | None roi: Параметры сегментации по области интереса вокруг объектов с предыдущего кадра
+    :param int | None inference_size: Размер большей стороны кадра для инференса; None — исходный размер
+    :param str upsampling: Способ увеличения маски до размера кадра
+    :param bool warmup: Прогревать ли модель при создании
+    :param int workers: Количество процессов сегментации, обменивающихся кадрами через общую память; 0 — в текущем процессе
+    :param str | None variant: Название экспортированного варианта модели; задает бэкенд и путь до модели вместо model и model_path
+    :param float worker_timeout: Время ожидания маски от процессов сегментации на круг распределения кадров, с
+    :param float worker_hang_timeout: Время без ответа, после которого процесс сегментации перезапускается, с
+    :param tuple[int, int] | None max_frame_size: Наибольший ожидаемый размер кадра (W, H), под который
+        сразу выделяется общая память процессов сегментации; None — по первому кадру
+    :param str | None variants_dir: Директория экспортированных вариантов; None — директория по умолчанию
+    """
+    model: Literal['yolo', 'yolo_onnx', 'mediapipe']
     model_path: str | None = None
+    temporal: TemporalConfig | None = None
+    roi: ROIConfig | None = None
+    inference_size: int | None = None
+    upsampling: Literal['nearest', 'guided'] = 'guided'
+    warmup: bool = False
+    workers: int = 0
+    worker_timeout: float = 1.0
+    worker_hang_timeout: float = 10.0
+    max_frame_size: tuple[int, int] | None = None
+    variant: str | None = None
+    variants_dir: str | None = None
 
     def asdict(self):
         return {
             "model": self.model,
             "model_path": self.model_path,
+            "temporal": self.temporal,
+            "roi": self.roi,
+            "inference_size": self.inference_size,
+            "upsampling": self.upsampling,
+            "warmup": self.warmup,
+            "workers": self.workers,
+            "worker_timeout": self.worker_timeout,
+            "worker_hang_timeout": self.worker_hang_timeout,
+            "max_frame_size": self.max_frame_size,
+            "variant": self.variant,
+            "variants_dir": self.variants_dir,
         }
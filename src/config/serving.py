@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+
+from .segmenter import SegmenterConfig
+
+
+@dataclass
+class ServingConfig:
+    """Параметры локального сервиса сегментации.
+
+    :param SegmenterConfig segmenter: Параметры сегментации
+    :param str host: Адрес сервиса
+    :param int port: Порт сервиса; 0 — выбрать свободный
+    :param int max_batch: Максимальное количество изображений в одном вызове модели
+    :param float batch_window_ms: Сколько ждать запросы для батча после первого запроса, мс
+    :param int max_queue: Максимальное количество ожидающих запросов; сверх него сервис отвечает 503
+    :param int max_body_mb: Максимальный размер тела запроса, МБ
+    """
+    segmenter: SegmenterConfig
+    host: str = '127.0.0.1'
+    port: int = 8090
+    max_batch: int = 8
+    batch_window_ms: float = 5.0
+    max_queue: int = 64
+    max_body_mb: int = 32
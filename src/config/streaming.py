@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class StreamingConfig:
+    """Параметры локального сервера трансляции обработанных кадров.
+
+    :param bool enabled: Запускать ли сервер
+    :param str host: Адрес сервера
+    :param int port: Порт сервера; 0 — выбрать свободный
+    :param int jpeg_quality: Качество JPEG от 0 до 100
+    :param int max_clients: Максимальное количество одновременных клиентов трансляции
+    :param float write_timeout: Время, после которого клиент, не принимающий данные, отключается, с
+    """
+    enabled: bool = False
+    host: str = '127.0.0.1'
+    port: int = 8080
+    jpeg_quality: int = 80
+    max_clients: int = 32
+    write_timeout: float = 10.0
+
+    def asdict(self):
+        return {
+            "host": self.host,
+            "port": self.port,
+            "jpeg_quality": self.jpeg_quality,
+            "max_clients": self.max_clients,
+            "write_timeout": self.write_timeout,
+        }
@@ -0,0 +1,28 @@
+from typing import Literal
+from dataclasses import dataclass
+
+
+@dataclass
+class TemporalConfig:
+    """Параметры сегментации по ключевым кадрам.
+
+    :param str policy: Выбор ключевых кадров: через фиксированный интервал или по оценке движения
+    :param int interval: Интервал между ключевыми кадрами; для 'motion' — максимальный интервал
+    :param float motion_threshold: Порог средней разницы яркости (0-255), при превышении которого кадр становится ключевым
+    :param str propagation: Перенос маски между ключевыми кадрами: повторное использование или сдвиг по оценке движения
+    :param int analysis_width: Ширина уменьшенного кадра для оценки движения
+    """
+    policy: Literal['interval', 'motion'] = 'motion'
+    interval: int = 10
+    motion_threshold: float = 6.0
+    propagation: Literal['reuse', 'shift'] = 'shift'
+    analysis_width: int = 96
+
+    def asdict(self):
+        return {
+            "policy": self.policy,
+            "interval": self.interval,
+            "motion_threshold": self.motion_threshold,
+            "propagation": self.propagation,
+            "analysis_width": self.analysis_width,
+        }
@@ -1,7 +1,11 @@
-from .renamer import YOLODatasetRenamer
-from .collector import FileCollector
+from .index import DatasetIndex
+from .renamer import RenameEntry, YOLODatasetRenamer
+from .collector import CollectStats, FileCollector
 
 __all__ = [
     'FileCollector',
+    'CollectStats',
     'YOLODatasetRenamer',
+    'RenameEntry',
+    'DatasetIndex',
 ]
@@ -1,12 +1,50 @@
-import shutil
+import os
+import logging
 from typing import Literal
 from pathlib import Path
+from dataclasses import dataclass
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 from tqdm import tqdm
 
 from src.utils.extensions import normalize_extensions
 
+from .transfer import TransferMode, transfer_file
 from .extensions import TextExtensions, ImageExtensions
+from .hash_index import HashIndex, source_key, file_digest
+
+logger = logging.getLogger(__name__)
+
+# Имя файла индекса хешей по умолчанию; он хранится в целевой директории
+INDEX_NAME = ".collector_index.sqlite"
+
+
+@dataclass
+class CollectStats:
+    """Итоги сбора файлов.
+
+    :param int transferred: Перенесено файлов
+    :param int renamed: Из них переименовано из-за совпадения имени с файлом другого содержимого
+    :param int duplicates: Пропущено файлов, содержимое которых уже есть в целевой директории
+    :param int unchanged: Пропущено файлов, обработанных при предыдущем запуске и не изменившихся
+    :param int failed: Файлов, которые не удалось обработать
+    """
+    transferred: int = 0
+    renamed: int = 0
+    duplicates: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Entry:
+    path: str
+    name: str
+    size: int
+    mtime_ns: int
+    digest: str | None = None
+    target_name: str | None = None
 
 
 class FileCollector:
@@ -31,35 +69,224 @@ class FileCollector:
         source_dir: str | Path,
         target_dir: str | Path,
         copy_mode: bool = False,
-        progress_bar: bool = False
-    ) -> None:
+        progress_bar: bool = False,
+        mode: TransferMode | None = None,
+        workers: int = 8,
+        dedup: bool = True,
+        index_path: str | Path | None = None,
+        batch_size: int = 1024,
+    ) -> CollectStats:
         """Собирает файлы из исходной директории в целевую директорию с заданными расширениями
 
+        Директория обходится через os.scandir пачками по batch_size файлов; хеширование
+        и перенос файлов каждой пачки выполняются в пуле потоков. Хеши содержимого
+        целевой директории и обработанные исходные файлы хранятся в индексе SQLite, поэтому
+        файлы с уже собранным содержимым пропускаются, совпадающие имена файлов с другим
+        содержимым получают суффикс из хеша, а повторный запуск хеширует только новые
+        или изменившиеся файлы. При перемещении исходные файлы-дубликаты остаются на месте.
+
         :param str | Path source_dir: Исходная директория
         :param str | Path target_dir: Целевая директория
-        :param bool copy_mode: Если True - копирует файлы, если False - перемещает
+        :param bool copy_mode: Если True - копирует файлы, если False - перемещает; не используется, если задан mode
         :param bool progress_bar: Если True - показывает прогресс бар
+        :param str | None mode: Перемещение, копирование, жесткая ссылка или reflink
+        :param int workers: Количество потоков хеширования и переноса
+        :param bool dedup: Пропускать ли файлы, содержимое которых уже есть в целевой директории
+        :param str | Path | None index_path: Путь до индекса хешей; по умолчанию в целевой директории
+        :param int batch_size: Количество файлов в пачке
+        :return CollectStats: Итоги сбора
         """
+        mode = mode or ("copy" if copy_mode else "move")
         source_path = Path(source_dir)
         target_path = Path(target_dir)
 
         target_path.mkdir(parents=True, exist_ok=True)
 
-        file_paths = [
-            file_path for file_path in source_path.rglob('*')
-            if file_path.is_file() and file_path.suffix.lower() in self.extensions
-        ]
+        stats = CollectStats()
+        index = HashIndex(index_path or target_path / INDEX_NAME)
 
-        operation = shutil.copy2 if copy_mode else shutil.move
+        # Имена занятых файлов читаются один раз, а не проверяются отдельно для каждого файла
+        taken = {entry.name for entry in os.scandir(target_path) if entry.is_file()}
+        index.forget_missing(taken)
 
-        for file_path in tqdm(file_paths, desc="Обработка файлов", disable=not progress_bar):
-            target_file = target_path / file_path.name
+        progress = tqdm(desc="Обработка файлов", unit="файл", disable=not progress_bar)
 
-            if target_file.exists():
-                print(f'Файл {file_path.name} уже существует в целевой директории!')
-                continue
+        with index, progress, ThreadPoolExecutor(max_workers=workers) as pool:
+            if dedup:
+                self._index_target(target_path, taken - index.names(), index, pool)
+
+            for batch in self._scan(source_path, batch_size):
+                self._process_batch(batch, target_path, mode, dedup, taken, index, pool, stats)
+                index.commit()
+                progress.update(len(batch))
+
+        logger.info(
+            "Перенесено %d (переименовано %d), дубликатов %d, без изменений %d, ошибок %d",
+            stats.transferred,
+            stats.renamed,
+            stats.duplicates,
+            stats.unchanged,
+            stats.failed,
+        )
+
+        return stats
 
+    def _scan(self, source_path: Path, batch_size: int) -> Iterator[list[_Entry]]:
+        """Обходит директорию без рекурсии через os.scandir и возвращает файлы пачками
+
+        :param Path source_path: Исходная директория
+        :param int batch_size: Количество файлов в пачке
+        :return Iterator[list[_Entry]]: Пачки файлов с подходящими расширениями
+        """
+        batch = []
+        stack = [str(source_path)]
+
+        while stack:
             try:
-                operation(file_path, target_file)
-            except Exception as e:
-                print(f'Ошибка при обработке {file_path.name}: {e}')
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+
+                        if not entry.is_file() or os.path.splitext(entry.name)[1].lower() not in self.extensions:
+                            continue
+
+                        stat = entry.stat()
+                        batch.append(_Entry(source_key(entry.path), entry.name, stat.st_size, stat.st_mtime_ns))
+
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+            except OSError as e:
+                logger.warning("Не удалось прочитать директорию: %s", e)
+
+        if batch:
+            yield batch
+
+    def _process_batch(
+        self,
+        batch: list[_Entry],
+        target_path: Path,
+        mode: TransferMode,
+        dedup: bool,
+        taken: set[str],
+        index: HashIndex,
+        pool: ThreadPoolExecutor,
+        stats: CollectStats,
+    ) -> None:
+        """Хеширует файлы пачки, отбрасывает дубликаты, назначает имена и переносит файлы
+
+        :param list[_Entry] batch: Файлы пачки
+        :param Path target_path: Целевая директория
+        :param str mode: Способ переноса
+        :param bool dedup: Пропускать ли дубликаты
+        :param set[str] taken: Занятые имена в целевой директории
+        :param HashIndex index: Индекс хешей
+        :param ThreadPoolExecutor pool: Пул потоков
+        :param CollectStats stats: Итоги сбора
+        """
+        # Перемещенные файлы исчезают из источника, поэтому отслеживать их для повторного запуска не нужно
+        track_sources = mode != "move"
+
+        if track_sources:
+            unchanged = index.unchanged_sources((entry.path, entry.size, entry.mtime_ns) for entry in batch)
+            stats.unchanged += len(unchanged)
+            batch = [entry for entry in batch if entry.path not in unchanged]
+
+        if dedup:
+            for entry, digest in zip(batch, pool.map(_safe_digest, [entry.path for entry in batch])):
+                entry.digest = digest
+            failed = [entry for entry in batch if entry.digest is None]
+            stats.failed += len(failed)
+            batch = [entry for entry in batch if entry.digest is not None]
+
+        planned, seen, skipped = [], set(), []
+        for entry in batch:
+            if entry.digest is not None and (entry.digest in seen or index.find(entry.digest) is not None):
+                stats.duplicates += 1
+                skipped.append(entry)
+                continue
+
+            entry.target_name = self._unique_name(entry, taken)
+            stats.renamed += entry.target_name != entry.name
+            taken.add(entry.target_name)
+            if entry.digest is not None:
+                seen.add(entry.digest)
+            planned.append(entry)
+
+        results = pool.map(
+            lambda entry: _safe_transfer(entry.path, target_path / entry.target_name, mode),
+            planned,
+        )
+
+        done = skipped
+        for entry, ok in zip(planned, results):
+            if not ok:
+                stats.failed += 1
+                stats.renamed -= entry.target_name != entry.name
+                taken.discard(entry.target_name)
+                continue
+
+            stats.transferred += 1
+            done.append(entry)
+            if entry.digest is not None:
+                index.add(entry.digest, entry.target_name)
+
+        if track_sources:
+            index.add_sources((entry.path, entry.size, entry.mtime_ns, entry.digest) for entry in done)
+
+    @staticmethod
+    def _index_target(target_path: Path, names: set[str], index: HashIndex, pool: ThreadPoolExecutor) -> None:
+        """Хеширует файлы целевой директории, которых нет в индексе, например собранные до появления индекса
+
+        :param Path target_path: Целевая директория
+        :param set[str] names: Имена файлов без записи в индексе
+        :param HashIndex index: Индекс хешей
+        :param ThreadPoolExecutor pool: Пул потоков
+        """
+        names = sorted(name for name in names if not name.startswith(INDEX_NAME))
+
+        for name, digest in zip(names, pool.map(_safe_digest, [target_path / name for name in names])):
+            if digest is not None and index.find(digest) is None:
+                index.add(digest, name)
+
+        index.commit()
+
+    @staticmethod
+    def _unique_name(entry: _Entry, taken: set[str]) -> str:
+        """Подбирает свободное имя в целевой директории
+
+        :param _Entry entry: Исходный файл
+        :param set[str] taken: Занятые имена
+        :return str: Исходное имя или имя с суффиксом из хеша содержимого либо номера
+        """
+        if entry.name not in taken:
+            return entry.name
+
+        stem, suffix = os.path.splitext(entry.name)
+        if entry.digest is not None and f"{stem}_{entry.digest[:8]}{suffix}" not in taken:
+            return f"{stem}_{entry.digest[:8]}{suffix}"
+
+        counter = 1
+        while f"{stem}_{counter}{suffix}" in taken:
+            counter += 1
+
+        return f"{stem}_{counter}{suffix}"
+
+
+def _safe_digest(path: str | Path) -> str | None:
+    try:
+        return file_digest(path)
+    except OSError as e:
+        logger.warning("Не удалось прочитать %s: %s", path, e)
+        return None
+
+
+def _safe_transfer(source: str, target: Path, mode: TransferMode) -> bool:
+    try:
+        transfer_file(source, target, mode)
+        return True
+    except OSError as e:
+        logger.warning("Ошибка при обработке %s: %s", source, e)
+        return False
@@ -18,3 +18,15 @@ class TextExtensions(Enum):
     @classmethod
     def get_extensions(cls) -> set[str]:
         return {ext.value for ext in cls}
+
+
+class VideoExtensions(Enum):
+    MP4 = ".mp4"
+    AVI = ".avi"
+    MOV = ".mov"
+    MKV = ".mkv"
+    WEBM = ".webm"
+
+    @classmethod
+    def get_extensions(cls) -> set[str]:
+        return {ext.value for ext in cls}
@@ -0,0 +1,136 @@
+import os
+import hashlib
+import sqlite3
+from pathlib import Path
+from collections.abc import Iterable
+
+# Размер блока чтения при хешировании: крупные блоки освобождают GIL на время хеширования
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: str | Path) -> str:
+    """Вычисляет хеш содержимого файла
+
+    :param str | Path path: Путь до файла
+    :return str: Шестнадцатеричный BLAKE2b-128 хеш
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    with open(path, "rb", buffering=0) as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class HashIndex:
+
+    # Индекс хранится рядом с целевой директорией и переживает перезапуски:
+    # contents — хеши файлов целевой директории, sources — уже обработанные исходные файлы
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS contents (
+                digest TEXT PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT
+            );
+        """)
+
+    def names(self) -> set[str]:
+        """Возвращает имена всех файлов целевой директории, записанных в индекс
+
+        :return set[str]: Имена файлов
+        """
+        return {name for (name,) in self._conn.execute("SELECT name FROM contents")}
+
+    def find(self, digest: str) -> str | None:
+        """Ищет файл с заданным содержимым
+
+        :param str digest: Хеш содержимого
+        :return str | None: Имя файла в целевой директории или None
+        """
+        row = self._conn.execute("SELECT name FROM contents WHERE digest = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, digest: str, name: str) -> None:
+        """Записывает файл целевой директории
+
+        :param str digest: Хеш содержимого
+        :param str name: Имя файла в целевой директории
+        """
+        self._conn.execute("INSERT OR REPLACE INTO contents (digest, name) VALUES (?, ?)", (digest, name))
+
+    def forget_missing(self, existing: set[str]) -> int:
+        """Удаляет из индекса файлы, которых больше нет в целевой директории
+
+        :param set[str] existing: Имена файлов, находящихся в целевой директории
+        :return int: Количество удаленных записей
+        """
+        missing = [(name,) for name in self.names() - existing]
+        self._conn.executemany("DELETE FROM contents WHERE name = ?", missing)
+        return len(missing)
+
+    def unchanged_sources(self, entries: Iterable[tuple[str, int, int]]) -> set[str]:
+        """Отбирает исходные файлы, обработанные ранее и не изменившиеся с тех пор
+
+        :param Iterable[tuple[str, int, int]] entries: Путь, размер и время изменения файлов
+        :return set[str]: Пути файлов, которые можно пропустить
+        """
+        entries = list(entries)
+        known = {}
+
+        # Ограничение SQLite на количество параметров в запросе
+        for start in range(0, len(entries), 500):
+            paths = [path for path, _, _ in entries[start:start + 500]]
+            placeholders = ",".join("?" * len(paths))
+            known.update(
+                (path, (size, mtime_ns))
+                for path, size, mtime_ns in self._conn.execute(
+                    f"SELECT path, size, mtime_ns FROM sources WHERE path IN ({placeholders})", paths
+                )
+            )
+
+        return {path for path, size, mtime_ns in entries if known.get(path) == (size, mtime_ns)}
+
+    def add_sources(self, entries: Iterable[tuple[str, int, int, str | None]]) -> None:
+        """Записывает обработанные исходные файлы
+
+        :param Iterable[tuple[str, int, int, str | None]] entries: Путь, размер, время изменения и хеш содержимого
+        """
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO sources (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            entries,
+        )
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "HashIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def source_key(path: str | os.PathLike) -> str:
+    """Нормализует путь исходного файла для записи в индекс
+
+    :param str | os.PathLike path: Путь до файла
+    :return str: Абсолютный путь
+    """
+    return os.path.abspath(path)
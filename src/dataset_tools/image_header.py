@@ -0,0 +1,64 @@
+import struct
+from pathlib import Path
+
+import cv2
+
+# Маркеры JPEG SOF0–SOF15 с размером кадра; C4, C8 и CC — таблицы, а не кадры
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def image_size(path: str | Path) -> tuple[int, int] | None:
+    """Читает размер изображения из заголовка файла без декодирования пикселей
+
+    PNG и JPEG разбираются по заголовку; для остальных форматов изображение декодируется.
+
+    :param str | Path path: Путь до изображения
+    :return tuple[int, int] | None: Ширина и высота или None, если файл не является изображением
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(24)
+
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+                return struct.unpack(">II", head[16:24])
+
+            if head.startswith(b"\xff\xd8"):
+                f.seek(2)
+                return _jpeg_size(f)
+    except (OSError, struct.error):
+        return None
+
+    image = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+    return (image.shape[1], image.shape[0]) if image is not None else None
+
+
+def _jpeg_size(f) -> tuple[int, int] | None:
+    """Ищет маркер SOF и читает из него размер кадра
+
+    :param f: Файл, открытый на позиции после маркера SOI
+    :return tuple[int, int] | None: Ширина и высота или None, если маркер не найден
+    """
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+
+        if not byte:
+            return None
+
+        marker = byte[0]
+        # Маркеры без длины: RST0–RST7, SOI, TEM
+        if 0xD0 <= marker <= 0xD8 or marker == 0x01:
+            continue
+        if marker == 0xD9:
+            return None
+
+        (length,) = struct.unpack(">H", f.read(2))
+
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack(">xHH", f.read(5))
+            return width, height
+
+        f.seek(length - 2, 1)
@@ -0,0 +1,372 @@
+import os
+import time
+import logging
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .renamer import YOLODatasetRenamer
+from .image_header import image_size
+
+logger = logging.getLogger(__name__)
+
+# Имя файла индекса по умолчанию; он хранится в директории датасета
+INDEX_NAME = ".dataset_index.npz"
+
+# Версия формата индекса: индекс другой версии перестраивается целиком
+INDEX_VERSION = 1
+
+# Состояние файла меток
+LABEL_OK = 0
+LABEL_EMPTY = 1
+LABEL_CORRUPT = 2
+
+# Количество пар в одной задаче пула процессов
+CHUNK_SIZE = 256
+
+_FILE_COLUMNS = (
+    "image",
+    "label",
+    "image_mtime_ns",
+    "label_mtime_ns",
+    "width",
+    "height",
+    "status",
+)
+_POLYGON_COLUMNS = ("file", "cls", "points", "area")
+
+
+class DatasetIndex:
+
+    def __init__(self, dataset_dir: str | Path, index_path: str | Path | None = None, workers: int | None = None):
+        self.dataset_dir = Path(dataset_dir).resolve()
+        self.index_path = Path(index_path) if index_path else self.dataset_dir / INDEX_NAME
+        self.workers = workers
+
+        # Таблица файлов: одна строка на пару изображения и метки
+        self.files: dict[str, np.ndarray] = _empty_files()
+        # Таблица полигонов: одна строка на объект; file — номер строки в таблице файлов
+        self.polygons: dict[str, np.ndarray] = _empty_polygons()
+
+        if self.index_path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.files["image"])
+
+    def update(self) -> dict[str, int]:
+        """Обновляет индекс: разбирает только новые и изменившиеся пары, удаляет исчезнувшие
+
+        Пары находятся через YOLODatasetRenamer.find_yolo_pairs, метки разбираются в пуле
+        процессов, а размер изображения читается из заголовка файла.
+
+        :return dict[str, int]: Количество пар: всего, разобранных заново и удаленных из индекса
+        """
+        started = time.perf_counter()
+        renamer = YOLODatasetRenamer(self.dataset_dir, prefix="index", dry_run=True)
+
+        pairs = []
+        for img, lbl in renamer.find_yolo_pairs():
+            img_stat, lbl_stat = img.stat(), lbl.stat()
+            pairs.append((
+                img.relative_to(self.dataset_dir).as_posix(),
+                lbl.relative_to(self.dataset_dir).as_posix(),
+                img_stat.st_mtime_ns,
+                lbl_stat.st_mtime_ns,
+            ))
+
+        known = {
+            (image, image_mtime, label_mtime): row
+            for row, (image, image_mtime, label_mtime) in enumerate(zip(
+                self.files["image"].tolist(),
+                self.files["image_mtime_ns"].tolist(),
+                self.files["label_mtime_ns"].tolist(),
+            ))
+        }
+
+        kept_rows = [known.get((image, image_mtime, label_mtime)) for image, _, image_mtime, label_mtime in pairs]
+        changed = [pair for pair, row in zip(pairs, kept_rows) if row is None]
+        kept_rows = [row for row in kept_rows if row is not None]
+        removed = len(set(self.files["image"].tolist()) - {image for image, _, _, _ in pairs})
+
+        parsed = self._parse(changed)
+        self._merge(np.asarray(kept_rows, dtype=np.int64), changed, parsed)
+        self.save()
+
+        logger.info(
+            "Индекс датасета обновлен за %.2f с: пар %d, разобрано %d, удалено %d",
+            time.perf_counter() - started,
+            len(self),
+            len(changed),
+            removed,
+        )
+
+        return {"pairs": len(self), "parsed": len(changed), "removed": removed}
+
+    def save(self) -> None:
+        """Сохраняет индекс в сжатый npz через временный файл"""
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp.npz")
+
+        np.savez_compressed(
+            tmp_path,
+            version=np.int64(INDEX_VERSION),
+            **{f"files_{name}": column for name, column in self.files.items()},
+            **{f"polygons_{name}": column for name, column in self.polygons.items()},
+        )
+        os.replace(tmp_path, self.index_path)
+
+    def class_histogram(self, minlength: int = 0) -> np.ndarray:
+        """Возвращает количество объектов каждого класса
+
+        :param int minlength: Минимальная длина результата, например количество классов датасета
+        :return np.ndarray: Количество объектов по индексу класса
+        """
+        return np.bincount(self.polygons["cls"], minlength=minlength)
+
+    def images_per_class(self, minlength: int = 0) -> np.ndarray:
+        """Возвращает количество изображений, на которых есть объекты каждого класса
+
+        :param int minlength: Минимальная длина результата
+        :return np.ndarray: Количество изображений по индексу класса
+        """
+        if not len(self.polygons["cls"]):
+            return np.zeros(minlength, dtype=np.int64)
+
+        pairs = np.unique(np.stack([self.polygons["file"], self.polygons["cls"]]), axis=1)
+        return np.bincount(pairs[1], minlength=minlength)
+
+    def empty_labels(self) -> list[str]:
+        """Возвращает изображения с пустыми файлами меток
+
+        :return list[str]: Пути изображений относительно датасета
+        """
+        return self.files["image"][self.files["status"] == LABEL_EMPTY].tolist()
+
+    def corrupt_labels(self) -> list[str]:
+        """Возвращает метки с некорректными строками: нечетное число координат, меньше трех точек
+        или координаты вне [0, 1]
+
+        :return list[str]: Пути меток относительно датасета
+        """
+        return self.files["label"][self.files["status"] == LABEL_CORRUPT].tolist()
+
+    def unreadable_images(self) -> list[str]:
+        """Возвращает изображения, размер которых не удалось прочитать
+
+        :return list[str]: Пути изображений относительно датасета
+        """
+        return self.files["image"][self.files["width"] < 0].tolist()
+
+    def polygon_areas(self, cls: int | None = None, pixels: bool = False) -> np.ndarray:
+        """Возвращает площади полигонов
+
+        :param int | None cls: Класс объектов; None — все классы
+        :param bool pixels: Вернуть площадь в пикселях изображения вместо доли площади изображения
+        :return np.ndarray: Площади полигонов
+        """
+        areas = self.polygons["area"].astype(np.float64)
+
+        if pixels:
+            files = self.polygons["file"]
+            areas = areas * self.files["width"][files] * self.files["height"][files]
+
+        if cls is not None:
+            areas = areas[self.polygons["cls"] == cls]
+
+        return areas
+
+    def area_histogram(self, bins: int | np.ndarray = 20, cls: int | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Возвращает распределение долей площади изображения, занятых объектами
+
+        :param int | np.ndarray bins: Количество или границы корзин на отрезке [0, 1]
+        :param int | None cls: Класс объектов; None — все классы
+        :return tuple[np.ndarray, np.ndarray]: Количество объектов в корзинах и границы корзин
+        """
+        return np.histogram(self.polygon_areas(cls), bins=bins, range=(0.0, 1.0))
+
+    def polygons_per_image(self) -> np.ndarray:
+        """Возвращает количество объектов на каждом изображении
+
+        :return np.ndarray: Количество объектов по строкам таблицы файлов
+        """
+        return np.bincount(self.polygons["file"], minlength=len(self))
+
+    def image_sizes(self) -> dict[tuple[int, int], int]:
+        """Возвращает количество изображений каждого размера
+
+        :return dict[tuple[int, int], int]: Количество изображений по размеру (W, H)
+        """
+        sizes, counts = np.unique(np.stack([self.files["width"], self.files["height"]], axis=1), axis=0, return_counts=True)
+        return {(int(w), int(h)): int(count) for (w, h), count in zip(sizes, counts)}
+
+    def summary(self) -> dict:
+        """Возвращает сводку по датасету
+
+        :return dict: Количество пар и объектов, гистограмма классов, проблемные файлы и размеры изображений
+        """
+        return {
+            "pairs": len(self),
+            "polygons": len(self.polygons["cls"]),
+            "classes": self.class_histogram().tolist(),
+            "empty_labels": int(np.count_nonzero(self.files["status"] == LABEL_EMPTY)),
+            "corrupt_labels": int(np.count_nonzero(self.files["status"] == LABEL_CORRUPT)),
+            "unreadable_images": int(np.count_nonzero(self.files["width"] < 0)),
+            "image_sizes": {f"{w}x{h}": count for (w, h), count in self.image_sizes().items()},
+        }
+
+    def _parse(self, pairs: list[tuple[str, str, int, int]]) -> list[tuple[int, int, int, list[tuple[int, int, float]]]]:
+        """Разбирает пары в пуле процессов
+
+        :param list pairs: Путь изображения, путь метки и время их изменения
+        :return list: Ширина, высота, состояние метки и полигоны (класс, количество точек, площадь) каждой пары
+        """
+        if not pairs:
+            return []
+
+        chunks = [
+            (str(self.dataset_dir), [(image, label) for image, label, _, _ in pairs[start:start + CHUNK_SIZE]])
+            for start in range(0, len(pairs), CHUNK_SIZE)
+        ]
+
+        # Запуск процессов дороже разбора одной небольшой пачки
+        if len(chunks) == 1:
+            return _parse_chunk(chunks[0])
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return [result for chunk in pool.map(_parse_chunk, chunks) for result in chunk]
+
+    def _merge(
+        self,
+        kept_rows: np.ndarray,
+        changed: list[tuple[str, str, int, int]],
+        parsed: list[tuple[int, int, int, list[tuple[int, int, float]]]],
+    ) -> None:
+        """Собирает новые таблицы из сохраненных строк и заново разобранных пар
+
+        :param np.ndarray kept_rows: Номера строк старой таблицы файлов, которые остаются без изменений
+        :param list changed: Заново разобранные пары
+        :param list parsed: Результаты разбора пар
+        """
+        old_files, old_polygons = self.files, self.polygons
+
+        # Полигоны сохраненных строк переносятся целиком с перенумерацией строк файлов
+        renumber = np.full(len(old_files["image"]), -1, dtype=np.int64)
+        renumber[kept_rows] = np.arange(len(kept_rows))
+        kept_polygons = renumber[old_polygons["file"]] >= 0
+
+        files = {name: old_files[name][kept_rows] for name in _FILE_COLUMNS}
+        polygons = {name: old_polygons[name][kept_polygons] for name in _POLYGON_COLUMNS}
+        polygons["file"] = renumber[old_polygons["file"][kept_polygons]].astype(np.int32)
+
+        if changed:
+            new_files = {
+                "image": np.asarray([pair[0] for pair in changed], dtype=np.str_),
+                "label": np.asarray([pair[1] for pair in changed], dtype=np.str_),
+                "image_mtime_ns": np.asarray([pair[2] for pair in changed], dtype=np.int64),
+                "label_mtime_ns": np.asarray([pair[3] for pair in changed], dtype=np.int64),
+                "width": np.asarray([result[0] for result in parsed], dtype=np.int32),
+                "height": np.asarray([result[1] for result in parsed], dtype=np.int32),
+                "status": np.asarray([result[2] for result in parsed], dtype=np.int8),
+            }
+
+            offset = len(kept_rows)
+            rows = [(offset + i, *polygon) for i, result in enumerate(parsed) for polygon in result[3]]
+            new_polygons = _empty_polygons()
+            if rows:
+                file, cls, points, area = zip(*rows)
+                new_polygons = {
+                    "file": np.asarray(file, dtype=np.int32),
+                    "cls": np.asarray(cls, dtype=np.int32),
+                    "points": np.asarray(points, dtype=np.int32),
+                    "area": np.asarray(area, dtype=np.float32),
+                }
+
+            files = {name: np.concatenate([files[name], new_files[name]]) for name in _FILE_COLUMNS}
+            polygons = {name: np.concatenate([polygons[name], new_polygons[name]]) for name in _POLYGON_COLUMNS}
+
+        self.files, self.polygons = files, polygons
+
+    def _load(self) -> None:
+        with np.load(self.index_path, allow_pickle=False) as data:
+            if "version" not in data or int(data["version"]) != INDEX_VERSION:
+                logger.warning("Индекс %s другой версии будет перестроен", self.index_path)
+                return
+
+            self.files = {name: data[f"files_{name}"] for name in _FILE_COLUMNS}
+            self.polygons = {name: data[f"polygons_{name}"] for name in _POLYGON_COLUMNS}
+
+
+def parse_label(path: str | Path) -> tuple[int, list[tuple[int, int, float]]]:
+    """Разбирает файл меток сегментации YOLO
+
+    :param str | Path path: Путь до файла меток
+    :return tuple[int, list[tuple[int, int, float]]]: Состояние метки и полигоны: класс, количество точек и доля площади изображения
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line.split() for line in f if line.strip()]
+    except (OSError, UnicodeDecodeError):
+        return LABEL_CORRUPT, []
+
+    if not lines:
+        return LABEL_EMPTY, []
+
+    status = LABEL_OK
+    polygons = []
+
+    for values in lines:
+        try:
+            cls = int(values[0])
+            coords = np.asarray(values[1:], dtype=np.float64)
+        except ValueError:
+            status = LABEL_CORRUPT
+            continue
+
+        if cls < 0 or coords.size % 2 or coords.size < 6 or coords.min() < 0 or coords.max() > 1:
+            status = LABEL_CORRUPT
+            continue
+
+        x, y = coords[0::2], coords[1::2]
+        area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+        polygons.append((cls, len(x), float(area)))
+
+    return status, polygons
+
+
+def _parse_chunk(chunk: tuple[str, list[tuple[str, str]]]) -> list[tuple[int, int, int, list[tuple[int, int, float]]]]:
+    """Разбирает пачку пар; выполняется в процессе пула
+
+    :param tuple chunk: Директория датасета и пути изображений и меток относительно нее
+    :return list: Ширина, высота, состояние метки и полигоны каждой пары
+    """
+    root, pairs = chunk
+    results = []
+
+    for image, label in pairs:
+        size = image_size(os.path.join(root, image)) or (-1, -1)
+        status, polygons = parse_label(os.path.join(root, label))
+        results.append((size[0], size[1], status, polygons))
+
+    return results
+
+
+def _empty_files() -> dict[str, np.ndarray]:
+    return {
+        "image": np.zeros(0, dtype=np.str_),
+        "label": np.zeros(0, dtype=np.str_),
+        "image_mtime_ns": np.zeros(0, dtype=np.int64),
+        "label_mtime_ns": np.zeros(0, dtype=np.int64),
+        "width": np.zeros(0, dtype=np.int32),
+        "height": np.zeros(0, dtype=np.int32),
+        "status": np.zeros(0, dtype=np.int8),
+    }
+
+
+def _empty_polygons() -> dict[str, np.ndarray]:
+    return {
+        "file": np.zeros(0, dtype=np.int32),
+        "cls": np.zeros(0, dtype=np.int32),
+        "points": np.zeros(0, dtype=np.int32),
+        "area": np.zeros(0, dtype=np.float32),
+    }
@@ -1,8 +1,44 @@
+import os
 import re
+import json
+import logging
 from pathlib import Path
+from dataclasses import astuple, dataclass
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 
 from .extensions import ImageExtensions
 
+logger = logging.getLogger(__name__)
+
+# Манифест переименования и его состояние хранятся в директории датасета
+MANIFEST_NAME = ".rename_manifest.jsonl"
+STATE_SUFFIX = ".state"
+
+# Суффикс временных имен первой фазы
+TEMP_SUFFIX = ".renaming"
+
+
+@dataclass
+class RenameEntry:
+    """Переименование пары изображения и метки.
+
+    :param str split: Поддиректория датасета с папками images/ и labels/, относительно датасета
+    :param str image: Путь до изображения относительно датасета
+    :param str label: Путь до метки относительно датасета
+    :param str stem: Новое имя пары без расширения
+    """
+    split: str
+    image: str
+    label: str
+    stem: str
+
+    def moves(self) -> Iterator[tuple[str, str]]:
+        """Возвращает исходный и новый путь изображения и метки относительно датасета"""
+        for path in (self.image, self.label):
+            head, name = os.path.split(path)
+            yield path, os.path.join(head, self.stem + os.path.splitext(name)[1])
+
 
 class YOLODatasetRenamer:
 
@@ -11,62 +47,280 @@ class YOLODatasetRenamer:
         dataset_dir: str | Path,
         prefix: str | None = None,
         dry_run: bool = False,
+        workers: int | None = None,
+        manifest_path: str | Path | None = None,
     ):
         self.dataset_dir = Path(dataset_dir).resolve()
         self.prefix = prefix or self._get_prefix()
         self.dry_run = dry_run
+        self.workers = workers
+        self.manifest_path = Path(manifest_path) if manifest_path else self.dataset_dir / MANIFEST_NAME
+
+        self._scheme = re.compile(rf"{re.escape(self.prefix)}_(\d{{5,}})")
 
         self._validate_structure()
 
+    @property
+    def state_path(self) -> Path:
+        return self.manifest_path.with_name(self.manifest_path.name + STATE_SUFFIX)
+
     def find_yolo_pairs(self) -> list[tuple[Path, Path]]:
         """Рекурсивно находит пары изображений и меток.
 
         :return list[tuple[Path, Path]]: Список пар изображений и меток
         """
         pairs = []
-        splits = self._find_dataset_splits()
-
-        for split_dir in splits:
-            images_dir = split_dir / "images"
-            labels_dir = split_dir / "labels"
 
-            for img_path in images_dir.rglob("*"):
-                if not img_path.is_file() or img_path.suffix.lower() not in ImageExtensions.get_extensions():
-                    continue
+        for split_dir in self._find_dataset_splits():
+            images, labels = self._scan_split(split_dir)
 
-                rel_path = img_path.relative_to(images_dir)
-                lbl_path = labels_dir / rel_path.with_suffix(".txt")
+            for rel_path in images:
+                stem = os.path.splitext(rel_path)[0]
 
-                if lbl_path.exists():
-                    pairs.append((img_path, lbl_path))
+                if stem in labels:
+                    pairs.append((split_dir / "images" / rel_path, split_dir / "labels" / (stem + ".txt")))
                 else:
-                    print(f"No label found for image: {img_path}")
+                    print(f"No label found for image: {split_dir / 'images' / rel_path}")
 
         return pairs
 
+    def plan(self, pairs: list[tuple[Path, Path]]) -> list[RenameEntry]:
+        """Составляет переименования пар, еще не соответствующих схеме {prefix}_{номер}
+
+        Пары, уже названные по схеме, сохраняют свои номера, а остальные получают
+        свободные номера по порядку путей, поэтому повторный запуск ничего не меняет.
+
+        :param list[tuple[Path, Path]] pairs: Список пар изображений и меток
+        :return list[RenameEntry]: Переименования
+        """
+        used = set()
+        pending = []
+
+        for img, lbl in sorted(pairs):
+            match = self._scheme.fullmatch(img.stem)
+            if match and img.stem == lbl.stem:
+                used.add(int(match.group(1)))
+            else:
+                pending.append((img, lbl))
+
+        # Номера, занятые файлами без пары, тоже не выдаются, чтобы новые имена не совпали с ними
+        used |= self._taken_numbers()
+
+        entries = []
+        number = 0
+        for img, lbl in pending:
+            number += 1
+            while number in used:
+                number += 1
+
+            # Поддиректории датасета — сам датасет или его непосредственные поддиректории
+            image = img.relative_to(self.dataset_dir)
+            split = "." if image.parts[0] == "images" else image.parts[0]
+
+            entries.append(RenameEntry(
+                split=split,
+                image=image.as_posix(),
+                label=lbl.relative_to(self.dataset_dir).as_posix(),
+                stem=f"{self.prefix}_{number:05d}",
+            ))
+
+        return entries
+
     def rename_pairs(self, pairs: list[tuple[Path, Path]]) -> None:
         """Переименовывает все пары с заданным префиксом.
 
+        Переименования записываются в манифест и применяются в две фазы: сначала все
+        файлы получают временные имена, затем — итоговые, поэтому новые имена не
+        конфликтуют со старыми. Прерванное переименование продолжается resume()
+        или откатывается rollback().
+
         :param list[tuple[Path, Path]] pairs: Список пар изображений и меток
         """
-        for idx, (img, lbl) in enumerate(pairs, start=1):
-            new_name = f"{self.prefix}_{idx:05d}"
-            new_img = img.with_name(new_name + img.suffix)
-            new_lbl = lbl.with_name(new_name + lbl.suffix)
+        entries = self.plan(pairs)
 
-            if self.dry_run:
-                print(f"[DRY-RUN] Would rename: {img.name} -> {new_img.name}")
-                print(f"[DRY-RUN] Would rename: {lbl.name} -> {new_lbl.name}")
-                continue
+        if self.dry_run:
+            for entry in entries:
+                for old, new in entry.moves():
+                    print(f"[DRY-RUN] Would rename: {os.path.basename(old)} -> {os.path.basename(new)}")
+            return
 
-            img.rename(new_img)
-            lbl.rename(new_lbl)
+        if not entries:
+            logger.info("Все пары уже названы по схеме %s_<номер>", self.prefix)
+            return
+
+        self._write_manifest(entries)
+        self._apply(entries, phase="planned")
 
     def run(self) -> None:
         """Запускает переименование."""
+        if self.state() in ("planned", "staged"):
+            if self.dry_run:
+                # Файлы не трогаются: выводятся только переименования, которые выполнит resume()
+                for entry in self._read_manifest():
+                    for old, new in entry.moves():
+                        if not (self.dataset_dir / new).exists():
+                            print(f"[DRY-RUN] Would rename: {os.path.basename(old)} -> {os.path.basename(new)}")
+                return
+
+            logger.warning("Найдено незавершенное переименование, продолжение по манифесту %s", self.manifest_path)
+            self.resume()
+            return
+
         pairs = self.find_yolo_pairs()
         self.rename_pairs(pairs)
 
+    def state(self) -> str | None:
+        """Возвращает фазу последнего переименования по манифесту
+
+        :return str | None: 'planned', 'staged', 'done', 'rolled_back' или None, если манифеста нет
+        """
+        if not self.state_path.exists():
+            return None
+        return self.state_path.read_text(encoding="utf-8").strip()
+
+    def resume(self) -> None:
+        """Завершает прерванное переименование по манифесту
+
+        :raises FileNotFoundError: Если манифест не найден
+        """
+        self._apply(self._read_manifest(), phase=self.state())
+
+    def rollback(self) -> None:
+        """Возвращает исходные имена всех пар из манифеста, в том числе после завершенного переименования
+
+        :raises FileNotFoundError: Если манифест не найден
+        """
+        entries = self._read_manifest()
+
+        def restore(group: list[RenameEntry]) -> None:
+            for entry in group:
+                for old, new in entry.moves():
+                    # Файл может находиться под итоговым или временным именем в зависимости от момента прерывания
+                    for current in (new, new + TEMP_SUFFIX):
+                        try:
+                            os.rename(self.dataset_dir / current, self.dataset_dir / old)
+                            break
+                        except FileNotFoundError:
+                            continue
+
+        self._run_per_split(entries, restore)
+        self._set_state("rolled_back")
+        logger.info("Откат переименования %d пар завершен", len(entries))
+
+    def _apply(self, entries: list[RenameEntry], phase: str | None) -> None:
+        """Выполняет оставшиеся фазы переименования
+
+        Отсутствующий исходный файл означает, что он уже переименован до прерывания,
+        поэтому обе фазы можно повторять.
+
+        :param list[RenameEntry] entries: Переименования
+        :param str | None phase: Последняя завершенная фаза
+        """
+        def stage(group: list[RenameEntry]) -> None:
+            for entry in group:
+                for old, new in entry.moves():
+                    _rename_if_exists(self.dataset_dir / old, self.dataset_dir / (new + TEMP_SUFFIX))
+
+        def finalize(group: list[RenameEntry]) -> None:
+            for entry in group:
+                for _, new in entry.moves():
+                    _rename_if_exists(self.dataset_dir / (new + TEMP_SUFFIX), self.dataset_dir / new)
+
+        if phase == "planned":
+            self._run_per_split(entries, stage)
+            self._set_state("staged")
+            phase = "staged"
+
+        if phase == "staged":
+            self._run_per_split(entries, finalize)
+            self._set_state("done")
+            logger.info("Переименовано %d пар", len(entries))
+
+    def _run_per_split(self, entries: list[RenameEntry], action) -> None:
+        """Выполняет действие над переименованиями параллельно по поддиректориям датасета
+
+        :param list[RenameEntry] entries: Переименования
+        :param action: Функция, принимающая переименования одной поддиректории
+        """
+        groups: dict[str, list[RenameEntry]] = {}
+        for entry in entries:
+            groups.setdefault(entry.split, []).append(entry)
+
+        with ThreadPoolExecutor(max_workers=self.workers or len(groups) or 1) as pool:
+            # list() пробрасывает исключения потоков
+            list(pool.map(action, groups.values()))
+
+    def _write_manifest(self, entries: list[RenameEntry]) -> None:
+        """Записывает манифест до начала переименования
+
+        :param list[RenameEntry] entries: Переименования
+        """
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"prefix": self.prefix, "pairs": len(entries)}, ensure_ascii=False) + "\n")
+            for entry in entries:
+                f.write(json.dumps(astuple(entry), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.manifest_path)
+        self._set_state("planned")
+
+    def _read_manifest(self) -> list[RenameEntry]:
+        """Читает переименования из манифеста
+
+        :return list[RenameEntry]: Переименования
+        :raises FileNotFoundError: Если манифест не найден
+        """
+        if not self.manifest_path.exists():
+            raise FileNotFoundError(f"Manifest not found: {self.manifest_path}")
+
+        with open(self.manifest_path, encoding="utf-8") as f:
+            next(f)
+            return [RenameEntry(*json.loads(line)) for line in f]
+
+    def _set_state(self, state: str) -> None:
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp_path.write_text(state, encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def _scan_split(self, split_dir: Path) -> tuple[list[str], set[str]]:
+        """Читает изображения и метки поддиректории одним обходом каждой папки
+
+        :param Path split_dir: Поддиректория с папками images/ и labels/
+        :return tuple[list[str], set[str]]: Пути изображений относительно images/ и пути меток без расширения относительно labels/
+        """
+        extensions = ImageExtensions.get_extensions()
+
+        images = [
+            rel_path for rel_path in _scan_files(split_dir / "images")
+            if os.path.splitext(rel_path)[1].lower() in extensions
+        ]
+        labels = {
+            os.path.splitext(rel_path)[0] for rel_path in _scan_files(split_dir / "labels")
+            if rel_path.endswith(".txt")
+        }
+
+        return images, labels
+
+    def _taken_numbers(self) -> set[int]:
+        """Собирает номера схемы из имен всех файлов в папках images/ и labels/
+
+        :return set[int]: Занятые номера
+        """
+        numbers = set()
+
+        for split_dir in self._find_dataset_splits():
+            for folder in ("images", "labels"):
+                for rel_path in _scan_files(split_dir / folder):
+                    stem = os.path.splitext(os.path.basename(rel_path))[0]
+                    match = self._scheme.fullmatch(stem)
+                    if match:
+                        numbers.add(int(match.group(1)))
+
+        return numbers
+
     def _validate_structure(self) -> None:
         """Проверяет, что директория датасета имеет 'images' и 'labels' директории.
 
@@ -124,3 +378,40 @@ class YOLODatasetRenamer:
             prefix = prefix[:20].rstrip('_')
 
         return prefix
+
+
+def _scan_files(root: Path) -> Iterator[str]:
+    """Рекурсивно обходит директорию через os.scandir
+
+    :param Path root: Директория
+    :return Iterator[str]: Пути файлов относительно директории
+    """
+    stack = [""]
+
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(root / rel_dir) as entries:
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(rel_path)
+                elif entry.is_file():
+                    yield rel_path
+
+
+def _rename_if_exists(source: Path, target: Path) -> None:
+    """Переименовывает файл, пропуская уже переименованный
+
+    :param Path source: Текущий путь
+    :param Path target: Новый путь
+    :raises FileExistsError: Если новый путь занят другим файлом
+    """
+    if os.path.lexists(target):
+        if os.path.lexists(source):
+            raise FileExistsError(f"Target already exists: {target}")
+        return
+
+    try:
+        os.rename(source, target)
+    except FileNotFoundError:
+        pass
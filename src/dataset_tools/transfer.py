@@ -0,0 +1,87 @@
+import os
+import sys
+import errno
+import shutil
+from typing import Literal
+from pathlib import Path
+
+TransferMode = Literal["move", "copy", "hardlink", "reflink"]
+
+# Номер ioctl FICLONE в Linux: клон файла с общими блоками на Btrfs, XFS и других файловых системах с поддержкой reflink
+_FICLONE = 0x40049409
+
+# Ошибки, при которых ссылка на файл невозможна и выполняется обычное копирование
+_LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.EMLINK, errno.ENOTTY}
+
+
+def transfer_file(source: str | Path, target: str | Path, mode: TransferMode) -> TransferMode:
+    """Переносит файл в целевой путь заданным способом
+
+    Жесткая ссылка и reflink не копируют данные, но возможны только в пределах одной
+    файловой системы; если они недоступны, файл копируется.
+
+    :param str | Path source: Исходный файл
+    :param str | Path target: Целевой путь; файл по нему не должен существовать
+    :param str mode: Перемещение, копирование, жесткая ссылка или reflink
+    :return str: Фактически использованный способ
+    :raises FileExistsError: Если целевой файл уже существует
+    """
+    if mode == "move":
+        _ensure_absent(target)
+        try:
+            os.rename(source, target)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(source, target)
+        return "move"
+
+    if mode == "hardlink":
+        try:
+            os.link(source, target)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _LINK_UNSUPPORTED:
+                raise
+
+    if mode == "reflink" and _reflink(source, target):
+        return "reflink"
+
+    _ensure_absent(target)
+    shutil.copy2(source, target)
+    return "copy"
+
+
+def _reflink(source: str | Path, target: str | Path) -> bool:
+    """Создает reflink-копию файла
+
+    :param str | Path source: Исходный файл
+    :param str | Path target: Целевой путь
+    :return bool: True, если копия создана без копирования данных
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError as e:
+            if e.errno not in _LINK_UNSUPPORTED:
+                raise
+            cloned = False
+        else:
+            cloned = True
+
+    if not cloned:
+        os.unlink(target)
+        return False
+
+    shutil.copystat(source, target)
+    return True
+
+
+def _ensure_absent(target: str | Path) -> None:
+    if os.path.lexists(target):
+        raise FileExistsError(errno.EEXIST, "Файл уже существует", str(target))
@@ -0,0 +1,15 @@
+from .cache import PredictionCache, model_fingerprint
+from .labels import load_polygons, rasterize_polygons
+from .evaluator import SegmentationEvaluator
+from .accumulator import ImageMetrics, MetricsAccumulator, bootstrap_ci
+
+__all__ = [
+    'SegmentationEvaluator',
+    'MetricsAccumulator',
+    'ImageMetrics',
+    'PredictionCache',
+    'model_fingerprint',
+    'load_polygons',
+    'rasterize_polygons',
+    'bootstrap_ci',
+]
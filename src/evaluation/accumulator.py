@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ImageMetrics:
+    """Метрики одного изображения.
+
+    :param str image: Путь до изображения
+    :param bool cached: Взята ли маска из кеша предсказаний
+    :param int intersection: Пересечение переднего плана предсказания и разметки, пикселей
+    :param int union: Объединение переднего плана предсказания и разметки, пикселей
+    :param float iou: IoU переднего плана
+    :param float boundary_f: F-мера границ переднего плана
+    :param np.ndarray confusion: Матрица ошибок (K, K): строки — классы разметки, столбцы — предсказания; 0 — фон
+    """
+    image: str
+    cached: bool
+    intersection: int
+    union: int
+    iou: float
+    boundary_f: float
+    confusion: np.ndarray
+
+
+class MetricsAccumulator:
+
+    # Хранит суммы пикселей и матрицу ошибок, а по каждому изображению — только IoU и F-меру границ,
+    # поэтому память не зависит от размера изображений
+    def __init__(self):
+        self.images = 0
+        self.cached = 0
+        self.intersection = 0
+        self.union = 0
+        self.confusion = np.zeros((1, 1), dtype=np.int64)
+
+        self._ious: list[float] = []
+        self._boundary_f: list[float] = []
+
+    def update(self, sample: ImageMetrics) -> None:
+        """Добавляет метрики изображения к итогам
+
+        :param ImageMetrics sample: Метрики изображения
+        """
+        self.images += 1
+        self.cached += sample.cached
+        self.intersection += sample.intersection
+        self.union += sample.union
+        self._ious.append(sample.iou)
+        self._boundary_f.append(sample.boundary_f)
+
+        size = max(len(self.confusion), len(sample.confusion))
+        if size > len(self.confusion):
+            self.confusion = np.pad(self.confusion, (0, size - len(self.confusion)))
+
+        k = len(sample.confusion)
+        self.confusion[:k, :k] += sample.confusion
+
+    def class_iou(self) -> np.ndarray:
+        """Возвращает IoU каждого класса по матрице ошибок
+
+        :return np.ndarray: IoU классов без фона; NaN, если класса нет ни в разметке, ни в предсказаниях
+        """
+        tp = np.diag(self.confusion).astype(np.float64)
+        union = self.confusion.sum(axis=0) + self.confusion.sum(axis=1) - tp
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (tp / union)[1:]
+
+    def summary(
+        self,
+        iou_threshold: float = 0.5,
+        confidence: float = 0.95,
+        n_bootstrap: int = 1000,
+        seed: int = 0,
+    ) -> dict:
+        """Возвращает итоговые метрики
+
+        :param float iou_threshold: Порог IoU, при котором изображение считается успешно сегментированным
+        :param float confidence: Уровень доверительного интервала среднего IoU
+        :param int n_bootstrap: Количество бутстреп-выборок
+        :param int seed: Зерно бутстрепа
+        :return dict: Количество изображений, IoU по датасету и среднее по изображениям с интервалом,
+            доля успешных изображений, F-мера границ, IoU классов и матрица ошибок
+        """
+        ious = np.asarray(self._ious, dtype=np.float64)
+        boundary_f = np.asarray(self._boundary_f, dtype=np.float64)
+
+        if not len(ious):
+            return {"images": 0}
+
+        low, high = bootstrap_ci(ious, confidence, n_bootstrap, seed)
+
+        return {
+            "images": self.images,
+            "cached": self.cached,
+            "dataset_iou": self.intersection / self.union if self.union else 1.0,
+            "mean_iou": float(ious.mean()),
+            "mean_iou_ci": [low, high],
+            "iou_above_threshold": float(np.mean(ious >= iou_threshold)),
+            "mean_boundary_f": float(boundary_f.mean()),
+            "class_iou": [None if np.isnan(value) else float(value) for value in self.class_iou()],
+            "confusion": self.confusion.tolist(),
+        }
+
+
+def bootstrap_ci(
+    values: np.ndarray,
+    confidence: float = 0.95,
+    n_bootstrap: int = 1000,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Оценивает доверительный интервал среднего бутстрепом
+
+    Выборки строятся матрицей индексов по частям, чтобы память не росла с размером датасета.
+
+    :param np.ndarray values: Значения
+    :param float confidence: Уровень доверия
+    :param int n_bootstrap: Количество бутстреп-выборок
+    :param int seed: Зерно генератора
+    :return tuple[float, float]: Нижняя и верхняя граница интервала
+    """
+    rng = np.random.default_rng(seed)
+    n = len(values)
+
+    # Не больше ~8 млн индексов за раз
+    step = max(1, (1 << 23) // n)
+    means = np.concatenate([
+        values[rng.integers(0, n, (min(step, n_bootstrap - start), n))].mean(axis=1)
+        for start in range(0, n_bootstrap, step)
+    ])
+
+    alpha = (1 - confidence) / 2 * 100
+    return float(np.percentile(means, alpha)), float(np.percentile(means, 100 - alpha))
@@ -0,0 +1,71 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.config import SegmenterConfig
+from src.config.path import DEFAULT_MODEL_PATHS, SEGMENTATION_VARIANTS_PATH
+from src.dataset_tools.hash_index import file_digest
+from src.modules.segmentation.segmenters.variants import get_variant
+
+
+def model_fingerprint(config: SegmenterConfig) -> str:
+    """Вычисляет хеш модели: содержимое файла весов и параметры, влияющие на маски
+
+    :param SegmenterConfig config: Параметры сегментации
+    :return str: Шестнадцатеричный BLAKE2b-128 хеш
+    """
+    model, model_path = config.model, config.model_path
+
+    if config.variant is not None:
+        variant, path = get_variant(config.variant, config.variants_dir or SEGMENTATION_VARIANTS_PATH)
+        model, model_path = variant.backend, str(path)
+
+    model_path = Path(model_path or DEFAULT_MODEL_PATHS[model])
+
+    params = {
+        "model": model,
+        "weights": file_digest(model_path) if model_path.is_file() else str(model_path),
+        "inference_size": config.inference_size,
+        "upsampling": config.upsampling,
+    }
+
+    return hashlib.blake2b(json.dumps(params, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+
+class PredictionCache:
+
+    # Маски хранятся в PNG без потерь: директория модели, затем два первых символа хеша изображения
+    def __init__(self, directory: str | Path, model_hash: str):
+        self.directory = Path(directory) / model_hash
+
+    def path(self, image_hash: str) -> Path:
+        return self.directory / image_hash[:2] / f"{image_hash}.png"
+
+    def get(self, image_hash: str) -> np.ndarray | None:
+        """Читает сохраненную маску
+
+        :param str image_hash: Хеш содержимого изображения
+        :return np.ndarray | None: Маска (H, W) или None, если маски нет в кеше
+        """
+        path = self.path(image_hash)
+        if not path.exists():
+            return None
+
+        return cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+
+    def put(self, image_hash: str, mask: np.ndarray) -> None:
+        """Сохраняет маску; запись атомарна, поэтому процессы пула могут писать одновременно
+
+        :param str image_hash: Хеш содержимого изображения
+        :param np.ndarray mask: Маска (H, W)
+        """
+        path = self.path(image_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.png")
+        cv2.imwrite(str(tmp_path), mask)
+        os.replace(tmp_path, path)
@@ -0,0 +1,75 @@
+import json
+import logging
+import argparse
+
+from src.config import SegmenterConfig
+from src.config.path import DEFAULT_MODEL_PATHS, PREDICTION_CACHE_PATH
+
+from .evaluator import SegmentationEvaluator
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Оценка качества масок сегментации на датасете YOLO")
+
+    parser.add_argument('data', type=str, help='Директория датасета сегментации YOLO')
+    parser.add_argument('--model', type=str, default='yolo', choices=['yolo', 'yolo_onnx', 'mediapipe'], help='Бэкенд сегментации')
+    parser.add_argument('--model_path', type=str, default=None, help='Путь до модели сегментации')
+    parser.add_argument('--variant', type=str, default=None, help='Экспортированный вариант модели; заменяет --model и --model_path')
+    parser.add_argument('--variants_dir', type=str, default=None, help='Директория экспортированных вариантов')
+    parser.add_argument('--inference_size', type=int, default=None, help='Размер большей стороны кадра для инференса')
+
+    parser.add_argument('--workers', type=int, default=1, help='Количество процессов')
+    parser.add_argument('--threads', type=int, default=1, help='Количество потоков вычислительных библиотек на процесс')
+    parser.add_argument('--limit', type=int, default=None, help='Максимальное количество изображений')
+    parser.add_argument('--cache_dir', type=str, default=str(PREDICTION_CACHE_PATH), help='Директория кеша предсказаний')
+    parser.add_argument('--no_cache', action='store_true', help='Не использовать кеш предсказаний')
+
+    parser.add_argument('--iou_threshold', type=float, default=0.5, help='Порог IoU успешно сегментированного изображения')
+    parser.add_argument('--boundary_tolerance', type=float, default=0.0075, help='Допуск F-меры границ относительно диагонали кадра')
+    parser.add_argument('--confidence', type=float, default=0.95, help='Уровень доверительного интервала среднего IoU')
+    parser.add_argument('--output', type=str, default=None, help='Путь для сохранения результатов в JSON')
+
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    config = SegmenterConfig(
+        model=args.model,
+        model_path=args.model_path or str(DEFAULT_MODEL_PATHS[args.model]),
+        inference_size=args.inference_size,
+        variant=args.variant,
+        variants_dir=args.variants_dir,
+    )
+
+    evaluator = SegmentationEvaluator(
+        config,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        workers=args.workers,
+        threads=args.threads,
+        boundary_tolerance=args.boundary_tolerance,
+    )
+
+    summary = evaluator.evaluate(args.data, args.limit, progress_bar=True).summary(args.iou_threshold, args.confidence)
+    summary["model_hash"] = evaluator.model_hash
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    if not summary["images"]:
+        print("Изображения с разметкой не найдены")
+        return
+
+    low, high = summary["mean_iou_ci"]
+    print(f"Изображений: {summary['images']} (из кеша {summary['cached']})")
+    print(f"IoU по датасету: {summary['dataset_iou']:.4f}")
+    print(f"IoU средний [{args.confidence:.0%} ДИ]: {summary['mean_iou']:.4f} [{low:.4f}, {high:.4f}]")
+    print(f"Доля изображений с IoU >= {args.iou_threshold}: {summary['iou_above_threshold']:.4f}")
+    print(f"F-мера границ: {summary['mean_boundary_f']:.4f}")
+
+    for cls, iou in enumerate(summary["class_iou"]):
+        if iou is not None:
+            print(f"IoU класса {cls}: {iou:.4f}")
@@ -0,0 +1,88 @@
+import logging
+import multiprocessing
+from pathlib import Path
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor
+
+from tqdm import tqdm
+
+from src.config import SegmenterConfig
+from src.config.path import PREDICTION_CACHE_PATH
+from src.dataset_tools import YOLODatasetRenamer
+
+from .cache import PredictionCache, model_fingerprint
+from .worker import init_worker, evaluate_pair
+from .accumulator import MetricsAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentationEvaluator:
+
+    def __init__(
+        self,
+        config: SegmenterConfig,
+        cache_dir: str | Path | None = PREDICTION_CACHE_PATH,
+        workers: int = 1,
+        threads: int = 1,
+        boundary_tolerance: float = 0.0075,
+    ):
+        # Изображения датасета независимы, поэтому слои с состоянием между кадрами отключаются,
+        # а процессы сегментации заменяются пулом оценки
+        self.config = replace(config, temporal=None, roi=None, workers=0)
+        self.workers = workers
+        self.threads = threads
+        self.boundary_tolerance = boundary_tolerance
+
+        self.model_hash = model_fingerprint(self.config)
+        self.cache = PredictionCache(cache_dir, self.model_hash) if cache_dir is not None else None
+
+    def evaluate(
+        self,
+        dataset_dir: str | Path,
+        limit: int | None = None,
+        progress_bar: bool = False,
+    ) -> MetricsAccumulator:
+        """Оценивает маски сегментатора на датасете сегментации YOLO
+
+        Пары изображений и меток обрабатываются пулом процессов по мере поступления;
+        в основной процесс возвращаются только метрики изображений. Маски сохраняются
+        в кеш по хешу модели и хешу изображения, поэтому повторная оценка с другими
+        порогами не запускает модель.
+
+        :param str | Path dataset_dir: Директория датасета
+        :param int | None limit: Максимальное количество изображений
+        :param bool progress_bar: Если True - показывает прогресс бар
+        :return MetricsAccumulator: Накопленные метрики
+        """
+        pairs = YOLODatasetRenamer(dataset_dir, prefix="evaluation", dry_run=True).find_yolo_pairs()
+        pairs = pairs[:limit] if limit is not None else pairs
+
+        accumulator = MetricsAccumulator()
+        skipped = 0
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=init_worker,
+            initargs=(self.config, self.cache, self.boundary_tolerance, self.threads),
+        ) as executor:
+            # Пачки по несколько пар сокращают обмен сообщениями с процессами
+            chunksize = max(1, min(16, len(pairs) // (self.workers * 4)))
+            results = executor.map(evaluate_pair, pairs, chunksize=chunksize)
+
+            for sample in tqdm(results, total=len(pairs), unit="img", desc="Оценка", disable=not progress_bar):
+                if sample is None:
+                    skipped += 1
+                    continue
+                accumulator.update(sample)
+
+        logger.info(
+            "Оценено изображений %d, из кеша %d, не прочитано %d",
+            accumulator.images,
+            accumulator.cached,
+            skipped,
+        )
+
+        return accumulator
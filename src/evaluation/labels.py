@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+
+def load_polygons(label_path: str | Path) -> list[tuple[int, np.ndarray]]:
+    """Читает полигоны из файла меток сегментации YOLO
+
+    Строки с нечетным числом координат или меньше чем тремя точками пропускаются.
+
+    :param str | Path label_path: Путь до файла меток
+    :return list[tuple[int, np.ndarray]]: Класс и нормированные координаты точек (N, 2)
+    """
+    polygons = []
+
+    with open(label_path, encoding="utf-8") as f:
+        for line in f:
+            values = line.split()
+            if len(values) < 7 or len(values) % 2 == 0:
+                continue
+
+            coords = np.asarray(values[1:], dtype=np.float32).reshape(-1, 2)
+            polygons.append((int(values[0]), coords))
+
+    return polygons
+
+
+def rasterize_polygons(polygons: list[tuple[int, np.ndarray]], shape: tuple[int, int]) -> np.ndarray:
+    """Строит маску классов по полигонам
+
+    :param list[tuple[int, np.ndarray]] polygons: Класс и нормированные координаты точек
+    :param tuple[int, int] shape: Размер маски (H, W)
+    :return np.ndarray: Маска (H, W), где 0 — фон, i + 1 — класс i, как в масках сегментаторов
+    """
+    h, w = shape
+    mask = np.zeros((h, w), dtype=np.uint8)
+
+    for cls, coords in polygons:
+        points = np.round(coords * (w, h)).astype(np.int32)
+        cv2.fillPoly(mask, [points], cls + 1)
+
+    return mask
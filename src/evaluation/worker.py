@@ -0,0 +1,110 @@
+import os
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.config import SegmenterConfig
+from src.utils.metrics import boundary_fscore
+from src.dataset_tools.hash_index import file_digest
+
+from .cache import PredictionCache
+from .labels import load_polygons, rasterize_polygons
+from .accumulator import ImageMetrics
+
+# Состояние текущего процесса пула: модель создается только при первом промахе кеша
+_config: SegmenterConfig | None = None
+_cache: PredictionCache | None = None
+_segmenter = None
+_boundary_tolerance = 0.0075
+
+
+def init_worker(
+    config: SegmenterConfig,
+    cache: PredictionCache | None,
+    boundary_tolerance: float = 0.0075,
+    threads: int = 1,
+) -> None:
+    """Готовит процесс пула к оценке
+
+    Число потоков библиотек ограничивается до загрузки модели, чтобы процессы
+    не конкурировали за ядра.
+
+    :param SegmenterConfig config: Параметры сегментации
+    :param PredictionCache | None cache: Кеш предсказаний; None — без кеша
+    :param float boundary_tolerance: Допуск F-меры границ относительно диагонали кадра
+    :param int threads: Количество потоков вычислительных библиотек на процесс
+    """
+    global _config, _cache, _boundary_tolerance
+
+    for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    cv2.setNumThreads(threads)
+
+    _config, _cache, _boundary_tolerance = config, cache, boundary_tolerance
+
+
+def evaluate_pair(pair: tuple[Path, Path]) -> ImageMetrics | None:
+    """Сегментирует изображение или берет маску из кеша и сравнивает ее с разметкой
+
+    :param tuple[Path, Path] pair: Пути изображения и файла меток
+    :raises RuntimeError: Если процесс не инициализирован
+    :return ImageMetrics | None: Метрики изображения или None, если изображение не прочитано
+    """
+    if _config is None:
+        raise RuntimeError("Процесс не инициализирован: init_worker не был вызван")
+
+    image_path, label_path = pair
+    image_hash = file_digest(image_path) if _cache is not None else None
+
+    pred = _cache.get(image_hash) if _cache is not None else None
+    cached = pred is not None
+
+    if cached:
+        # Маска сохранена в размере декодированного изображения с учетом ориентации EXIF,
+        # поэтому размер разметки берется из нее, а изображение не декодируется
+        shape = pred.shape[:2]
+    else:
+        image = cv2.imread(str(image_path), cv2.IMREAD_COLOR)
+        if image is None:
+            return None
+
+        shape = image.shape[:2]
+        pred = _get_segmenter().segment(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+
+        if _cache is not None:
+            _cache.put(image_hash, pred)
+
+    target = rasterize_polygons(load_polygons(label_path), shape)
+
+    pred_fg, target_fg = pred != 0, target != 0
+    intersection = int(np.count_nonzero(pred_fg & target_fg))
+    union = int(np.count_nonzero(pred_fg | target_fg))
+
+    k = int(max(pred.max(), target.max())) + 1
+    confusion = np.bincount(target.ravel().astype(np.intp) * k + pred.ravel(), minlength=k * k).reshape(k, k)
+
+    return ImageMetrics(
+        image=str(image_path),
+        cached=cached,
+        intersection=intersection,
+        union=union,
+        iou=intersection / union if union else 1.0,
+        boundary_f=boundary_fscore(pred, target, _boundary_tolerance),
+        confusion=confusion,
+    )
+
+
+def _get_segmenter():
+    global _segmenter
+
+    if _segmenter is None:
+        from src.modules.segmentation import Segmenter
+
+        _segmenter = Segmenter(**_config.asdict())
+
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(int(os.environ.get("OMP_NUM_THREADS", 1)))
+
+    return _segmenter
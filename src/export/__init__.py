@@ -0,0 +1,15 @@
+from .report import VariantReport, format_report, evaluate_variants
+from .exporter import PRECISIONS, variant_name, export_variants
+from .quantize import sample_images, quantize_static_int8, quantize_dynamic_int8
+
+__all__ = [
+    'export_variants',
+    'variant_name',
+    'PRECISIONS',
+    'quantize_dynamic_int8',
+    'quantize_static_int8',
+    'sample_images',
+    'evaluate_variants',
+    'format_report',
+    'VariantReport',
+]
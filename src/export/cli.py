@@ -0,0 +1,79 @@
+import json
+import logging
+import argparse
+from pathlib import Path
+from dataclasses import asdict
+
+from src.config.path import SEGMENTATION_YOLO_PATH, SEGMENTATION_VARIANTS_PATH
+from src.utils.frames import synthetic_frames
+
+from .report import format_report, evaluate_variants
+from .exporter import PRECISIONS, export_variants
+from .quantize import load_rgb, sample_images
+
+# Имя файла отчета в директории вариантов
+REPORT_NAME = "report.json"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Экспорт модели сегментации в ONNX и квантование в INT8")
+
+    parser.add_argument('--weights', type=str, default=str(SEGMENTATION_YOLO_PATH), help='Путь до .pt весов или ONNX-модели')
+    parser.add_argument('--data', type=str, default=None, help='Директория датасета YOLO для калибровки и оценки')
+    parser.add_argument('--precisions', type=str, nargs='+', default=None, choices=PRECISIONS, help='Точности вариантов; по умолчанию все, без --data — кроме int8-static')
+    parser.add_argument('--imgsz', type=int, default=640, help='Размер входа модели')
+    parser.add_argument('--calibration', type=int, default=200, help='Количество калибровочных изображений')
+    parser.add_argument('--calibration_method', type=str, default='minmax', choices=['minmax', 'entropy', 'percentile'], help='Метод калибровки')
+    parser.add_argument('--frames', type=int, default=50, help='Количество кадров для оценки; не пересекаются с калибровочными')
+    parser.add_argument('--threads', type=int, default=None, help='Количество потоков onnxruntime при оценке')
+    parser.add_argument('--output', type=str, default=str(SEGMENTATION_VARIANTS_PATH), help='Директория вариантов')
+    parser.add_argument('--seed', type=int, default=0, help='Зерно выбора изображений')
+
+    args = parser.parse_args()
+
+    # Статическому квантованию нужны калибровочные изображения датасета
+    if args.precisions is None:
+        args.precisions = [p for p in PRECISIONS if args.data or p != 'int8-static']
+    elif 'int8-static' in args.precisions and not args.data:
+        parser.error("для int8-static нужен --data с калибровочными изображениями")
+
+    return args
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    calibration, evaluation = None, None
+    if args.data:
+        calibration = sample_images(args.data, args.calibration, args.seed)
+        evaluation = sample_images(args.data, args.frames, args.seed + 1, exclude=set(calibration))
+
+    variants = export_variants(
+        args.weights,
+        args.precisions,
+        calibration=calibration,
+        imgsz=args.imgsz,
+        calibration_method=args.calibration_method,
+        output_dir=args.output,
+    )
+
+    # Без датасета скорость и расхождение масок оцениваются на синтетических кадрах
+    frames = list(load_rgb(evaluation)) if evaluation else synthetic_frames(args.frames, (1280, 720))
+
+    extra = {}
+    if args.weights.endswith('.pt'):
+        # Исходные веса через ultralytics: показывают выигрыш относительно текущего YOLOSegmenter
+        from src.modules.segmentation.segmenters.yolo import YOLOSegmenter
+
+        extra[Path(args.weights).name] = (YOLOSegmenter(args.weights), Path(args.weights))
+
+    reports = evaluate_variants(variants, frames, args.output, args.threads, extra)
+
+    with open(Path(args.output) / REPORT_NAME, "w", encoding="utf-8") as f:
+        json.dump([asdict(report) for report in reports], f, ensure_ascii=False, indent=2)
+
+    print(format_report(reports))
+    print(f"Варианты выбираются через SegmenterConfig(variant=...): {', '.join(v.name for v in variants)}")
+    if Path(args.output).resolve() != SEGMENTATION_VARIANTS_PATH.resolve():
+        print(f"Директория вариантов задается через SegmenterConfig(variants_dir={str(args.output)!r})")
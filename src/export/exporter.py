@@ -0,0 +1,91 @@
+import os
+import shutil
+import logging
+from typing import Literal
+from pathlib import Path
+
+from src.config.path import SEGMENTATION_VARIANTS_PATH
+from src.modules.segmentation.segmenters.variants import ModelVariant, register_variant
+from src.modules.segmentation.segmenters.yolo_onnx import export_onnx
+
+from .quantize import quantize_static_int8, quantize_dynamic_int8
+
+logger = logging.getLogger(__name__)
+
+Precision = Literal["fp32", "int8-dynamic", "int8-static"]
+
+PRECISIONS: tuple[Precision, ...] = ("fp32", "int8-dynamic", "int8-static")
+
+
+def variant_name(weights_path: str | Path, precision: Precision) -> str:
+    """Составляет название варианта из имени весов и точности
+
+    :param str | Path weights_path: Путь до исходных весов
+    :param str precision: Точность варианта
+    :return str: Название варианта, например yolo11n-seg-int8-static
+    """
+    return f"{Path(weights_path).stem}-{precision}"
+
+
+def export_variants(
+    weights_path: str | Path,
+    precisions: list[Precision],
+    calibration: list[Path] | None = None,
+    imgsz: int = 640,
+    calibration_method: str = "minmax",
+    output_dir: str | Path = SEGMENTATION_VARIANTS_PATH,
+) -> list[ModelVariant]:
+    """Экспортирует веса в ONNX, квантует их и регистрирует варианты в манифесте
+
+    Квантование выполняется из варианта fp32, поэтому он экспортируется всегда.
+
+    :param str | Path weights_path: Путь до .pt весов ultralytics или ONNX-модели
+    :param list[str] precisions: Точности вариантов
+    :param list[Path] | None calibration: Калибровочные изображения; нужны для int8-static
+    :param int imgsz: Размер входа модели
+    :param str calibration_method: Метод калибровки int8-static: minmax, entropy или percentile
+    :param str | Path output_dir: Директория вариантов
+    :raises ValueError: Если для int8-static не заданы калибровочные изображения
+    :return list[ModelVariant]: Зарегистрированные варианты, начиная с fp32
+    """
+    if "int8-static" in precisions and not calibration:
+        raise ValueError("Для статического квантования нужны калибровочные изображения")
+
+    weights_path = Path(weights_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def variant(precision: Precision) -> ModelVariant:
+        name = variant_name(weights_path, precision)
+        return ModelVariant(name, "yolo_onnx", f"{name}.onnx", precision, weights_path.name, imgsz)
+
+    baseline = variant("fp32")
+    baseline_path = output_dir / baseline.path
+
+    if weights_path.suffix == ".onnx":
+        tmp_path = baseline_path.with_suffix(".onnx.tmp")
+        shutil.copyfile(weights_path, tmp_path)
+        os.replace(tmp_path, baseline_path)
+    else:
+        export_onnx(weights_path, baseline_path, imgsz)
+
+    exported = [baseline]
+
+    for precision in precisions:
+        if precision == "fp32":
+            continue
+
+        current = variant(precision)
+        logger.info("Квантование %s", current.name)
+
+        if precision == "int8-dynamic":
+            quantize_dynamic_int8(baseline_path, output_dir / current.path)
+        else:
+            quantize_static_int8(baseline_path, output_dir / current.path, calibration, imgsz, calibration_method)
+
+        exported.append(current)
+
+    for current in exported:
+        register_variant(current, output_dir)
+
+    return exported
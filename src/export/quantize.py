@@ -0,0 +1,138 @@
+import re
+import random
+import logging
+from pathlib import Path
+from collections.abc import Iterator
+
+import cv2
+import onnx
+import numpy as np
+from onnxruntime.quantization import QuantType, QuantFormat, CalibrationMethod
+from onnxruntime.quantization import CalibrationDataReader, quantize_static
+from onnxruntime.quantization import quantize_dynamic
+
+from src.dataset_tools.extensions import ImageExtensions
+from src.modules.segmentation.segmenters.yolo_onnx import YOLOOnnxSegmenter
+
+logger = logging.getLogger(__name__)
+
+
+def sample_images(dataset_dir: str | Path, count: int, seed: int = 0, exclude: set[Path] | None = None) -> list[Path]:
+    """Выбирает случайные изображения датасета
+
+    :param str | Path dataset_dir: Директория датасета; изображения ищутся рекурсивно
+    :param int count: Количество изображений
+    :param int seed: Зерно выбора
+    :param set[Path] | None exclude: Изображения, которые не должны попасть в выборку
+    :raises FileNotFoundError: Если в директории нет изображений
+    :return list[Path]: Пути изображений
+    """
+    extensions = ImageExtensions.get_extensions()
+    exclude = exclude or set()
+
+    paths = sorted(
+        path for path in Path(dataset_dir).rglob("*")
+        if path.suffix.lower() in extensions and path not in exclude
+    )
+
+    if not paths:
+        raise FileNotFoundError(f"Изображения не найдены: {dataset_dir}")
+
+    return random.Random(seed).sample(paths, min(count, len(paths)))
+
+
+def load_rgb(paths: list[Path]) -> Iterator[np.ndarray]:
+    """Читает изображения в формате RGB, в котором кадры поступают в сегментатор
+
+    :param list[Path] paths: Пути изображений
+    :return Iterator[np.ndarray]: Кадры (H, W, 3); нечитаемые файлы пропускаются
+    """
+    for path in paths:
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is None:
+            logger.warning("Не удалось прочитать изображение: %s", path)
+            continue
+
+        yield cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+class LetterboxCalibrationReader(CalibrationDataReader):
+
+    # Калибровочные кадры подготавливаются тем же letterbox, что и при инференсе
+    def __init__(self, segmenter: YOLOOnnxSegmenter, paths: list[Path]):
+        self._input_name = segmenter.session.get_inputs()[0].name
+        self._blobs = (segmenter._letterbox(frame)[0] for frame in load_rgb(paths))
+
+    def get_next(self) -> dict[str, np.ndarray] | None:
+        blob = next(self._blobs, None)
+        return None if blob is None else {self._input_name: blob}
+
+
+def quantize_dynamic_int8(onnx_path: str | Path, output_path: str | Path) -> Path:
+    """Квантует веса модели в INT8; активации квантуются во время инференса
+
+    :param str | Path onnx_path: Путь до ONNX-модели fp32
+    :param str | Path output_path: Путь для квантованной модели
+    :return Path: Путь до квантованной модели
+    """
+    # ConvInteger в onnxruntime для CPU поддерживает только беззнаковые веса
+    quantize_dynamic(str(onnx_path), str(output_path), weight_type=QuantType.QUInt8)
+    return Path(output_path)
+
+
+def quantize_static_int8(
+    onnx_path: str | Path,
+    output_path: str | Path,
+    calibration: list[Path],
+    imgsz: int = 640,
+    method: str = "minmax",
+) -> Path:
+    """Квантует веса и активации модели в INT8 по диапазонам, собранным на калибровочных кадрах
+
+    Свертки головы сегментации квантуются, а декодирование рамок, DFL и сборка выхода
+    остаются в fp32: координаты и оценки в одном тензоре не переносят общего масштаба INT8.
+
+    :param str | Path onnx_path: Путь до ONNX-модели fp32
+    :param str | Path output_path: Путь для квантованной модели
+    :param list[Path] calibration: Калибровочные изображения
+    :param int imgsz: Размер входа модели
+    :param str method: Метод калибровки: minmax, entropy или percentile
+    :return Path: Путь до квантованной модели
+    """
+    methods = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile,
+    }
+
+    segmenter = YOLOOnnxSegmenter(str(onnx_path), imgsz=imgsz)
+
+    quantize_static(
+        str(onnx_path),
+        str(output_path),
+        LetterboxCalibrationReader(segmenter, calibration),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=methods[method],
+        nodes_to_exclude=head_postprocess_nodes(onnx_path),
+    )
+
+    return Path(output_path)
+
+
+def head_postprocess_nodes(onnx_path: str | Path) -> list[str]:
+    """Находит узлы головы модели ultralytics, кроме сверток
+
+    :param str | Path onnx_path: Путь до ONNX-модели
+    :return list[str]: Названия узлов; пустой список, если названия узлов не из ultralytics
+    """
+    nodes = onnx.load(str(onnx_path), load_external_data=False).graph.node
+    blocks = [int(match.group(1)) for node in nodes if (match := re.match(r"/model\.(\d+)/", node.name))]
+
+    if not blocks:
+        return []
+
+    prefix = f"/model.{max(blocks)}/"
+    return [node.name for node in nodes if node.name.startswith(prefix) and node.op_type != "Conv"]
@@ -0,0 +1,118 @@
+import time
+from pathlib import Path
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.utils.metrics import mask_iou
+from src.modules.segmentation.segmenters import Segmentor
+from src.modules.segmentation.segmenters.variants import ModelVariant
+from src.modules.segmentation.segmenters.yolo_onnx import YOLOOnnxSegmenter
+
+
+@dataclass
+class VariantReport:
+    """Скорость и точность варианта модели.
+
+    :param str name: Название варианта
+    :param str precision: Точность варианта
+    :param float size_mb: Размер файла модели, МБ
+    :param float p50_ms: Медиана времени сегментации кадра, мс
+    :param float p95_ms: 95-й перцентиль времени сегментации кадра, мс
+    :param float mean_iou: Средний IoU масок с вариантом fp32
+    :param float min_iou: Минимальный IoU масок с вариантом fp32
+    """
+    name: str
+    precision: str
+    size_mb: float
+    p50_ms: float
+    p95_ms: float
+    mean_iou: float
+    min_iou: float
+
+
+def measure(segmenter: Segmentor, frames: list[np.ndarray]) -> tuple[list[np.ndarray], list[float]]:
+    """Сегментирует кадры и замеряет время каждого кадра
+
+    :param Segmentor segmenter: Сегментатор
+    :param list[np.ndarray] frames: Кадры (H, W, 3) в формате RGB
+    :return tuple[list[np.ndarray], list[float]]: Маски и время сегментации кадров, мс
+    """
+    segmenter.segment(frames[0])
+
+    masks, latencies = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        masks.append(segmenter.segment(frame))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return masks, latencies
+
+
+def evaluate_variants(
+    variants: list[ModelVariant],
+    frames: list[np.ndarray],
+    directory: str | Path,
+    threads: int | None = None,
+    extra: dict[str, tuple[Segmentor, Path]] | None = None,
+) -> list[VariantReport]:
+    """Сравнивает варианты модели с вариантом fp32 на одних и тех же кадрах
+
+    :param list[ModelVariant] variants: Варианты; первым должен быть вариант fp32
+    :param list[np.ndarray] frames: Кадры (H, W, 3) в формате RGB
+    :param str | Path directory: Директория вариантов
+    :param int | None threads: Количество потоков onnxruntime; None — по умолчанию
+    :param dict | None extra: Дополнительные сегментаторы для сравнения, например исходные .pt веса,
+        с файлом модели для оценки размера
+    :return list[VariantReport]: Отчеты в порядке вариантов, затем дополнительные сегментаторы
+    """
+    directory = Path(directory)
+    candidates = []
+    for variant in variants:
+        path = directory / variant.path
+        segmenter = YOLOOnnxSegmenter(str(path), imgsz=variant.imgsz, threads=threads)
+        candidates.append((variant.name, variant.precision, segmenter, path))
+
+    candidates += [(name, "fp32", segmenter, path) for name, (segmenter, path) in (extra or {}).items()]
+
+    reference = None
+    reports = []
+
+    for name, precision, segmenter, path in candidates:
+        masks, latencies = measure(segmenter, frames)
+        if reference is None:
+            reference = masks
+
+        ious = [mask_iou(mask, expected) for mask, expected in zip(masks, reference)]
+
+        reports.append(VariantReport(
+            name=name,
+            precision=precision,
+            size_mb=path.stat().st_size / 2**20,
+            p50_ms=float(np.percentile(latencies, 50)),
+            p95_ms=float(np.percentile(latencies, 95)),
+            mean_iou=float(np.mean(ious)),
+            min_iou=float(np.min(ious)),
+        ))
+
+    return reports
+
+
+def format_report(reports: list[VariantReport]) -> str:
+    """Форматирует отчеты в таблицу Markdown
+
+    :param list[VariantReport] reports: Отчеты вариантов
+    :return str: Таблица
+    """
+    lines = [
+        "| Вариант | Точность | Размер, МБ | p50, мс | p95, мс | IoU средний | IoU минимальный |",
+        "|---|---|---|---|---|---|---|",
+    ]
+
+    for report in reports:
+        lines.append(
+            f"| {report.name} | {report.precision} | {report.size_mb:.1f} | {report.p50_ms:.1f} | "
+            f"{report.p95_ms:.1f} | {report.mean_iou:.4f} | {report.min_iou:.4f} |"
+        )
+
+    return "\n".join(lines)
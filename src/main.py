@@ -1,8 +1,10 @@
 import cv2
 
-from src.config import PipelineConfig, SegmenterConfig, BackgroundConfig
+from src.config import CameraConfig, MetricsConfig, PipelineConfig, SegmenterConfig
+from src.config import StreamingConfig, BackgroundConfig
 from src.capture import CameraFrameCapture
-from src.pipeline import FramePipeline
+from src.pipeline import FramePipeline, PipelinedRunner
+from src.streaming import StreamServer
 from src.config.path import SEGMENTATION_MP_PATH  # , SEGMENTATION_YOLO_PATH
 from src.modules.background import SolidColorBackground
 
@@ -12,21 +14,47 @@ def main():
     config = PipelineConfig(
         #segmenter=SegmenterConfig(model='yolo', model_path=SEGMENTATION_YOLO_PATH),
         segmenter=SegmenterConfig(model='mediapipe', model_path=SEGMENTATION_MP_PATH),
-        background=BackgroundConfig(SolidColorBackground())
+        background=BackgroundConfig(SolidColorBackground()),
+        pipelined=True,
+        metrics=MetricsConfig(enabled=False),
     )
-    pipeline = FramePipeline(config)
-
-    with CameraFrameCapture() as cap:
-        for frame in cap:
-            try:
-                result = pipeline.process(frame)
-                result = cv2.cvtColor(result, cv2.COLOR_RGB2BGR)
+    streaming = StreamingConfig(enabled=False)
 
-                cv2.imshow("Video stream", result)
-                cv2.waitKey(1)
-
-            except KeyboardInterrupt:
-                break
+    pipeline = FramePipeline(config)
+    metrics = pipeline.metrics
+
+    server = StreamServer(**streaming.asdict()) if streaming.enabled else None
+    if server is not None:
+        server.start()
+
+    with CameraFrameCapture(CameraConfig(threaded=True)) as cap:
+        if config.pipelined:
+            runner = PipelinedRunner(pipeline, postprocess=lambda frame: cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+            results = runner.run(cap)
+        else:
+            results = (
+                cv2.cvtColor(pipeline.process(frame), cv2.COLOR_RGB2BGR)
+                for frame in metrics.timed_iter(cap, "capture")
+            )
+
+        try:
+            for result in results:
+                try:
+                    if server is not None:
+                        server.publish(result)
+
+                    with metrics.timer("display"):
+                        cv2.imshow("Video stream", result)
+                        cv2.waitKey(1)
+
+                    metrics.set_gauge("camera_dropped_frames", cap.dropped_frames)
+
+                except KeyboardInterrupt:
+                    break
+        finally:
+            if server is not None:
+                server.stop()
+            pipeline.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,17 @@
+from .sinks import LogSink, MetricsSink, JsonFileSink, PrometheusSink, render_prometheus
+from .factory import create_sink, create_metrics
+from .registry import Metrics, NullMetrics
+from .histogram import RollingHistogram
+
+__all__ = [
+    'Metrics',
+    'NullMetrics',
+    'RollingHistogram',
+    'MetricsSink',
+    'LogSink',
+    'JsonFileSink',
+    'PrometheusSink',
+    'render_prometheus',
+    'create_sink',
+    'create_metrics',
+]
@@ -0,0 +1,37 @@
+from src.config.metrics import MetricsConfig
+
+from .sinks import LogSink, MetricsSink, JsonFileSink, PrometheusSink
+from .registry import Metrics, NullMetrics
+
+
+def create_sink(name: str, config: MetricsConfig) -> MetricsSink:
+    """Создает приемник снимков метрик по названию
+
+    :param str name: Название приемника: 'log', 'json' или 'prometheus'
+    :param MetricsConfig config: Параметры сбора метрик
+    :raises ValueError: Если приемник неизвестен
+    :return MetricsSink: Приемник снимков
+    """
+    if name == 'log':
+        return LogSink()
+    if name == 'json':
+        return JsonFileSink(config.json_path)
+    if name == 'prometheus':
+        return PrometheusSink(config.prometheus_host, config.prometheus_port)
+
+    raise ValueError(f"Неизвестный приемник метрик: {name}")
+
+
+def create_metrics(config: MetricsConfig | None) -> Metrics:
+    """Создает реестр метрик и запускает выгрузку в приемники
+
+    :param MetricsConfig | None config: Параметры сбора метрик
+    :return Metrics: Реестр метрик или NullMetrics, если сбор выключен
+    """
+    if config is None or not config.enabled:
+        return NullMetrics()
+
+    metrics = Metrics(window=config.window)
+    metrics.start_reporting([create_sink(name, config) for name in config.sinks], config.interval)
+
+    return metrics
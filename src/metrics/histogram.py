@@ -0,0 +1,67 @@
+import bisect
+import threading
+
+import numpy as np
+
+# Границы корзин гистограммы в миллисекундах
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 15, 20, 30, 50, 75, 100, 150, 250, 500, 1000)
+
+
+class RollingHistogram:
+
+    # unit — суффикс названий сумм и перцентилей в снимке; пустой для безразмерных величин
+    def __init__(self, window: int = 1000, buckets_ms: tuple[float, ...] = DEFAULT_BUCKETS_MS, unit: str = "ms"):
+        self.buckets_ms = tuple(buckets_ms)
+        self.unit = unit
+
+        self._samples = np.zeros(max(1, window), dtype=np.float64)
+        self._written: int = 0
+
+        self._bucket_counts = [0] * (len(self.buckets_ms) + 1)
+        self._count: int = 0
+        self._sum_ms: float = 0.0
+
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        """Добавляет замер в скользящее окно и накопительную гистограмму
+
+        :param float value_ms: Длительность в миллисекундах
+        """
+        bucket = bisect.bisect_left(self.buckets_ms, value_ms)
+
+        with self._lock:
+            self._samples[self._written % len(self._samples)] = value_ms
+            self._written += 1
+
+            self._bucket_counts[bucket] += 1
+            self._count += 1
+            self._sum_ms += value_ms
+
+    def snapshot(self) -> dict:
+        """Возвращает перцентили скользящего окна и накопительную гистограмму
+
+        :return dict: Количество и сумма замеров, перцентили окна и корзины вида (граница, накопленное количество)
+        """
+        with self._lock:
+            window = self._samples[:min(self._written, len(self._samples))].copy()
+            bucket_counts = list(self._bucket_counts)
+            count, sum_ms = self._count, self._sum_ms
+
+        cumulative = np.cumsum(bucket_counts).tolist()
+        buckets = list(zip(self.buckets_ms, cumulative[:-1])) + [(float("inf"), cumulative[-1])]
+
+        suffix = f"_{self.unit}" if self.unit else ""
+        snapshot = {"count": count, f"sum{suffix}": sum_ms, "buckets": buckets}
+
+        if window.size:
+            p50, p95, p99 = np.percentile(window, [50, 95, 99])
+            snapshot.update({
+                f"mean{suffix}": float(window.mean()),
+                f"p50{suffix}": float(p50),
+                f"p95{suffix}": float(p95),
+                f"p99{suffix}": float(p99),
+                f"max{suffix}": float(window.max()),
+            })
+
+        return snapshot
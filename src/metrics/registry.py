@@ -0,0 +1,224 @@
+import time
+import threading
+from collections.abc import Iterable, Iterator
+
+from .sinks import MetricsSink
+from .histogram import RollingHistogram
+
+
+class _Timer:
+
+    __slots__ = ("_metrics", "_stage", "_start")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._metrics.observe(self._stage, (time.perf_counter_ns() - self._start) / 1e6)
+
+
+class _NullTimer:
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+
+    enabled = True
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+
+        self._stages: dict[str, RollingHistogram] = {}
+        self._histograms: dict[str, RollingHistogram] = {}
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+        self._sinks: list[MetricsSink] = []
+        self._reporter: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    def timer(self, stage: str) -> _Timer:
+        """Возвращает контекстный менеджер, замеряющий длительность этапа по монотонным часам
+
+        :param str stage: Название этапа
+        :return _Timer: Контекстный менеджер замера
+        """
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, value_ms: float) -> None:
+        """Добавляет замер длительности этапа
+
+        :param str stage: Название этапа
+        :param float value_ms: Длительность в миллисекундах
+        """
+        histogram = self._stages.get(stage)
+
+        if histogram is None:
+            with self._lock:
+                histogram = self._stages.setdefault(stage, RollingHistogram(self.window))
+
+        histogram.observe(value_ms)
+
+    def register_histogram(self, name: str, buckets: tuple[float, ...]) -> None:
+        """Создает гистограмму безразмерной величины, например размера батча
+
+        Такие гистограммы хранятся отдельно от длительностей этапов и не попадают в метрики латентности.
+
+        :param str name: Название величины
+        :param tuple[float, ...] buckets: Верхние границы корзин
+        """
+        with self._lock:
+            self._histograms.setdefault(name, RollingHistogram(self.window, buckets, unit=""))
+
+    def record(self, name: str, value: float) -> None:
+        """Добавляет значение в гистограмму безразмерной величины
+
+        :param str name: Название величины; гистограмма должна быть создана register_histogram
+        :param float value: Значение
+        """
+        self._histograms[name].observe(value)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        """Увеличивает счетчик
+
+        :param str name: Название счетчика
+        :param int value: Приращение
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Устанавливает текущее значение показателя
+
+        :param str name: Название показателя
+        :param float value: Значение
+        """
+        self._gauges[name] = value
+
+    def timed_iter(self, iterable: Iterable, stage: str) -> Iterator:
+        """Оборачивает итератор, замеряя время получения каждого элемента
+
+        :param Iterable iterable: Исходный итератор, например источник кадров
+        :param str stage: Название этапа
+        :return Iterator: Элементы исходного итератора
+        """
+        iterator = iter(iterable)
+
+        while True:
+            start = time.perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(stage, (time.perf_counter_ns() - start) / 1e6)
+
+            yield item
+
+    def snapshot(self) -> dict:
+        """Возвращает текущие значения всех метрик
+
+        :return dict: Время снимка, счетчики, показатели, статистика этапов и гистограммы величин
+        """
+        with self._lock:
+            stages = dict(self._stages)
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+
+        return {
+            "timestamp": time.time(),
+            "uptime_s": time.monotonic() - self._started,
+            "counters": counters,
+            "gauges": dict(self._gauges),
+            "stages": {name: histogram.snapshot() for name, histogram in stages.items()},
+            "histograms": {name: histogram.snapshot() for name, histogram in histograms.items()},
+        }
+
+    def start_reporting(self, sinks: Iterable[MetricsSink], interval: float = 5.0) -> None:
+        """Запускает фоновую периодическую выгрузку снимков метрик
+
+        :param Iterable[MetricsSink] sinks: Приемники снимков
+        :param float interval: Период выгрузки, с
+        """
+        self._sinks = list(sinks)
+
+        for sink in self._sinks:
+            sink.start()
+
+        self._stop_event.clear()
+        self._reporter = threading.Thread(target=self._report, args=(interval,), name="metrics-reporter", daemon=True)
+        self._reporter.start()
+
+    def stop_reporting(self) -> None:
+        """Останавливает выгрузку, отправляя приемникам последний снимок"""
+        self._stop_event.set()
+
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+
+        for sink in self._sinks:
+            sink.close()
+
+    def _report(self, interval: float) -> None:
+        while not self._stop_event.wait(interval):
+            self._emit()
+
+        self._emit()
+
+    def _emit(self) -> None:
+        snapshot = self.snapshot()
+
+        for sink in self._sinks:
+            sink.emit(snapshot)
+
+
+class NullMetrics(Metrics):
+
+    enabled = False
+
+    def __init__(self, window: int = 0):
+        super().__init__(window=1)
+
+    def timer(self, stage: str) -> _NullTimer:
+        return _NULL_TIMER
+
+    def observe(self, stage: str, value_ms: float) -> None:
+        pass
+
+    def register_histogram(self, name: str, buckets: tuple[float, ...]) -> None:
+        pass
+
+    def record(self, name: str, value: float) -> None:
+        pass
+
+    def increment(self, name: str, value: int = 1) -> None:
+        pass
+
+    def set_gauge(self, name: str, value: float) -> None:
+        pass
+
+    def timed_iter(self, iterable: Iterable, stage: str) -> Iterator:
+        return iter(iterable)
+
+    def start_reporting(self, sinks: Iterable[MetricsSink], interval: float = 5.0) -> None:
+        pass
+
+    def stop_reporting(self) -> None:
+        pass
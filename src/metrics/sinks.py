@@ -0,0 +1,159 @@
+import os
+import json
+import math
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class MetricsSink(ABC):
+
+    def start(self) -> None:
+        """Подготавливает приемник к работе перед первой выгрузкой"""
+
+    @abstractmethod
+    def emit(self, snapshot: dict) -> None:
+        """Выгружает снимок метрик
+
+        :param dict snapshot: Снимок, возвращаемый Metrics.snapshot()
+        """
+
+    def close(self) -> None:
+        """Освобождает ресурсы приемника"""
+
+
+class LogSink(MetricsSink):
+
+    def __init__(self, logger: logging.Logger | str = "src.metrics", level: int = logging.INFO):
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.level = level
+
+    def emit(self, snapshot: dict) -> None:
+        stages = " ".join(
+            f"{name}={stats['p50_ms']:.1f}/{stats['p95_ms']:.1f}ms"
+            for name, stats in snapshot["stages"].items()
+            if "p50_ms" in stats
+        )
+        counters = " ".join(f"{name}={value}" for name, value in snapshot["counters"].items())
+
+        self.logger.log(self.level, "stages(p50/p95): %s | %s", stages or "-", counters or "-")
+
+
+class JsonFileSink(MetricsSink):
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def emit(self, snapshot: dict) -> None:
+        # Запись через временный файл, чтобы читатели никогда не видели частично записанный снимок
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(_jsonable(snapshot), f, ensure_ascii=False, indent=2)
+
+        os.replace(tmp_path, self.path)
+
+
+class PrometheusSink(MetricsSink):
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100, prefix: str = "pipeline"):
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+
+        self._body: bytes = b""
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = sink._body
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-prometheus", daemon=True)
+        self._thread.start()
+
+    def emit(self, snapshot: dict) -> None:
+        self._body = render_prometheus(snapshot, self.prefix).encode("utf-8")
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def render_prometheus(snapshot: dict, prefix: str = "pipeline") -> str:
+    """Форматирует снимок метрик в текстовый формат Prometheus
+
+    :param dict snapshot: Снимок, возвращаемый Metrics.snapshot()
+    :param str prefix: Префикс названий метрик
+    :return str: Текст для эндпоинта /metrics
+    """
+    lines = []
+
+    for name, value in snapshot["counters"].items():
+        metric = f"{prefix}_{name}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+    for name, value in snapshot["gauges"].items():
+        metric = f"{prefix}_{name}"
+        lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+
+    if snapshot["stages"]:
+        metric = f"{prefix}_stage_latency_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+
+        for stage, stats in snapshot["stages"].items():
+            for bound, count in stats["buckets"]:
+                le = "+Inf" if math.isinf(bound) else f"{bound / 1000:g}"
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {count}')
+
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {stats["sum_ms"] / 1000:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {stats["count"]}')
+
+    for name, stats in snapshot.get("histograms", {}).items():
+        metric = f"{prefix}_{name}"
+        lines.append(f"# TYPE {metric} histogram")
+
+        for bound, count in stats["buckets"]:
+            le = "+Inf" if math.isinf(bound) else f"{bound:g}"
+            lines.append(f'{metric}_bucket{{le="{le}"}} {count}')
+
+        lines.append(f"{metric}_sum {stats['sum']:g}")
+        lines.append(f"{metric}_count {stats['count']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def _jsonable(value):
+    # Верхняя граница последней корзины бесконечна, а в JSON бесконечности нет
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    return value
@@ -1,9 +1,12 @@
-from .effects import ImageBackground, BackgroundEffect, SolidColorBackground
+from .effects import BlurBackground, ImageBackground, VideoBackground, BackgroundEffect
+from .effects import SolidColorBackground
 from .processor import BackgroundProcessor
 
 __all__ = [
     'BackgroundProcessor',
     'BackgroundEffect',
     'SolidColorBackground',
-    'ImageBackground'
+    'ImageBackground',
+    'BlurBackground',
+    'VideoBackground',
 ]
@@ -1,9 +1,13 @@
 from .base import BackgroundEffect
+from .blur import BlurBackground
 from .image import ImageBackground
+from .video import VideoBackground
 from .solid_color import SolidColorBackground
 
 __all__ = [
     'BackgroundEffect',
     'ImageBackground',
-    'SolidColorBackground'
+    'SolidColorBackground',
+    'BlurBackground',
+    'VideoBackground',
 ]
@@ -1,15 +1,64 @@
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Hashable
 
 import numpy as np
 
 
 class BackgroundEffect(ABC):
 
+    #: Фон не зависит от содержимого кадра и может быть отрисован один раз для каждого размера
+    is_static: bool = False
+    cache_size: int = 4
+
+    def __init__(self) -> None:
+        self._cache: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+
     @abstractmethod
-    def make_background(self, frame: np.ndarray) -> np.ndarray:
+    def make_background(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
         """Создает фон с выбранным эффектом под размер входного кадра
 
         :param np.ndarray frame: Входной кадр
+        :param np.ndarray | None mask: Маска объектов (H, W) для эффектов, зависящих от содержимого кадра
         :return np.ndarray: Фон
         """
         pass
+
+    def cache_key(self) -> Hashable:
+        """Возвращает параметры эффекта, от которых зависит отрисованный статический фон
+
+        :return Hashable: Ключ кэша без учета размера кадра
+        """
+        return None
+
+    def render(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        """Возвращает фон для кадра, используя кэш для статических эффектов
+
+        Фон из кэша доступен только для чтения и не должен изменяться вызывающим кодом.
+
+        :param np.ndarray frame: Входной кадр
+        :param np.ndarray | None mask: Маска объектов (H, W)
+        :return np.ndarray: Фон
+        """
+        if not self.is_static:
+            return self.make_background(frame, mask)
+
+        key = (*frame.shape[:2], self.cache_key())
+
+        background = self._cache.get(key)
+        if background is not None:
+            self._cache.move_to_end(key)
+            return background
+
+        background = np.ascontiguousarray(self.make_background(frame))
+        background.setflags(write=False)
+
+        self._cache[key] = background
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return background
+
+    def clear_cache(self) -> None:
+        """Очищает кэш отрисованных фонов"""
+        self._cache.clear()
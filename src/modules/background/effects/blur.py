@@ -0,0 +1,126 @@
+import math
+import threading
+
+import cv2
+import numpy as np
+
+from .base import BackgroundEffect
+
+
+class BlurBackground(BackgroundEffect):
+
+    # strength — сигма размытия в пикселях полного разрешения; размытие выполняется
+    # на уровне пирамиды до max_level, а mask_person исключает пиксели объектов из усреднения
+    def __init__(self, strength: float = 25.0, max_level: int = 4, mask_person: bool = True):
+        super().__init__()
+        self.strength = strength
+        self.max_level = max_level
+        self.mask_person = mask_person
+
+        # Промежуточные буферы свои у каждого потока: один эффект может обслуживать несколько потоков композиции
+        self._local = threading.local()
+
+    def __getstate__(self) -> dict:
+        # Буферы потоков не передаются в процессы: их пересоздает первый кадр
+        state = self.__dict__.copy()
+        del state["_local"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def level(self) -> int:
+        """Уровень пирамиды, на котором сигма размытия остается не меньше двух пикселей"""
+        if self.strength < 4:
+            return 0
+        return min(self.max_level, int(math.log2(self.strength / 2)))
+
+    def make_background(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        h, w = frame.shape[:2]
+        scale = 2 ** self.level
+        small_size = (max(1, w // scale), max(1, h // scale))
+        sigma = self.strength / scale
+
+        buffers = self._buffers(frame, small_size)
+
+        small = buffers["small"]
+        cv2.resize(frame, small_size, dst=small, interpolation=cv2.INTER_AREA)
+
+        if self.mask_person and mask is not None:
+            self._normalized_blur(small, mask, small_size, sigma, buffers)
+        else:
+            cv2.GaussianBlur(small, (0, 0), sigma, dst=buffers["blurred"], borderType=cv2.BORDER_REFLECT)
+
+        out = buffers["out"]
+        cv2.resize(buffers["blurred"], (w, h), dst=out, interpolation=cv2.INTER_LINEAR)
+
+        return out
+
+    def _normalized_blur(
+        self,
+        small: np.ndarray,
+        mask: np.ndarray,
+        small_size: tuple[int, int],
+        sigma: float,
+        buffers: dict[str, np.ndarray],
+    ) -> None:
+        """Размывает только пиксели фона нормированной сверткой
+
+        Размытое изображение, умноженное на долю фона, делится на размытую долю фона,
+        поэтому пиксели объектов не участвуют в усреднении, а область под объектами
+        заполняется цветами окружающего фона.
+
+        :param np.ndarray small: Уменьшенный кадр (h, w, 3)
+        :param np.ndarray mask: Маска объектов полного разрешения (H, W)
+        :param tuple[int, int] small_size: Размер уменьшенного кадра (w, h)
+        :param float sigma: Сигма размытия на уменьшенном уровне
+        :param dict[str, np.ndarray] buffers: Промежуточные буферы
+        """
+        weight = buffers["weight"]
+
+        if mask.dtype == np.uint8:
+            background = cv2.compare(mask, 0, cv2.CMP_EQ)
+            cv2.resize(background, small_size, dst=buffers["weight_u8"], interpolation=cv2.INTER_AREA)
+            np.multiply(buffers["weight_u8"], 1 / 255.0, out=weight, casting="unsafe")
+        else:
+            confidence = cv2.resize(mask.astype(np.float32, copy=False), small_size, interpolation=cv2.INTER_AREA)
+            np.subtract(1.0, confidence, out=weight)
+
+        weighted = buffers["weighted"]
+        np.multiply(small, weight[..., np.newaxis], out=weighted, casting="unsafe")
+
+        cv2.GaussianBlur(weighted, (0, 0), sigma, dst=weighted, borderType=cv2.BORDER_REFLECT)
+        cv2.GaussianBlur(weight, (0, 0), sigma, dst=weight, borderType=cv2.BORDER_REFLECT)
+
+        # Глубоко внутри крупных объектов фон не попадает в окно размытия; там остается черный цвет под объектом
+        np.maximum(weight, 1e-3, out=weight)
+        np.divide(weighted, weight[..., np.newaxis], out=weighted)
+
+        np.copyto(buffers["blurred"], weighted, casting="unsafe")
+
+    def _buffers(self, frame: np.ndarray, small_size: tuple[int, int]) -> dict[str, np.ndarray]:
+        """Возвращает промежуточные буферы текущего потока, пересоздавая их при смене размера
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :param tuple[int, int] small_size: Размер уменьшенного кадра (w, h)
+        :return dict[str, np.ndarray]: Буферы по названию
+        """
+        key = (frame.shape, small_size)
+        buffers = getattr(self._local, "buffers", None)
+
+        if buffers is None or self._local.key != key:
+            sw, sh = small_size
+            buffers = {
+                "small": np.empty((sh, sw, 3), dtype=np.uint8),
+                "blurred": np.empty((sh, sw, 3), dtype=np.uint8),
+                "weight_u8": np.empty((sh, sw), dtype=np.uint8),
+                "weight": np.empty((sh, sw), dtype=np.float32),
+                "weighted": np.empty((sh, sw, 3), dtype=np.float32),
+                "out": np.empty(frame.shape, dtype=np.uint8),
+            }
+            self._local.buffers = buffers
+            self._local.key = key
+
+        return buffers
@@ -1,4 +1,5 @@
 from typing import Literal
+from collections.abc import Hashable
 
 import cv2
 import numpy as np
@@ -8,26 +9,56 @@ from .base import BackgroundEffect
 
 class ImageBackground(BackgroundEffect):
 
+    is_static = True
+
     def __init__(self, image: np.ndarray, mode: Literal["fill", "stretch"] = "stretch"):
+        super().__init__()
+        # Номер версии изображения увеличивается при каждой замене, поэтому отрисованный фон
+        # нового изображения не совпадет с кэшем, даже если память старого массива переиспользована
+        self._version = 0
         self.image = image
         self.mode = mode
 
-    def make_background(self, frame: np.ndarray) -> np.ndarray:
+    @property
+    def image(self) -> np.ndarray:
+        return self._image
+
+    @image.setter
+    def image(self, image: np.ndarray) -> None:
+        self._image = image
+        self._version += 1
+
+    def cache_key(self) -> Hashable:
+        return self.mode, self._version
+
+    def make_background(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
         h, w = frame.shape[:2]
+        return fit_image(self.image, (w, h), self.mode)
+
+
+def fit_image(image: np.ndarray, size: tuple[int, int], mode: Literal["fill", "stretch"] = "stretch") -> np.ndarray:
+    """Приводит изображение к размеру кадра
+
+    :param np.ndarray image: Изображение (h, w, 3)
+    :param tuple[int, int] size: Размер кадра (W, H)
+    :param str mode: Растянуть изображение или заполнить кадр с сохранением пропорций и обрезкой краев
+    :return np.ndarray: Изображение (H, W, 3)
+    """
+    w, h = size
 
-        match self.mode:
-            case "stretch":
-                return cv2.resize(self.image, (w, h), interpolation=cv2.INTER_LINEAR)
+    match mode:
+        case "stretch":
+            return cv2.resize(image, (w, h), interpolation=cv2.INTER_LINEAR)
 
-            case "fill":
-                ih, iw = self.image.shape[:2]
+        case "fill":
+            ih, iw = image.shape[:2]
 
-                scale = max(w / iw, h / ih)
-                nw, nh = int(iw * scale), int(ih * scale)
+            scale = max(w / iw, h / ih)
+            nw, nh = int(iw * scale), int(ih * scale)
 
-                resized = cv2.resize(self.image, (nw, nh), interpolation=cv2.INTER_LINEAR)
+            resized = cv2.resize(image, (nw, nh), interpolation=cv2.INTER_LINEAR)
 
-                x0 = (nw - w) // 2
-                y0 = (nh - h) // 2
+            x0 = (nw - w) // 2
+            y0 = (nh - h) // 2
 
-                return resized[y0:y0 + h, x0:x0 + w]
+            return resized[y0:y0 + h, x0:x0 + w]
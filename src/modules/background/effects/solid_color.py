@@ -1,3 +1,5 @@
+from collections.abc import Hashable
+
 import numpy as np
 
 from .base import BackgroundEffect
@@ -5,10 +7,16 @@ from .base import BackgroundEffect
 
 class SolidColorBackground(BackgroundEffect):
 
+    is_static = True
+
     def __init__(self, color: tuple[int, int, int] = (0, 0, 0)):
+        super().__init__()
         self.color = color
 
-    def make_background(self, frame: np.ndarray) -> np.ndarray:
+    def cache_key(self) -> Hashable:
+        return tuple(self.color)
+
+    def make_background(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
         h, w = frame.shape[:2]
 
         background = np.empty((h, w, 3), dtype=np.uint8)
@@ -0,0 +1,104 @@
+import time
+import threading
+from typing import Literal
+from pathlib import Path
+
+import numpy as np
+
+from .base import BackgroundEffect
+from .video_cache import open_video_cache
+
+
+class VideoBackground(BackgroundEffect):
+
+    def __init__(
+        self,
+        source: str | Path,
+        mode: Literal["fill", "stretch"] = "stretch",
+        clock: Literal["frame", "time"] = "frame",
+        size: tuple[int, int] | None = None,
+        max_frames: int | None = None,
+        cache_dir: str | Path | None = None,
+    ):
+        super().__init__()
+        self.source = Path(source)
+        self.mode = mode
+        self.clock = clock
+        self.max_frames = max_frames
+        self.cache_dir = cache_dir
+
+        self.position: int = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Открытые кэши по размеру кадра (W, H): кадр конвейера не обращается к файловой системе
+        self._frames: dict[tuple[int, int], tuple[np.memmap, float]] = {}
+
+        # Кэш декодируется заранее, если размер выходных кадров известен, иначе — при первом кадре
+        if size is not None:
+            self.prepare(size)
+
+    def __getstate__(self) -> dict:
+        # Блокировка и отображения кэша не сериализуются; процесс, получивший эффект, открывает их заново
+        state = self.__dict__.copy()
+        del state["_lock"], state["_frames"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._frames = {}
+
+    def prepare(self, size: tuple[int, int]) -> None:
+        """Декодирует и отображает кэш кадров заданного размера до начала обработки
+
+        Без подготовки видео декодируется при первом кадре нового размера в потоке конвейера.
+
+        :param tuple[int, int] size: Размер кадра (W, H)
+        """
+        size = tuple(size)
+        if size not in self._frames:
+            self._frames[size] = open_video_cache(self.source, size, self.mode, self.max_frames, self.cache_dir)
+
+    def frames(self, size: tuple[int, int]) -> tuple[np.memmap, float]:
+        """Возвращает предварительно декодированные кадры фона заданного размера
+
+        :param tuple[int, int] size: Размер кадра (W, H)
+        :return tuple[np.memmap, float]: Кадры (N, H, W, 3) только для чтения и частота кадров видео
+        """
+        frames = self._frames.get(tuple(size))
+        if frames is None:
+            self.prepare(size)
+            frames = self._frames[tuple(size)]
+
+        return frames
+
+    def reset(self) -> None:
+        """Возвращает воспроизведение к началу видео"""
+        with self._lock:
+            self.position = 0
+            self._started = time.monotonic()
+
+    def make_background(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        """Возвращает кадр фона, соответствующий текущему кадру конвейера
+
+        В режиме 'frame' каждый вызов продвигает воспроизведение на один кадр, поэтому
+        каждому потоку нужен свой экземпляр эффекта; отображенный кэш при этом общий.
+        В режиме 'time' кадр выбирается по времени с начала воспроизведения и частоте
+        кадров видео, и один экземпляр можно использовать в нескольких потоках.
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :param np.ndarray | None mask: Не используется
+        :return np.ndarray: Срез отображенного в память кэша без копирования, доступный только для чтения
+        """
+        h, w = frame.shape[:2]
+        frames, fps = self.frames((w, h))
+
+        if self.clock == "time":
+            index = int((time.monotonic() - self._started) * fps)
+        else:
+            with self._lock:
+                index = self.position
+                self.position += 1
+
+        return frames[index % len(frames)]
@@ -0,0 +1,137 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Literal
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from .image import fit_image
+
+# Отображенные в память кэши текущего процесса: все потоки и эффекты с одним ключом используют общее отображение
+_mapped: dict[str, tuple[np.memmap, float]] = {}
+# Декодирование выполняется под блокировкой своего ключа и не задерживает эффекты с другими ключами
+_key_locks: dict[str, threading.Lock] = {}
+_mapped_lock = threading.Lock()
+
+
+def cache_key(source: str | Path, size: tuple[int, int], mode: str, max_frames: int | None) -> str:
+    """Вычисляет ключ кэша по файлу источника и параметрам декодирования
+
+    :param str | Path source: Путь до видео
+    :param tuple[int, int] size: Размер кадра (W, H)
+    :param str mode: Способ приведения кадров к размеру
+    :param int | None max_frames: Ограничение количества кадров
+    :return str: Ключ кэша
+    """
+    path = Path(source).resolve()
+    stat = path.stat()
+
+    fingerprint = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{size[0]}x{size[1]}|{mode}|{max_frames}"
+    return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:20]
+
+
+def open_video_cache(
+    source: str | Path,
+    size: tuple[int, int],
+    mode: Literal["fill", "stretch"] = "stretch",
+    max_frames: int | None = None,
+    cache_dir: str | Path | None = None,
+) -> tuple[np.memmap, float]:
+    """Возвращает кадры видео, декодированные в размер кадра и отображенные в память
+
+    При первом обращении видео декодируется один раз в файл кэша; последующие обращения,
+    в том числе из других процессов, только отображают файл в память.
+
+    :param str | Path source: Путь до видео
+    :param tuple[int, int] size: Размер кадра (W, H)
+    :param str mode: Растянуть кадры или заполнить кадр с сохранением пропорций
+    :param int | None max_frames: Максимальное количество декодируемых кадров
+    :param str | Path | None cache_dir: Директория кэша; по умолчанию VIDEO_BACKGROUND_CACHE_PATH
+    :return tuple[np.memmap, float]: Кадры (N, H, W, 3) в формате RGB только для чтения и частота кадров видео
+    """
+    key = cache_key(source, size, mode, max_frames)
+
+    mapped = _mapped.get(key)
+    if mapped is not None:
+        return mapped
+
+    with _mapped_lock:
+        lock = _key_locks.setdefault(key, threading.Lock())
+
+    with lock:
+        if key in _mapped:
+            return _mapped[key]
+
+        if cache_dir is None:
+            # Пакет src.config импортирует эффекты фона, поэтому путь по умолчанию импортируется при вызове
+            from src.config.path import VIDEO_BACKGROUND_CACHE_PATH
+            cache_dir = VIDEO_BACKGROUND_CACHE_PATH
+
+        cache_dir = Path(cache_dir)
+        data_path, header_path = cache_dir / f"{key}.u8", cache_dir / f"{key}.json"
+
+        # Заголовок записывается последним, поэтому его наличие означает полностью записанный кэш
+        if not header_path.exists():
+            _decode(source, size, mode, max_frames, data_path, header_path)
+
+        header = json.loads(header_path.read_text(encoding="utf-8"))
+        frames = np.memmap(data_path, dtype=np.uint8, mode="r", shape=tuple(header["shape"]))
+
+        _mapped[key] = frames, header["fps"]
+        return _mapped[key]
+
+
+def _decode(
+    source: str | Path,
+    size: tuple[int, int],
+    mode: str,
+    max_frames: int | None,
+    data_path: Path,
+    header_path: Path,
+) -> None:
+    """Декодирует видео в файл кэша
+
+    :param str | Path source: Путь до видео
+    :param tuple[int, int] size: Размер кадра (W, H)
+    :param str mode: Способ приведения кадров к размеру
+    :param int | None max_frames: Максимальное количество декодируемых кадров
+    :param Path data_path: Путь до файла с кадрами
+    :param Path header_path: Путь до заголовка кэша
+    :raises ValueError: Если видео не удалось открыть или в нем нет кадров
+    """
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        raise ValueError(f"Не удалось открыть видео: {source}")
+
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    suffix = f".{os.getpid()}.tmp"
+    tmp_data, tmp_header = data_path.with_suffix(data_path.suffix + suffix), header_path.with_suffix(suffix)
+
+    count = 0
+    fps = float(cap.get(cv2.CAP_PROP_FPS) or 30.0)
+
+    try:
+        with open(tmp_data, "wb") as f:
+            while max_frames is None or count < max_frames:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+
+                frame = fit_image(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), size, mode)
+                f.write(np.ascontiguousarray(frame).tobytes())
+                count += 1
+    finally:
+        cap.release()
+
+    if count == 0:
+        tmp_data.unlink(missing_ok=True)
+        raise ValueError(f"В видео нет кадров: {source}")
+
+    header = {"source": str(source), "fps": fps, "shape": [count, size[1], size[0], 3]}
+    tmp_header.write_text(json.dumps(header, ensure_ascii=False), encoding="utf-8")
+
+    os.replace(tmp_data, data_path)
+    os.replace(tmp_header, header_path)
@@ -1,3 +1,6 @@
+from typing import Literal
+
+import cv2
 import numpy as np
 
 from .effects import BackgroundEffect
@@ -5,20 +8,163 @@ from .effects import BackgroundEffect
 
 class BackgroundProcessor:
 
-    def __init__(self, effect: BackgroundEffect):
+    def __init__(
+        self,
+        effect: BackgroundEffect,
+        blending: Literal['hard', 'soft'] = 'hard',
+        feather_radius: int = 3,
+        buffers: int = 1,
+    ):
         self.effect = effect
+        self.blending = blending
+        self.feather_radius = feather_radius
+
+        self._buffers: list[np.ndarray] = [None] * max(1, buffers)
+        self._next_buffer: int = 0
+
+        self._alpha_source: np.ndarray | None = None
+        self._alpha_radius: int = -1
+        self._alpha: np.ndarray | None = None
+        self._opaque: np.ndarray | None = None
+
+        self._band_idx: np.ndarray = np.empty(0, dtype=np.intp)
+        self._band_alpha: np.ndarray = np.empty((0, 1), dtype=np.uint16)
+        self._band_inverse: np.ndarray = np.empty((0, 1), dtype=np.uint16)
+        self._band_fg: np.ndarray = np.empty((0, 3), dtype=np.uint8)
+        self._band_bg: np.ndarray = np.empty((0, 3), dtype=np.uint8)
+        self._band_acc: np.ndarray = np.empty((0, 3), dtype=np.uint16)
+        self._band_tmp: np.ndarray = np.empty((0, 3), dtype=np.uint16)
+
+    def reserve_buffers(self, count: int) -> None:
+        """Увеличивает количество переиспользуемых выходных буферов
+
+        Результат ``apply`` перезаписывается через ``count`` вызовов, поэтому при передаче
+        кадров между потоками буферов должно хватать на все кадры, находящиеся в обработке.
+
+        :param int count: Минимальное количество буферов
+        """
+        missing = count - len(self._buffers)
+        if missing > 0:
+            self._buffers.extend([None] * missing)
 
     def apply(self, frame: np.ndarray, mask: np.ndarray) -> np.ndarray:
         """Применяет эффект фона к входному кадру с учетом маски объектов
 
+        Результат записывается в переиспользуемый буфер, поэтому его нужно скопировать,
+        если он должен пережить следующие вызовы.
+
         :param np.ndarray frame: Входной кадр (H, W, 3)
-        :param np.ndarray mask: Маска объектов (H, W); 0 — фон, >0 — передний план
+        :param np.ndarray mask: Маска объектов (H, W); 0 — фон, >0 — передний план.
+            Для мягкого смешивания допускается вещественная маска уверенности в диапазоне [0, 1]
         :return np.ndarray: Кадр с примененным эффектом для фона
         """
-        background = self.effect.make_background(frame)
-        mask = mask[..., np.newaxis]
+        background = self.effect.render(frame, mask)
+        out = self._acquire_buffer(frame.shape)
+
+        if self.blending == 'soft':
+            self._blend_soft(frame, background, mask, out)
+            return out
 
-        out = np.where(mask != 0, frame, background)
-        out = out.astype(np.uint8)
+        if mask.dtype != np.uint8:
+            mask = (mask != 0).view(np.uint8)
+
+        np.copyto(out, background)
+        cv2.copyTo(frame, mask, out)
 
         return out
+
+    def _blend_soft(self, frame: np.ndarray, background: np.ndarray, mask: np.ndarray, out: np.ndarray) -> None:
+        """Смешивает кадр и фон по альфа-маске в целочисленной арифметике
+
+        Непрозрачная часть переднего плана и фон копируются напрямую, а смешивание
+        ``(frame * a + background * (255 - a)) / 255`` с точным округлением выполняется
+        в uint16 только для полупрозрачных пикселей на границе маски.
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :param np.ndarray background: Фон (H, W, 3)
+        :param np.ndarray mask: Маска объектов или уверенности (H, W)
+        :param np.ndarray out: Выходной буфер (H, W, 3)
+        """
+        self._prepare_alpha(mask)
+
+        np.copyto(out, background)
+        cv2.copyTo(frame, self._opaque, out)
+
+        n = len(self._band_idx)
+        if n == 0:
+            return
+
+        if len(self._band_acc) < n:
+            self._band_fg = np.empty((n, 3), dtype=np.uint8)
+            self._band_bg = np.empty((n, 3), dtype=np.uint8)
+            self._band_acc = np.empty((n, 3), dtype=np.uint16)
+            self._band_tmp = np.empty((n, 3), dtype=np.uint16)
+
+        fg, bg = self._band_fg[:n], self._band_bg[:n]
+        acc, tmp = self._band_acc[:n], self._band_tmp[:n]
+
+        np.take(frame.reshape(-1, 3), self._band_idx, axis=0, out=fg)
+        np.take(background.reshape(-1, 3), self._band_idx, axis=0, out=bg)
+
+        np.multiply(fg, self._band_alpha, out=acc)
+        np.multiply(bg, self._band_inverse, out=tmp)
+        np.add(acc, tmp, out=acc)
+
+        # Деление на 255 с округлением: (x + 128 + ((x + 128) >> 8)) >> 8
+        np.add(acc, 128, out=acc)
+        np.right_shift(acc, 8, out=tmp)
+        np.add(acc, tmp, out=acc)
+        np.right_shift(acc, 8, out=acc)
+
+        out.reshape(-1, 3)[self._band_idx] = acc
+
+    def _prepare_alpha(self, mask: np.ndarray) -> None:
+        """Строит альфа-маску и список полупрозрачных пикселей один раз для каждой новой маски
+
+        Размытие границы применяется только к бинарным маскам: маска уверенности уже мягкая.
+
+        :param np.ndarray mask: Маска объектов или уверенности (H, W)
+        """
+        if mask is self._alpha_source and self.feather_radius == self._alpha_radius:
+            return
+
+        h, w = mask.shape[:2]
+        if self._alpha is None or self._alpha.shape != (h, w):
+            self._alpha = np.empty((h, w), dtype=np.uint8)
+            self._opaque = np.empty((h, w), dtype=np.uint8)
+
+        if mask.dtype in (np.uint8, np.bool_):
+            cv2.compare(mask.view(np.uint8), 0, cv2.CMP_GT, dst=self._alpha)
+
+            if self.feather_radius > 0:
+                ksize = 2 * self.feather_radius + 1
+                cv2.blur(self._alpha, (ksize, ksize), dst=self._alpha)
+        else:
+            cv2.convertScaleAbs(mask, dst=self._alpha, alpha=255.0)
+
+        cv2.compare(self._alpha, 254, cv2.CMP_GT, dst=self._opaque)
+
+        alpha = self._alpha.reshape(-1)
+        band = cv2.inRange(alpha, 1, 254)
+        self._band_idx = np.flatnonzero(np.bitwise_and(band, 1, out=band).view(np.bool_))
+        self._band_alpha = alpha[self._band_idx].astype(np.uint16)[:, np.newaxis]
+        self._band_inverse = 255 - self._band_alpha
+
+        self._alpha_source = mask
+        self._alpha_radius = self.feather_radius
+
+    def _acquire_buffer(self, shape: tuple[int, ...]) -> np.ndarray:
+        """Возвращает следующий выходной буфер из кольца, пересоздавая его при смене размера
+
+        :param tuple[int, ...] shape: Размер кадра (H, W, 3)
+        :return np.ndarray: Буфер типа uint8
+        """
+        idx = self._next_buffer
+        self._next_buffer = (idx + 1) % len(self._buffers)
+
+        buffer = self._buffers[idx]
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[idx] = buffer
+
+        return buffer
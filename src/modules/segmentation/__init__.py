@@ -1,5 +1,13 @@
+from .roi import ROISegmenter
+from .scaled import ScaledSegmenter
+from .process import ProcessSegmenter
+from .temporal import TemporalSegmenter
 from .segmentation import Segmenter
 
 __all__ = [
     'Segmenter',
+    'ScaledSegmenter',
+    'TemporalSegmenter',
+    'ROISegmenter',
+    'ProcessSegmenter',
 ]
@@ -0,0 +1,424 @@
+import time
+import logging
+import weakref
+import multiprocessing
+from collections import deque
+from collections.abc import Sequence
+from multiprocessing.connection import Connection, wait
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .segmenters import Segmentor
+
+logger = logging.getLogger(__name__)
+
+# Байт на пиксель в слоте: кадр (3) и маска (1)
+_SLOT_BYTES_PER_PIXEL = 4
+
+
+class _WorkerHandle:
+
+    def __init__(self, process: multiprocessing.Process, conn: Connection):
+        self.process = process
+        self.conn = conn
+        self.ready: bool = False
+        self.started = time.monotonic()
+
+
+class ProcessSegmenter(Segmentor):
+
+    def __init__(
+        self,
+        workers: int = 1,
+        timeout: float = 1.0,
+        hang_timeout: float = 10.0,
+        start_timeout: float = 120.0,
+        max_frame_size: tuple[int, int] | None = None,
+        **segmenter_kwargs,
+    ) -> None:
+
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.hang_timeout = hang_timeout
+        self.start_timeout = start_timeout
+        self.segmenter_kwargs = {**segmenter_kwargs, "warmup": True}
+
+        self.restarts: int = 0
+        self.late: int = 0
+        self.fallbacks: int = 0
+
+        self._context = multiprocessing.get_context("spawn")
+        self._handles: list[_WorkerHandle | None] = [None] * self.workers
+        self._shm: SharedMemory | None = None
+        self._shared: list[SharedMemory | None] = [None]
+        self._capacity: int = 0
+        self._seq: int = 0
+        self._last_mask: np.ndarray | None = None
+
+        # Запрос в работе у процесса: номер запроса, время отправки и размер кадра
+        self._busy: dict[int, tuple[int, float, tuple[int, int]]] = {}
+
+        for index in range(self.workers):
+            self._start(index)
+
+        self._finalizer = weakref.finalize(self, ProcessSegmenter._shutdown, self._handles, self._shared)
+
+        # Слоты под самый большой ожидаемый кадр создаются сразу, чтобы не пересоздавать память во время работы
+        if max_frame_size is not None:
+            self._ensure_capacity(max_frame_size[0] * max_frame_size[1])
+
+        self._wait_ready(self.start_timeout)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "process_restarts": self.restarts,
+            "process_late_results": self.late,
+            "process_fallbacks": self.fallbacks,
+        }
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+        return self.segment_batch([frame])[0]
+
+    def segment_batch(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+        """Распределяет кадры по свободным процессам и собирает маски
+
+        Кадр записывается в слот общей памяти процесса, а по каналу передаются только
+        номер слота, номер запроса и размер кадра. Ожидание ограничено ``timeout`` на каждый
+        круг распределения кадров по процессам: кадр, маска для которого не готова к сроку
+        или для которого нет свободного процесса, получает последнюю полученную маску. Опоздавший процесс продолжает работу, и его
+        результат используется как резервная маска; процесс, не ответивший за ``hang_timeout``
+        или завершившийся, перезапускается. Кадр, не помещающийся в слоты, пока процессы заняты,
+        тоже получает резервную маску: память пересоздается при следующем вызове без занятых процессов.
+
+        :param Sequence[np.ndarray] frames: Входные кадры (H, W, 3)
+        :return list[np.ndarray]: Маски в порядке входных кадров
+        """
+        if not frames:
+            return []
+
+        self._poll_ready()
+        self._count_late(self._receive(timeout=0.0))
+
+        pixels = max(frame.shape[0] * frame.shape[1] for frame in frames)
+        if pixels > self._capacity and self._busy:
+            # Занятые процессы пишут маски в текущую память, поэтому она пересоздается только после
+            # их ответов; до этого кадры получают резервную маску, не задерживая вызывающий поток
+            self._restart_hung()
+            return [self._fallback(frame) for frame in frames]
+
+        self._ensure_capacity(pixels)
+
+        results: list[np.ndarray | None] = [None] * len(frames)
+        pending = deque(range(len(frames)))
+        requests: dict[int, int] = {}
+        # Кадров может быть больше, чем процессов: на каждый круг распределения отводится timeout
+        deadline = time.monotonic() + self.timeout * -(-len(frames) // self.workers)
+
+        while pending or requests:
+            for index, handle in enumerate(self._handles):
+                if not pending:
+                    break
+                if handle.ready and index not in self._busy:
+                    i = pending.popleft()
+                    requests[self._submit(index, frames[i])] = i
+
+            remaining = deadline - time.monotonic()
+            if not requests or remaining <= 0:
+                break
+
+            for seq, mask in self._receive(remaining):
+                # Запрос завершившегося процесса сразу получает резервную маску, не дожидаясь срока
+                if seq in requests:
+                    results[requests.pop(seq)] = mask
+                elif mask is not None:
+                    self.late += 1
+
+        self._restart_hung()
+
+        return [mask if mask is not None else self._fallback(frame) for frame, mask in zip(frames, results)]
+
+    def close(self) -> None:
+        """Останавливает процессы и освобождает общую память"""
+        self._finalizer()
+
+    def _submit(self, index: int, frame: np.ndarray) -> int:
+        """Записывает кадр в слот процесса и отправляет запрос
+
+        :param int index: Номер процесса и его слота
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :return int: Номер запроса
+        """
+        h, w = frame.shape[:2]
+        self._frame_view(index, h, w)[...] = frame
+
+        self._seq += 1
+        self._busy[index] = (self._seq, time.monotonic(), (h, w))
+        self._handles[index].conn.send(("segment", index, self._seq, h, w))
+
+        return self._seq
+
+    def _receive(self, timeout: float) -> list[tuple[int, np.ndarray | None]]:
+        """Забирает готовые маски занятых процессов, ожидая первую не дольше timeout
+
+        Процессы, завершившиеся во время обработки, перезапускаются, а их запросы
+        возвращаются без маски.
+
+        :param float timeout: Максимальное время ожидания, с
+        :return list[tuple[int, np.ndarray | None]]: Номер запроса и маска для каждого ответа; None — запрос потерян
+        """
+        if not self._busy:
+            return []
+
+        waitables = {}
+        for index in self._busy:
+            handle = self._handles[index]
+            waitables[handle.conn] = index
+            waitables[handle.process.sentinel] = index
+
+        received = []
+        for waitable in wait(list(waitables), timeout=timeout):
+            index = waitables[waitable]
+            if index not in self._busy:
+                continue
+
+            handle = self._handles[index]
+            seq, _, (h, w) = self._busy[index]
+
+            try:
+                reply = handle.conn.recv() if handle.conn.poll() else None
+            except (EOFError, OSError):
+                reply = None
+
+            if reply is None:
+                if not handle.process.is_alive():
+                    logger.warning("Процесс сегментации %d завершился, перезапуск", index)
+                    self._restart(index)
+                    received.append((seq, None))
+                continue
+
+            _, _, reply_seq, error = reply
+            del self._busy[index]
+            if error is not None:
+                raise RuntimeError(f"Ошибка сегментации в процессе {index}: {error}")
+
+            self._last_mask = self._mask_view(index, h, w).copy()
+            received.append((reply_seq, self._last_mask))
+
+        return received
+
+    def _count_late(self, received: list[tuple[int, np.ndarray | None]]) -> None:
+        self.late += sum(mask is not None for _, mask in received)
+
+    def _restart_hung(self) -> None:
+        """Перезапускает процессы, не отвечающие дольше hang_timeout"""
+        now = time.monotonic()
+
+        for index, (_, submitted, _) in list(self._busy.items()):
+            if now - submitted >= self.hang_timeout:
+                logger.warning("Процесс сегментации %d не отвечает %.1f с, перезапуск", index, now - submitted)
+                self._restart(index)
+
+    def _fallback(self, frame: np.ndarray) -> np.ndarray:
+        """Возвращает последнюю полученную маску подходящего размера или пустую маску
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :return np.ndarray: Маска (H, W)
+        """
+        self.fallbacks += 1
+        h, w = frame.shape[:2]
+
+        if self._last_mask is not None and self._last_mask.shape == (h, w):
+            return self._last_mask
+
+        return np.zeros((h, w), dtype=np.uint8)
+
+    def _ensure_capacity(self, pixels: int) -> None:
+        """Пересоздает общую память, если кадр не помещается в слоты
+
+        Вызывается, только когда ни один процесс не обрабатывает кадр.
+
+        :param int pixels: Количество пикселей самого большого кадра
+        """
+        if pixels <= self._capacity:
+            return
+
+        old = self._shm
+        self._capacity = pixels
+        self._shm = SharedMemory(create=True, size=self.workers * pixels * _SLOT_BYTES_PER_PIXEL)
+        self._shared[0] = self._shm
+
+        for handle in self._handles:
+            if handle is not None:
+                handle.conn.send(("attach", self._shm.name, self._capacity))
+
+        # Процессы переподключаются к новой памяти по порядку сообщений, а старое отображение остается валидным до закрытия
+        if old is not None:
+            old.close()
+            old.unlink()
+
+    def _frame_view(self, index: int, h: int, w: int) -> np.ndarray:
+        offset = index * self._capacity * _SLOT_BYTES_PER_PIXEL
+        return np.ndarray((h, w, 3), dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    def _mask_view(self, index: int, h: int, w: int) -> np.ndarray:
+        offset = index * self._capacity * _SLOT_BYTES_PER_PIXEL + self._capacity * 3
+        return np.ndarray((h, w), dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    def _start(self, index: int) -> None:
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.segmenter_kwargs),
+            name=f"segmenter-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        self._handles[index] = _WorkerHandle(process, parent_conn)
+
+        if self._shm is not None:
+            parent_conn.send(("attach", self._shm.name, self._capacity))
+
+    def _restart(self, index: int) -> None:
+        handle = self._handles[index]
+        _stop(handle, graceful=False)
+        self._busy.pop(index, None)
+
+        self.restarts += 1
+        self._start(index)
+
+    def _poll_ready(self) -> None:
+        """Отмечает процессы, завершившие загрузку модели, и перезапускает завершившиеся свободные процессы"""
+        for index, handle in enumerate(self._handles):
+            if handle.process.is_alive():
+                self._check_ready(handle)
+                continue
+
+            if index in self._busy:
+                # Завершение во время обработки кадра обнаруживается при получении ответа
+                continue
+
+            if handle.ready:
+                logger.warning("Процесс сегментации %d завершился, перезапуск", index)
+                self._restart(index)
+            # Перезапуск не чаще раза в секунду, если модель не загружается
+            elif time.monotonic() - handle.started > 1.0:
+                logger.warning("Процесс сегментации %d завершился при загрузке модели, перезапуск", index)
+                self._restart(index)
+
+    def _wait_ready(self, timeout: float) -> None:
+        """Ожидает загрузки модели хотя бы в одном процессе
+
+        :param float timeout: Максимальное время ожидания, с
+        :raises RuntimeError: Если ни один процесс не загрузил модель
+        """
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            if any([self._check_ready(handle) for handle in self._handles]):
+                return
+
+            if not any(handle.process.is_alive() for handle in self._handles):
+                break
+
+            wait([handle.conn for handle in self._handles], timeout=0.1)
+
+        self.close()
+        raise RuntimeError("Ни один процесс сегментации не загрузил модель")
+
+    @staticmethod
+    def _check_ready(handle: _WorkerHandle) -> bool:
+        """Проверяет без ожидания, сообщил ли процесс о загрузке модели
+
+        :param _WorkerHandle handle: Процесс и канал связи с ним
+        :return bool: True, если процесс готов принимать кадры
+        """
+        if not handle.ready and handle.conn.poll():
+            try:
+                handle.ready = handle.conn.recv() == ("ready",)
+            except (EOFError, OSError):
+                pass
+
+        return handle.ready
+
+    @staticmethod
+    def _shutdown(handles: list[_WorkerHandle | None], shms: list[SharedMemory | None]) -> None:
+        for handle in handles:
+            if handle is not None:
+                _stop(handle, graceful=True)
+
+        for shm in shms:
+            if shm is not None:
+                shm.close()
+                try:
+                    shm.unlink()
+                except FileNotFoundError:
+                    pass
+
+
+def _stop(handle: _WorkerHandle, graceful: bool) -> None:
+    """Останавливает процесс сегментации
+
+    :param _WorkerHandle handle: Процесс и канал связи с ним
+    :param bool graceful: Попросить ли процесс завершиться перед принудительной остановкой
+    """
+    if graceful and handle.process.is_alive():
+        try:
+            handle.conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        handle.process.join(timeout=1.0)
+
+    if handle.process.is_alive():
+        handle.process.kill()
+        handle.process.join(timeout=1.0)
+
+    handle.conn.close()
+
+
+def _worker_main(conn: Connection, segmenter_kwargs: dict) -> None:
+    """Цикл процесса сегментации: читает кадры из слота общей памяти и записывает туда маски
+
+    :param Connection conn: Канал связи с основным процессом
+    :param dict segmenter_kwargs: Параметры Segmenter
+    """
+    from .segmentation import Segmenter
+
+    segmenter = Segmenter(**segmenter_kwargs)
+    conn.send(("ready",))
+
+    shm: SharedMemory | None = None
+    capacity = 0
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        if message[0] == "stop":
+            break
+
+        if message[0] == "attach":
+            if shm is not None:
+                shm.close()
+            shm = SharedMemory(name=message[1])
+            capacity = message[2]
+            continue
+
+        _, slot, seq, h, w = message
+        offset = slot * capacity * _SLOT_BYTES_PER_PIXEL
+
+        frame = np.ndarray((h, w, 3), dtype=np.uint8, buffer=shm.buf, offset=offset)
+        mask_out = np.ndarray((h, w), dtype=np.uint8, buffer=shm.buf, offset=offset + capacity * 3)
+
+        try:
+            np.copyto(mask_out, segmenter.segment(frame), casting="unsafe")
+            conn.send(("done", slot, seq, None))
+        except Exception as e:
+            conn.send(("done", slot, seq, f"{type(e).__name__}: {e}"))
+
+    if shm is not None:
+        shm.close()
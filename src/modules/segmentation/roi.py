@@ -0,0 +1,128 @@
+import cv2
+import numpy as np
+
+from .segmenters import Segmentor
+
+
+class ROISegmenter(Segmentor):
+
+    def __init__(
+        self,
+        segmentor: Segmentor,
+        margin: float = 0.2,
+        refresh_interval: int = 30,
+        min_area: float = 0.002,
+        max_area: float = 0.7,
+    ) -> None:
+
+        self.segmentor = segmentor
+        self.margin = margin
+        self.refresh_interval = max(1, refresh_interval)
+        self.min_area = min_area
+        self.max_area = max_area
+
+        self.roi_inferences: int = 0
+        self.full_inferences: int = 0
+
+        self._box: tuple[int, int, int, int] | None = None
+        self._since_full: int = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "roi_inferences": self.roi_inferences,
+            "full_inferences": self.full_inferences,
+        }
+
+    def reset(self) -> None:
+        """Сбрасывает отслеживаемую рамку, вынуждая выполнить полный проход на следующем кадре"""
+        self._box = None
+        self._since_full = 0
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+
+        roi = self._roi((h, w))
+        if roi is None:
+            return self._full(frame)
+
+        x0, y0, x1, y1 = roi
+        crop_mask = self.segmentor.segment(np.ascontiguousarray(frame[y0:y1, x0:x1]))
+
+        box = self._track(crop_mask, (h, w))
+        if box is None or self._touches_edge(crop_mask, roi, (h, w)):
+            return self._full(frame)
+
+        mask = np.zeros((h, w), dtype=crop_mask.dtype)
+        mask[y0:y1, x0:x1] = crop_mask
+
+        bx, by, bw, bh = box
+        self._box = (x0 + bx, y0 + by, bw, bh)
+        self._since_full += 1
+        self.roi_inferences += 1
+
+        return mask
+
+    def _full(self, frame: np.ndarray) -> np.ndarray:
+        mask = self.segmentor.segment(frame)
+
+        self.full_inferences += 1
+        self._since_full = 0
+        self._box = self._track(mask, mask.shape[:2])
+
+        return mask
+
+    def _track(self, mask: np.ndarray, frame_size: tuple[int, int]) -> tuple[int, int, int, int] | None:
+        """Вычисляет рамку объектов по маске
+
+        :param np.ndarray mask: Маска объектов кадра или области интереса
+        :param tuple[int, int] frame_size: Размер кадра (H, W)
+        :return tuple[int, int, int, int] | None: Рамка (x, y, w, h) в координатах маски или None, если объектов нет или они слишком малы
+        """
+        x, y, bw, bh = cv2.boundingRect(mask if mask.dtype == np.uint8 else (mask != 0).view(np.uint8))
+
+        if bw * bh < self.min_area * frame_size[0] * frame_size[1]:
+            return None
+
+        return x, y, bw, bh
+
+    def _roi(self, frame_size: tuple[int, int]) -> tuple[int, int, int, int] | None:
+        """Расширяет рамку с предыдущего кадра до области интереса
+
+        :param tuple[int, int] frame_size: Размер кадра (H, W)
+        :return tuple[int, int, int, int] | None: Область (x0, y0, x1, y1) или None, если нужен полный проход
+        """
+        if self._box is None or self._since_full + 1 >= self.refresh_interval:
+            return None
+
+        h, w = frame_size
+        x, y, bw, bh = self._box
+        dx, dy = round(bw * self.margin) + 8, round(bh * self.margin) + 8
+
+        x0, y0 = max(0, x - dx), max(0, y - dy)
+        x1, y1 = min(w, x + bw + dx), min(h, y + bh + dy)
+
+        if (x1 - x0) * (y1 - y0) > self.max_area * w * h:
+            return None
+
+        return x0, y0, x1, y1
+
+    def _touches_edge(self, crop_mask: np.ndarray, roi: tuple[int, int, int, int], frame_size: tuple[int, int]) -> bool:
+        """Проверяет, касается ли маска края области, не совпадающего с краем кадра
+
+        В этом случае объект мог выйти за пределы области, и сегментацию нужно повторить по полному кадру.
+
+        :param np.ndarray crop_mask: Маска области интереса
+        :param tuple[int, int, int, int] roi: Область (x0, y0, x1, y1)
+        :param tuple[int, int] frame_size: Размер кадра (H, W)
+        :return bool: True, если нужен полный проход
+        """
+        h, w = frame_size
+        x0, y0, x1, y1 = roi
+
+        edges = [
+            (x0 > 0, crop_mask[:, 0]),
+            (y0 > 0, crop_mask[0, :]),
+            (x1 < w, crop_mask[:, -1]),
+            (y1 < h, crop_mask[-1, :]),
+        ]
+        return any(inner and edge.any() for inner, edge in edges)
@@ -0,0 +1,115 @@
+from typing import Literal
+from collections.abc import Sequence
+
+import cv2
+import numpy as np
+
+from .segmenters import Segmentor
+
+
+class ScaledSegmenter(Segmentor):
+
+    def __init__(
+        self,
+        segmentor: Segmentor,
+        inference_size: int | None = None,
+        upsampling: Literal['nearest', 'guided'] = 'guided',
+        radius: int = 2,
+        eps: float = 1e-3,
+    ) -> None:
+
+        self.segmentor = segmentor
+        self.inference_size = inference_size
+        self.upsampling = upsampling
+        self.radius = radius
+        self.eps = eps
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+        small = self._downscale(frame)
+        mask = self.segmentor.segment(small)
+
+        return self._upscale(frame, small, mask)
+
+    def segment_batch(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+        smalls = [self._downscale(frame) for frame in frames]
+        masks = self.segmentor.segment_batch(smalls)
+
+        return [self._upscale(frame, small, mask) for frame, small, mask in zip(frames, smalls, masks)]
+
+    def _downscale(self, frame: np.ndarray) -> np.ndarray:
+        """Уменьшает кадр до размера инференса по большей стороне
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :return np.ndarray: Уменьшенный кадр или исходный, если он не больше размера инференса
+        """
+        h, w = frame.shape[:2]
+
+        if not self.inference_size or max(h, w) <= self.inference_size:
+            return frame
+
+        scale = self.inference_size / max(h, w)
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def _upscale(self, frame: np.ndarray, small: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Увеличивает маску уменьшенного кадра до размера исходного кадра
+
+        :param np.ndarray frame: Исходный кадр (H, W, 3)
+        :param np.ndarray small: Кадр, на котором выполнялся инференс (h, w, 3)
+        :param np.ndarray mask: Маска уменьшенного кадра (h, w)
+        :return np.ndarray: Маска размера исходного кадра (H, W)
+        """
+        if small is frame:
+            return mask
+
+        if self.upsampling == 'nearest':
+            h, w = frame.shape[:2]
+            return cv2.resize(mask, (w, h), interpolation=cv2.INTER_NEAREST)
+
+        return self._guided_upsample(frame, small, mask)
+
+    def _guided_upsample(self, frame: np.ndarray, small: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Увеличивает маску до размера кадра быстрым управляемым фильтром по полноразмерному кадру
+
+        Коэффициенты линейной модели считаются на уменьшенном кадре и интерполируются,
+        поэтому на полном разрешении выполняются только поэлементные операции.
+
+        :param np.ndarray frame: Исходный кадр (H, W, 3)
+        :param np.ndarray small: Уменьшенный кадр, на котором выполнялся инференс (h, w, 3)
+        :param np.ndarray mask: Маска уменьшенного кадра (h, w)
+        :return np.ndarray: Маска размера исходного кадра (H, W)
+        """
+        h, w = frame.shape[:2]
+        ksize = (2 * self.radius + 1, 2 * self.radius + 1)
+
+        guide = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.float32) / 255.0
+        prob = (mask != 0).astype(np.float32)
+
+        mean_i = cv2.boxFilter(guide, -1, ksize)
+        mean_p = cv2.boxFilter(prob, -1, ksize)
+        cov_ip = cv2.boxFilter(guide * prob, -1, ksize) - mean_i * mean_p
+        var_i = cv2.boxFilter(guide * guide, -1, ksize) - mean_i * mean_i
+
+        a = cov_ip / (var_i + self.eps)
+        b = mean_p - a * mean_i
+
+        a = cv2.resize(cv2.boxFilter(a, -1, ksize), (w, h), interpolation=cv2.INTER_LINEAR)
+        b = cv2.resize(cv2.boxFilter(b, -1, ksize), (w, h), interpolation=cv2.INTER_LINEAR)
+
+        full_guide = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+        q = cv2.multiply(a, full_guide, scale=1 / 255.0, dtype=cv2.CV_32F)
+        foreground = cv2.compare(cv2.add(q, b, dst=q), 0.5, cv2.CMP_GT)
+
+        labels = cv2.resize(mask, (w, h), interpolation=cv2.INTER_NEAREST)
+        labels = cv2.bitwise_and(labels, foreground)
+
+        # Пиксели, добавленные фильтром за пределами исходной маски, получают преобладающий класс
+        grown = cv2.bitwise_and(cv2.compare(labels, 0, cv2.CMP_EQ), foreground)
+        if cv2.countNonZero(grown):
+            counts = np.bincount(mask.ravel())
+            counts[0] = 0
+            labels = cv2.bitwise_or(labels, cv2.bitwise_and(grown, int(counts.argmax())))
+
+        return labels
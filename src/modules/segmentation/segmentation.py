@@ -1,15 +1,121 @@
 from typing import Literal
+from pathlib import Path
+from collections.abc import Sequence
 
 import numpy as np
 
+from src.config.roi import ROIConfig
+from src.config.path import SEGMENTATION_VARIANTS_PATH
+from src.config.temporal import TemporalConfig
+
+from .roi import ROISegmenter
+from .scaled import ScaledSegmenter
+from .process import ProcessSegmenter
+from .temporal import TemporalSegmenter
 from .segmenters import Segmentor
-from .segmenters.registry import SEGMENTERS
+from .segmenters.registry import get_segmenter
+from .segmenters.variants import get_variant
 
 
 class Segmenter:
 
-    def __init__(self, model: Literal['yolo', 'mediapipe'], **kwargs) -> None:
-        self.segmenter: Segmentor = SEGMENTERS[model](**kwargs)
+    def __init__(
+        self,
+        model: Literal['yolo', 'yolo_onnx', 'mediapipe'],
+        temporal: TemporalConfig | None = None,
+        roi: ROIConfig | None = None,
+        inference_size: int | None = None,
+        upsampling: Literal['nearest', 'guided'] = 'guided',
+        warmup: bool = False,
+        workers: int = 0,
+        worker_timeout: float = 1.0,
+        worker_hang_timeout: float = 10.0,
+        max_frame_size: tuple[int, int] | None = None,
+        variant: str | None = None,
+        variants_dir: str | Path | None = None,
+        **kwargs,
+    ) -> None:
+
+        # Вариант задает бэкенд и файл модели, поэтому переход на квантованную модель — изменение конфигурации
+        if variant is not None:
+            model_variant, path = get_variant(variant, variants_dir or SEGMENTATION_VARIANTS_PATH)
+            model = model_variant.backend
+            kwargs["model_path"] = str(path)
+            if model == 'yolo_onnx':
+                kwargs.setdefault("imgsz", model_variant.imgsz)
+
+        self.model = model
+        self.variant = variant
+
+        # Модель и уменьшение кадра выполняются в процессах, а слои с состоянием потока — в текущем процессе
+        if workers:
+            self.segmenter: Segmentor = ProcessSegmenter(
+                workers,
+                timeout=worker_timeout,
+                hang_timeout=worker_hang_timeout,
+                max_frame_size=max_frame_size,
+                model=model,
+                inference_size=inference_size,
+                upsampling=upsampling,
+                **kwargs,
+            )
+        else:
+            self.segmenter: Segmentor = get_segmenter(model)(**kwargs)
+
+            if warmup:
+                self.segmenter.warmup()
+
+            if inference_size is not None:
+                self.segmenter = ScaledSegmenter(self.segmenter, inference_size, upsampling)
+
+        # Область интереса вырезается из полноразмерного кадра до уменьшения под инференс
+        if roi is not None:
+            self.segmenter = ROISegmenter(self.segmenter, **roi.asdict())
+
+        if temporal is not None:
+            self.segmenter = TemporalSegmenter(self.segmenter, **temporal.asdict())
 
     def segment(self, frame: np.ndarray) -> np.ndarray:
         return self.segmenter.segment(frame)
+
+    def segment_batch(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+        return self.segmenter.segment_batch(frames)
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает счетчики всех слоев сегментации
+
+        :return dict[str, int]: Значения счетчиков по названию
+        """
+        stats = {}
+
+        for layer in self.layers():
+            if hasattr(layer, "stats"):
+                stats.update(layer.stats())
+
+        return stats
+
+    def reset(self) -> None:
+        """Сбрасывает состояние слоев, зависящее от предыдущих кадров"""
+        for layer in self.layers():
+            if hasattr(layer, "reset"):
+                layer.reset()
+
+    def close(self) -> None:
+        """Освобождает ресурсы слоев, например процессы сегментации"""
+        for layer in self.layers():
+            if hasattr(layer, "close"):
+                layer.close()
+
+    def layers(self) -> list[Segmentor]:
+        """Возвращает слои сегментации от внешнего к модели
+
+        :return list[Segmentor]: Обертки и модель сегментации
+        """
+        layers = []
+        segmenter = self.segmenter
+
+        while segmenter is not None:
+            layers.append(segmenter)
+            segmenter = getattr(segmenter, "segmentor", None)
+
+        return layers
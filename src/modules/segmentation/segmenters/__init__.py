@@ -1,9 +1,24 @@
+import importlib
+
 from .base import Segmentor
-from .yolo import YOLOSegmenter
-from .mediapipe import MediaPipeSegmenter
+
+_LAZY_IMPORTS = {
+    'YOLOSegmenter': '.yolo',
+    'YOLOOnnxSegmenter': '.yolo_onnx',
+    'MediaPipeSegmenter': '.mediapipe',
+}
 
 __all__ = [
     'Segmentor',
     'YOLOSegmenter',
+    'YOLOOnnxSegmenter',
     'MediaPipeSegmenter',
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 import numpy as np
 
@@ -13,3 +14,26 @@ class Segmentor(ABC):
         :return np.ndarray: Маска по размеру входного изображения (H, W); 0 — фон, >0 — передний план
         """
         pass
+
+    def segment_batch(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+        """Предсказывает маски для набора кадров
+
+        По умолчанию кадры обрабатываются по очереди; модели с поддержкой батчей
+        переопределяют метод для одного вызова инференса.
+
+        :param Sequence[np.ndarray] frames: Входные кадры (H, W, 3), размеры могут различаться
+        :return list[np.ndarray]: Маски в порядке входных кадров
+        """
+        return [self.segment(frame) for frame in frames]
+
+    def warmup(self, frame_size: tuple[int, int] = (480, 640), runs: int = 1) -> None:
+        """Прогревает модель на пустых кадрах, чтобы первый реальный кадр не включал
+        время инициализации и выделения памяти
+
+        :param tuple[int, int] frame_size: Размер кадра для прогрева (H, W)
+        :param int runs: Количество прогонов
+        """
+        frame = np.zeros((*frame_size, 3), dtype=np.uint8)
+
+        for _ in range(runs):
+            self.segment(frame)
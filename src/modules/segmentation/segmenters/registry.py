@@ -1,7 +1,26 @@
-from .yolo import YOLOSegmenter
-from .mediapipe import MediaPipeSegmenter
+import importlib
 
+from .base import Segmentor
+
+# Бэкенды импортируются только при запросе, чтобы не загружать torch и mediapipe без необходимости
 SEGMENTERS = {
-    "yolo": YOLOSegmenter,
-    "mediapipe": MediaPipeSegmenter,
+    "yolo": ".yolo:YOLOSegmenter",
+    "yolo_onnx": ".yolo_onnx:YOLOOnnxSegmenter",
+    "mediapipe": ".mediapipe:MediaPipeSegmenter",
 }
+
+
+def get_segmenter(name: str) -> type[Segmentor]:
+    """Возвращает класс сегментатора по названию, импортируя его модуль при первом обращении
+
+    :param str name: Название сегментатора
+    :raises ValueError: Если сегментатор с таким названием не зарегистрирован
+    :return type[Segmentor]: Класс сегментатора
+    """
+    if name not in SEGMENTERS:
+        raise ValueError(f"Неизвестный сегментатор: {name}. Доступные: {', '.join(SEGMENTERS)}")
+
+    module_name, class_name = SEGMENTERS[name].split(":")
+    module = importlib.import_module(module_name, __package__)
+
+    return getattr(module, class_name)
@@ -0,0 +1,87 @@
+import os
+import json
+from pathlib import Path
+from dataclasses import asdict, dataclass
+
+from src.config.path import SEGMENTATION_VARIANTS_PATH
+
+# Манифест экспортированных вариантов моделей; хранится в директории вариантов
+VARIANTS_MANIFEST = "variants.json"
+
+
+@dataclass
+class ModelVariant:
+    """Экспортированный вариант модели сегментации.
+
+    :param str name: Название варианта, по которому он выбирается в SegmenterConfig.variant
+    :param str backend: Название сегментатора, загружающего вариант
+    :param str path: Путь до модели относительно директории вариантов
+    :param str precision: Точность весов и активаций: fp32, int8-dynamic или int8-static
+    :param str source: Исходные веса, из которых получен вариант
+    :param int imgsz: Размер входа модели
+    """
+    name: str
+    backend: str
+    path: str
+    precision: str
+    source: str
+    imgsz: int
+
+
+def load_variants(directory: str | Path = SEGMENTATION_VARIANTS_PATH) -> dict[str, ModelVariant]:
+    """Читает манифест вариантов моделей
+
+    :param str | Path directory: Директория вариантов
+    :return dict[str, ModelVariant]: Варианты по названию; пустой словарь, если манифеста нет
+    """
+    try:
+        with open(Path(directory) / VARIANTS_MANIFEST, encoding="utf-8") as f:
+            records = json.load(f)
+    except FileNotFoundError:
+        return {}
+
+    return {record["name"]: ModelVariant(**record) for record in records}
+
+
+def get_variant(name: str, directory: str | Path = SEGMENTATION_VARIANTS_PATH) -> tuple[ModelVariant, Path]:
+    """Возвращает вариант модели по названию
+
+    :param str name: Название варианта
+    :param str | Path directory: Директория вариантов
+    :raises ValueError: Если вариант с таким названием не зарегистрирован
+    :raises FileNotFoundError: Если файл модели варианта не найден
+    :return tuple[ModelVariant, Path]: Вариант и абсолютный путь до модели
+    """
+    variants = load_variants(directory)
+
+    if name not in variants:
+        raise ValueError(f"Неизвестный вариант модели: {name}. Доступные: {', '.join(variants) or 'нет'}")
+
+    variant = variants[name]
+    path = Path(directory).resolve() / variant.path
+
+    if not path.exists():
+        raise FileNotFoundError(f"Модель варианта {name} не найдена: {path}")
+
+    return variant, path
+
+
+def register_variant(variant: ModelVariant, directory: str | Path = SEGMENTATION_VARIANTS_PATH) -> None:
+    """Добавляет вариант в манифест, заменяя вариант с тем же названием
+
+    :param ModelVariant variant: Вариант модели
+    :param str | Path directory: Директория вариантов
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    variants = load_variants(directory)
+    variants[variant.name] = variant
+
+    manifest_path = directory / VARIANTS_MANIFEST
+    tmp_path = manifest_path.with_suffix(".tmp")
+
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump([asdict(v) for v in variants.values()], f, ensure_ascii=False, indent=2)
+
+    os.replace(tmp_path, manifest_path)
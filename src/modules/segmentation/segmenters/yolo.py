@@ -25,14 +25,36 @@ class YOLOSegmenter(Segmentor):
 
         results = self.model.predict(frame, classes=self.classes, conf=self.conf)
 
+        polygons = self._extract_polygons(results)
+
+        mask = self._build_mask(frame.shape[:2], polygons)
+        return mask
+
+    def segment_batch(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+
+        if not frames:
+            return []
+
+        results = self.model.predict(list(frames), classes=self.classes, conf=self.conf)
+
+        return [
+            self._build_mask(frame.shape[:2], self._extract_polygons([result]))
+            for frame, result in zip(frames, results)
+        ]
+
+    def _extract_polygons(self, results) -> list[tuple[int, np.ndarray]]:
+        """Извлекает индексы классов и точки масок из результатов предсказания
+
+        :param results: Результаты ``YOLO.predict`` для одного кадра
+        :return list[tuple[int, np.ndarray]]: Индекс класса и точки для каждой найденной маски
+        """
         polygons: list[tuple[int, np.ndarray]] = []
         for result in results:
             if result.masks and result.masks.xy is not None:
                 for i, polygon in zip(result.boxes.cls, result.masks.xy):
                     polygons.append((int(i), np.asarray(polygon, dtype=np.int32)))
 
-        mask = self._build_mask(frame.shape[:2], polygons)
-        return mask
+        return polygons
 
     def _build_mask(self, frame_size: tuple[int, int], polygons: Sequence[tuple[int, np.ndarray]]) -> np.ndarray:
         """Формирует маску размера исходного кадра по координатам точек маски
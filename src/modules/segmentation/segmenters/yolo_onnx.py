@@ -0,0 +1,239 @@
+import os
+import shutil
+from pathlib import Path
+from collections.abc import Sequence
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+from src.config.path import SEGMENTATION_YOLO_PATH
+
+from .base import Segmentor
+
+
+class YOLOOnnxSegmenter(Segmentor):
+
+    PAD_VALUE = 114
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        classes: Sequence[int] | int | None = (0),
+        conf: float = 0.25,
+        iou: float = 0.7,
+        max_det: int = 300,
+        imgsz: int = 640,
+        threads: int | None = None,
+    ) -> None:
+
+        self.classes = None if classes is None else np.atleast_1d(np.asarray(classes, dtype=np.int64))
+        self.conf = conf
+        self.iou = iou
+        self.max_det = max_det
+        self.imgsz = imgsz
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.model_path = self._ensure_model(model_path)
+        self.session = ort.InferenceSession(self.model_path, options, providers=['CPUExecutionProvider'])
+
+        self._input_name = self.session.get_inputs()[0].name
+        self._output_names = [output.name for output in self.session.get_outputs()]
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+
+        blob, ratio, pad = self._letterbox(frame)
+        preds, protos = self.session.run(self._output_names, {self._input_name: blob})
+
+        return self._decode(preds[0], protos[0], frame.shape[:2], ratio, pad)
+
+    def _letterbox(self, frame: np.ndarray) -> tuple[np.ndarray, float, tuple[int, int]]:
+        """Вписывает кадр в квадрат размера модели с сохранением пропорций
+
+        Повторяет ``LetterBox`` из ultralytics, включая перестановку каналов,
+        которую ultralytics выполняет для входа в виде numpy-массива.
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :return tuple[np.ndarray, float, tuple[int, int]]: Тензор (1, 3, S, S), коэффициент масштаба и отступы (left, top)
+        """
+        h, w = frame.shape[:2]
+        ratio = min(self.imgsz / h, self.imgsz / w)
+        new_w, new_h = round(w * ratio), round(h * ratio)
+
+        dw, dh = (self.imgsz - new_w) / 2, (self.imgsz - new_h) / 2
+        left, right = round(dw - 0.1), round(dw + 0.1)
+        top, bottom = round(dh - 0.1), round(dh + 0.1)
+
+        if (new_w, new_h) != (w, h):
+            frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+        padded = cv2.copyMakeBorder(frame, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(self.PAD_VALUE,) * 3)
+        blob = cv2.dnn.blobFromImage(padded, scalefactor=1 / 255.0, swapRB=True)
+
+        return blob, ratio, (left, top)
+
+    def _decode(
+        self,
+        preds: np.ndarray,
+        protos: np.ndarray,
+        frame_size: tuple[int, int],
+        ratio: float,
+        pad: tuple[int, int],
+    ) -> np.ndarray:
+        """Декодирует выход модели в маску классов размера исходного кадра
+
+        :param np.ndarray preds: Предсказания (4 + nc + nm, N): xywh, оценки классов, коэффициенты масок
+        :param np.ndarray protos: Прототипы масок (nm, mh, mw)
+        :param tuple[int, int] frame_size: Размер исходного кадра (H, W)
+        :param float ratio: Коэффициент масштаба letterbox
+        :param tuple[int, int] pad: Отступы letterbox (left, top)
+        :return np.ndarray: Маска (H, W), где 0 — фон, i + 1 — класс i
+        """
+        h, w = frame_size
+        mask = np.zeros(frame_size, dtype=np.uint8)
+
+        nm = protos.shape[0]
+        preds = preds.T
+        scores = preds[:, 4:-nm]
+
+        # Как и в ultralytics, класс выбирается по всем оценкам, а фильтр классов применяется после
+        cls = scores.argmax(axis=1)
+        conf = scores[np.arange(len(cls)), cls]
+
+        keep = conf > self.conf
+        if self.classes is not None:
+            keep &= np.isin(cls, self.classes)
+
+        if not keep.any():
+            return mask
+
+        boxes = self._xywh2xyxy(preds[keep, :4])
+        cls, conf, coeffs = cls[keep], conf[keep], preds[keep, -nm:]
+
+        order = self._nms(boxes, conf, cls)[:self.max_det]
+        boxes, cls, coeffs = boxes[order], cls[order], coeffs[order]
+
+        mh, mw = protos.shape[1:]
+        stride_x, stride_y = self.imgsz / mw, self.imgsz / mh
+        sx, sy = ratio / stride_x, ratio / stride_y
+
+        # Логиты масок на сетке прототипов; сигмоида монотонна, поэтому порог 0.5 равен порогу 0 по логиту
+        logits = (coeffs @ protos.reshape(nm, -1)).reshape(-1, mh, mw)
+
+        # Рамки из координат letterbox в координаты исходного кадра
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad[0]) / ratio).clip(0, w)
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad[1]) / ratio).clip(0, h)
+
+        for logit, box, label in zip(logits, boxes, cls):
+            x1, y1 = int(np.floor(box[0])), int(np.floor(box[1]))
+            x2, y2 = int(np.ceil(box[2])), int(np.ceil(box[3]))
+            if x2 <= x1 or y2 <= y1:
+                continue
+
+            # Билинейная выборка логитов только внутри рамки: пиксель (u, v) рамки
+            # соответствует точке ((x1 + u + 0.5) * ratio + left) / stride - 0.5 сетки прототипов
+            matrix = np.float32([
+                [sx, 0, ((x1 + 0.5) * ratio + pad[0]) / stride_x - 0.5],
+                [0, sy, ((y1 + 0.5) * ratio + pad[1]) / stride_y - 0.5],
+            ])
+            region = cv2.warpAffine(
+                logit,
+                matrix,
+                (x2 - x1, y2 - y1),
+                flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                borderMode=cv2.BORDER_REPLICATE,
+            )
+
+            mask[y1:y2, x1:x2][region > 0] = label + 1
+
+        return mask
+
+    def _nms(self, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        """Подавляет пересекающиеся рамки одного класса
+
+        :param np.ndarray boxes: Рамки (N, 4) в формате xyxy
+        :param np.ndarray scores: Уверенность (N,)
+        :param np.ndarray classes: Классы (N,)
+        :return np.ndarray: Индексы оставленных рамок по убыванию уверенности
+        """
+        # Смещение рамок по классу сводит многоклассовое подавление к одному проходу
+        offset = boxes + (classes * (self.imgsz * 2))[:, np.newaxis]
+        areas = (offset[:, 2] - offset[:, 0]) * (offset[:, 3] - offset[:, 1])
+
+        order = scores.argsort()[::-1]
+        keep = []
+
+        while order.size:
+            i = order[0]
+            keep.append(i)
+
+            rest = order[1:]
+            xx1 = np.maximum(offset[i, 0], offset[rest, 0])
+            yy1 = np.maximum(offset[i, 1], offset[rest, 1])
+            xx2 = np.minimum(offset[i, 2], offset[rest, 2])
+            yy2 = np.minimum(offset[i, 3], offset[rest, 3])
+
+            inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+            iou = inter / (areas[i] + areas[rest] - inter + 1e-7)
+
+            order = rest[iou <= self.iou]
+
+        return np.asarray(keep, dtype=np.int64)
+
+    @staticmethod
+    def _xywh2xyxy(boxes: np.ndarray) -> np.ndarray:
+        xy = boxes[:, :2]
+        half = boxes[:, 2:] / 2
+
+        return np.concatenate([xy - half, xy + half], axis=1)
+
+    def _ensure_model(self, model_path: str | None) -> str:
+        """Возвращает путь до ONNX-модели, экспортируя ее из весов ultralytics при необходимости
+
+        Экспортированная модель кэшируется рядом с исходными весами с расширением .onnx.
+
+        :param str | None model_path: Путь до .onnx или .pt модели; по умолчанию SEGMENTATION_YOLO_PATH
+        :raises FileNotFoundError: Если модель не найдена
+        :return str: Путь до ONNX-модели
+        """
+        path = Path(model_path or SEGMENTATION_YOLO_PATH)
+
+        if path.suffix == '.onnx':
+            if not path.exists():
+                raise FileNotFoundError(f'Модель не найдена: {path}')
+            return str(path)
+
+        onnx_path = path.with_suffix('.onnx')
+        if onnx_path.exists() and (not path.exists() or onnx_path.stat().st_mtime >= path.stat().st_mtime):
+            return str(onnx_path)
+
+        if not path.exists() and path != SEGMENTATION_YOLO_PATH:
+            raise FileNotFoundError(f'Модель не найдена: {path}')
+
+        return str(export_onnx(path, onnx_path, self.imgsz))
+
+
+def export_onnx(weights_path: str | Path, onnx_path: str | Path, imgsz: int = 640) -> Path:
+    """Экспортирует веса ultralytics в ONNX
+
+    :param str | Path weights_path: Путь до .pt весов
+    :param str | Path onnx_path: Путь, по которому нужно сохранить модель
+    :param int imgsz: Размер входа модели
+    :return Path: Путь до экспортированной модели
+    """
+    from ultralytics import YOLO
+
+    exported = YOLO(str(weights_path)).export(format='onnx', imgsz=imgsz, dynamic=False, simplify=True)
+
+    onnx_path = Path(onnx_path)
+    if Path(exported).resolve() != onnx_path.resolve():
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = onnx_path.with_suffix('.onnx.tmp')
+        shutil.copyfile(exported, tmp_path)
+        os.replace(tmp_path, onnx_path)
+
+    return onnx_path
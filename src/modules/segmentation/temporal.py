@@ -0,0 +1,153 @@
+from typing import Literal
+
+import cv2
+import numpy as np
+
+from .segmenters import Segmentor
+
+
+class TemporalSegmenter(Segmentor):
+
+    def __init__(
+        self,
+        segmentor: Segmentor,
+        policy: Literal['interval', 'motion'] = 'motion',
+        interval: int = 10,
+        motion_threshold: float = 6.0,
+        propagation: Literal['reuse', 'shift'] = 'shift',
+        analysis_width: int = 96,
+    ) -> None:
+
+        self.segmentor = segmentor
+        self.policy = policy
+        self.interval = max(1, interval)
+        self.motion_threshold = motion_threshold
+        self.propagation = propagation
+        self.analysis_width = analysis_width
+
+        self.frames: int = 0
+        self.inferences: int = 0
+
+        self._key_gray: np.ndarray | None = None
+        self._key_mask: np.ndarray | None = None
+        self._since_key: int = 0
+
+    @property
+    def skipped(self) -> int:
+        """Количество кадров, для которых полный инференс был пропущен"""
+        return self.frames - self.inferences
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "skipped_inferences": self.skipped,
+        }
+
+    def reset(self) -> None:
+        """Сбрасывает ключевой кадр, вынуждая выполнить инференс на следующем кадре"""
+        self._key_gray = None
+        self._key_mask = None
+        self._since_key = 0
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+        self.frames += 1
+
+        gray = self._analysis_view(frame)
+
+        if self._needs_keyframe(frame, gray):
+            return self._keyframe(frame, gray)
+
+        shift = self._estimate_shift(gray) if self.propagation == 'shift' else (0.0, 0.0)
+
+        if self.policy == 'motion' and self._motion_score(gray, shift) > self.motion_threshold:
+            return self._keyframe(frame, gray)
+
+        self._since_key += 1
+        return self._propagate(frame.shape[:2], shift)
+
+    def _needs_keyframe(self, frame: np.ndarray, gray: np.ndarray) -> bool:
+        """Проверяет безусловные причины для полного инференса
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :param np.ndarray gray: Уменьшенный кадр в оттенках серого
+        :return bool: True, если кадр должен быть ключевым
+        """
+        return (
+            self._key_mask is None
+            or self._key_mask.shape != frame.shape[:2]
+            or self._key_gray.shape != gray.shape
+            or self._since_key + 1 >= self.interval
+        )
+
+    def _keyframe(self, frame: np.ndarray, gray: np.ndarray) -> np.ndarray:
+        mask = self.segmentor.segment(frame)
+
+        self.inferences += 1
+        self._key_gray = gray
+        self._key_mask = mask
+        self._since_key = 0
+
+        return mask
+
+    def _analysis_view(self, frame: np.ndarray) -> np.ndarray:
+        """Формирует уменьшенный кадр в оттенках серого для оценки движения
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :return np.ndarray: Кадр (h, analysis_width) типа float32
+        """
+        h, w = frame.shape[:2]
+        width = min(self.analysis_width, w)
+        height = max(1, round(h * width / w))
+
+        small = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+
+        return gray.astype(np.float32)
+
+    def _estimate_shift(self, gray: np.ndarray) -> tuple[float, float]:
+        """Оценивает глобальный сдвиг кадра относительно ключевого методом фазовой корреляции
+
+        :param np.ndarray gray: Уменьшенный кадр в оттенках серого
+        :return tuple[float, float]: Сдвиг (dx, dy) в пикселях уменьшенного кадра
+        """
+        (dx, dy), _ = cv2.phaseCorrelate(self._key_gray, gray)
+        return dx, dy
+
+    def _motion_score(self, gray: np.ndarray, shift: tuple[float, float]) -> float:
+        """Считает среднюю разницу яркости с ключевым кадром после компенсации сдвига
+
+        :param np.ndarray gray: Уменьшенный кадр в оттенках серого
+        :param tuple[float, float] shift: Сдвиг (dx, dy) в пикселях уменьшенного кадра
+        :return float: Средняя абсолютная разница яркости (0-255)
+        """
+        reference = self._key_gray
+
+        if shift != (0.0, 0.0):
+            h, w = gray.shape
+            matrix = np.float32([[1, 0, shift[0]], [0, 1, shift[1]]])
+            reference = cv2.warpAffine(reference, matrix, (w, h), borderMode=cv2.BORDER_REPLICATE)
+
+        return float(cv2.absdiff(reference, gray).mean())
+
+    def _propagate(self, frame_size: tuple[int, int], shift: tuple[float, float]) -> np.ndarray:
+        """Переносит маску ключевого кадра на текущий кадр
+
+        :param tuple[int, int] frame_size: Размер текущего кадра (H, W)
+        :param tuple[float, float] shift: Сдвиг (dx, dy) в пикселях уменьшенного кадра
+        :return np.ndarray: Маска для текущего кадра (H, W)
+        """
+        if shift == (0.0, 0.0):
+            return self._key_mask
+
+        h, w = frame_size
+        scale = w / self._key_gray.shape[1]
+        matrix = np.float32([[1, 0, shift[0] * scale], [0, 1, shift[1] * scale]])
+
+        return cv2.warpAffine(
+            self._key_mask,
+            matrix,
+            (w, h),
+            flags=cv2.INTER_NEAREST,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
@@ -1,5 +1,11 @@
+from .runner import PipelinedRunner
+from .governor import QualityGovernor
 from .pipeline import FramePipeline
+from .multi_stream import MultiStreamPipeline
 
 __all__ = [
-    'FramePipeline'
+    'FramePipeline',
+    'QualityGovernor',
+    'PipelinedRunner',
+    'MultiStreamPipeline',
 ]
@@ -0,0 +1,267 @@
+import logging
+import threading
+from dataclasses import dataclass
+from collections.abc import Callable
+
+from src.config import GovernorConfig
+from src.modules import Segmenter, BackgroundProcessor
+from src.modules.segmentation import ScaledSegmenter, ProcessSegmenter
+from src.modules.segmentation import TemporalSegmenter
+from src.modules.segmentation.segmenters.registry import get_segmenter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Knob:
+    """Параметр, которым регулятор меняет качество.
+
+    :param str name: Название параметра
+    :param list levels: Значения по убыванию качества; первое — исходное значение
+    :param Callable apply: Функция, устанавливающая значение
+    :param int position: Индекс текущего значения
+    """
+    name: str
+    levels: list
+    apply: Callable[[object], None]
+    position: int = 0
+
+
+class QualityGovernor:
+
+    def __init__(
+        self,
+        segmenter: Segmenter,
+        background_processor: BackgroundProcessor,
+        target_fps: float,
+        config: GovernorConfig | None = None,
+        pipelined: bool = False,
+    ):
+        self.config = config or GovernorConfig()
+        self.budget = 1.0 / target_fps
+        self.pipelined = pipelined
+
+        self.segmenter = segmenter
+        self.background_processor = background_processor
+
+        self.knobs = self._build_knobs()
+        self.steps = self._build_steps(self.knobs)
+        self.level: int = 0
+        self.decisions: int = 0
+
+        self._latency: dict[str, float] = {}
+        self._cooldown: int = self.config.cooldown
+        self._calm_frames: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cost(self) -> float:
+        """Сглаженная стоимость кадра, с: сумма этапов при последовательной обработке
+        или самый медленный этап при параллельной"""
+        if not self._latency:
+            return 0.0
+        return max(self._latency.values()) if self.pipelined else sum(self._latency.values())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "governor_level": self.level,
+            "governor_decisions": self.decisions,
+        }
+
+    def settings(self) -> dict[str, object]:
+        """Возвращает текущие значения всех параметров качества
+
+        :return dict[str, object]: Значение по названию параметра
+        """
+        return {knob.name: knob.levels[knob.position] for knob in self.knobs}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Учитывает латентность этапа и принимает решение раз в кадр по этапу сегментации
+
+        :param str stage: Название этапа
+        :param float seconds: Длительность этапа, с
+        """
+        with self._lock:
+            previous = self._latency.get(stage)
+            alpha = self.config.ema_alpha
+            self._latency[stage] = seconds if previous is None else previous + alpha * (seconds - previous)
+
+            if stage == "segment":
+                self._decide()
+
+    def _decide(self) -> None:
+        # Отложенное переключение на резервную модель выполняется между кадрами, когда она загружена
+        if self._pending_model is not None:
+            self._switch_model()
+
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return
+
+        cost = self.cost
+
+        if cost > self.budget * self.config.degrade_ratio:
+            self._calm_frames = 0
+            if self.level < len(self.steps):
+                self._step(+1, cost)
+            return
+
+        if cost < self.budget * self.config.upgrade_ratio:
+            self._calm_frames += 1
+            if self._calm_frames >= self.config.upgrade_patience and self.level > 0:
+                self._step(-1, cost)
+            return
+
+        self._calm_frames = 0
+
+    def _step(self, direction: int, cost: float) -> None:
+        """Сдвигает качество на одну ступень
+
+        :param int direction: +1 — снизить качество, -1 — повысить
+        :param float cost: Сглаженная стоимость кадра, с
+        """
+        if direction > 0:
+            knob, position = self.steps[self.level]
+            self.level += 1
+        else:
+            self.level -= 1
+            knob, position = self.steps[self.level]
+            position -= 1
+
+        old, new = knob.levels[knob.position], knob.levels[position]
+        knob.apply(new)
+        knob.position = position
+
+        self.decisions += 1
+        self._cooldown = self.config.cooldown
+        self._calm_frames = 0
+
+        logger.info(
+            "Качество %s: %s %s -> %s (стоимость кадра %.1f мс, бюджет %.1f мс, ступень %d/%d)",
+            "снижено" if direction > 0 else "повышено",
+            knob.name,
+            old,
+            new,
+            cost * 1000,
+            self.budget * 1000,
+            self.level,
+            len(self.steps),
+        )
+
+    def _build_knobs(self) -> list[Knob]:
+        """Собирает параметры качества, доступные в слоях сегментации и наложении фона
+
+        :return list[Knob]: Параметры в порядке, в котором их качество снижается в первую очередь
+        """
+        knobs = []
+        layers = self.segmenter.layers()
+        backend = layers[-1]
+        processor = self.background_processor
+
+        if self.config.effect_quality and processor.blending == 'soft':
+            levels = [('soft', processor.feather_radius), ('soft', 0), ('hard', 0)]
+            knobs.append(Knob("blending", levels, self._set_blending))
+
+        scaled = next((layer for layer in layers if isinstance(layer, ScaledSegmenter)), None)
+        if scaled is not None:
+            current = scaled.inference_size or float("inf")
+            levels = [scaled.inference_size or None] + [size for size in self.config.inference_sizes if size < current]
+            knobs.append(Knob("inference_size", levels, lambda value: setattr(scaled, "inference_size", value)))
+
+        temporal = next((layer for layer in layers if isinstance(layer, TemporalSegmenter)), None)
+        if temporal is not None:
+            levels = [temporal.interval] + [interval for interval in self.config.intervals if interval > temporal.interval]
+            knobs.append(Knob("interval", levels, lambda value: setattr(temporal, "interval", value)))
+
+        if hasattr(backend, "conf"):
+            levels = [backend.conf] + [conf for conf in self.config.confidences if conf > backend.conf]
+            knobs.append(Knob("conf", levels, self._set_conf))
+
+        # Модель в процессах сегментации загружается при запуске процесса и не заменяется
+        if self.config.model_fallbacks and not isinstance(backend, ProcessSegmenter):
+            levels = ["configured"] + list(self.config.model_fallbacks)
+            knobs.append(Knob("model", levels, self._set_model))
+
+        self._backend = backend
+        self._models = {"configured": backend}
+        self._pending_model: str | None = None
+
+        # Резервные модели загружаются заранее в фоне: загрузка в момент снижения качества остановила бы обработку кадров
+        if any(knob.name == "model" for knob in knobs):
+            threading.Thread(
+                target=self._preload_models,
+                args=(list(self.config.model_fallbacks),),
+                name="governor-preload",
+                daemon=True,
+            ).start()
+
+        return [knob for knob in knobs if len(knob.levels) > 1]
+
+    @staticmethod
+    def _build_steps(knobs: list[Knob]) -> list[tuple[Knob, int]]:
+        """Чередует ступени параметров, чтобы качество снижалось равномерно по всем параметрам
+
+        :param list[Knob] knobs: Параметры качества
+        :return list[tuple[Knob, int]]: Параметр и индекс его значения на каждой ступени
+        """
+        steps = []
+        positions = {id(knob): 0 for knob in knobs}
+
+        while True:
+            progressed = False
+            for knob in knobs:
+                if positions[id(knob)] + 1 < len(knob.levels):
+                    positions[id(knob)] += 1
+                    steps.append((knob, positions[id(knob)]))
+                    progressed = True
+            if not progressed:
+                return steps
+
+    def _set_blending(self, value: tuple[str, int]) -> None:
+        self.background_processor.blending, self.background_processor.feather_radius = value
+
+    def _set_conf(self, value: float) -> None:
+        self._backend.conf = value
+        for model in self._models.values():
+            model.conf = value
+
+    def _preload_models(self, model_paths: list[str]) -> None:
+        """Загружает резервные модели в фоновом потоке
+
+        :param list[str] model_paths: Пути до весов резервных моделей
+        """
+        for model_path in model_paths:
+            logger.info("Загрузка резервной модели %s", model_path)
+            try:
+                self._models[model_path] = get_segmenter(self.segmenter.model)(model_path=model_path)
+            except Exception:
+                logger.exception("Не удалось загрузить резервную модель %s", model_path)
+
+    def _set_model(self, model_path: str) -> None:
+        """Заменяет модель в основании цепочки слоев сегментации
+
+        Если резервная модель еще загружается, переключение откладывается до ее загрузки,
+        а кадры продолжают обрабатываться текущей моделью.
+
+        :param str model_path: Путь до весов модели или 'configured' для исходной модели
+        """
+        self._pending_model = model_path
+        self._switch_model()
+
+    def _switch_model(self) -> None:
+        model = self._models.get(self._pending_model)
+        if model is None:
+            return
+
+        self._pending_model = None
+
+        if hasattr(model, "conf") and hasattr(self._backend, "conf"):
+            model.conf = self._backend.conf
+
+        layers = self.segmenter.layers()
+        if len(layers) == 1:
+            self.segmenter.segmenter = model
+        else:
+            layers[-2].segmentor = model
+
+        self._backend = model
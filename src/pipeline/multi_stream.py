@@ -0,0 +1,87 @@
+import copy
+import contextlib
+from dataclasses import replace
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.config import MultiStreamConfig
+from src.capture import CameraFrameCapture
+from src.modules import Segmenter, BackgroundProcessor
+
+
+class MultiStreamPipeline:
+
+    def __init__(self, config: MultiStreamConfig):
+        if not config.cameras:
+            raise ValueError("Не задано ни одного источника видео")
+
+        if config.segmenter.temporal is not None:
+            raise ValueError("Сегментация по ключевым кадрам хранит состояние одного потока и не поддерживается для нескольких источников")
+
+        if config.segmenter.roi is not None:
+            raise ValueError("Сегментация по области интереса хранит состояние одного потока и не поддерживается для нескольких источников")
+
+        backgrounds = config.backgrounds
+        if len(backgrounds) == 1:
+            # Эффекты хранят буферы и позицию воспроизведения, поэтому у каждого источника своя копия
+            backgrounds = [copy.deepcopy(backgrounds[0]) for _ in config.cameras]
+
+        if len(backgrounds) != len(config.cameras):
+            raise ValueError(
+                f"Количество параметров фона ({len(config.backgrounds)}) "
+                f"не совпадает с количеством источников ({len(config.cameras)})"
+            )
+
+        self.config = config
+        self.segmenter = Segmenter(**config.segmenter.asdict())
+        self.background_processors = [BackgroundProcessor(**background.asdict()) for background in backgrounds]
+
+        # Каждый источник читается в своем потоке, чтобы батч собирался из самых свежих кадров
+        self.captures = [CameraFrameCapture(replace(camera, threaded=True)) for camera in config.cameras]
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.composite_workers or len(config.cameras),
+            thread_name_prefix="multi-stream-composite",
+        )
+
+    def process(self, frames: Sequence[np.ndarray]) -> list[np.ndarray]:
+        """Сегментирует кадры всех источников одним батчем и накладывает фон каждого источника
+
+        :param Sequence[np.ndarray] frames: Кадры в порядке источников
+        :return list[np.ndarray]: Обработанные кадры в порядке источников
+        """
+        masks = self.segmenter.segment_batch(frames)
+
+        return list(self._executor.map(
+            lambda args: args[0].apply(args[1], args[2]),
+            zip(self.background_processors, frames, masks),
+        ))
+
+    def run(self) -> Iterator[list[np.ndarray]]:
+        """Читает кадры со всех источников и возвращает результаты по одному набору за итерацию
+
+        :return Iterator[list[np.ndarray]]: Обработанные кадры в порядке источников
+        """
+        with contextlib.ExitStack() as stack:
+            for capture in self.captures:
+                stack.enter_context(capture)
+
+            while True:
+                frames = [capture.read() for capture in self.captures]
+                yield self.process(frames)
+
+    def close(self) -> None:
+        """Закрывает источники видео и освобождает потоки наложения фона и процессы сегментации"""
+        for capture in self.captures:
+            capture.close()
+
+        self._executor.shutdown(wait=True)
+        self.segmenter.close()
+
+    def __enter__(self) -> "MultiStreamPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
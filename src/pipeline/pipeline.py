@@ -1,18 +1,101 @@
+import time
+from dataclasses import replace
+
 import numpy as np
 
-from src.config import PipelineConfig
+from src.config import PipelineConfig, TemporalConfig, SegmenterConfig
+from src.metrics import create_metrics
 from src.modules import Segmenter, BackgroundProcessor
 
+from .governor import QualityGovernor
+
 
 class FramePipeline:
 
     def __init__(self, config: PipelineConfig):
-        self.segmenter = Segmenter(**config.segmenter.asdict())
+        self.config = config
+
+        segmenter_config = config.segmenter
+        if config.target_fps:
+            segmenter_config = self._adaptive(segmenter_config)
+
+        self.segmenter = Segmenter(**segmenter_config.asdict())
         self.background_processor = BackgroundProcessor(**config.background.asdict())
+        self.metrics = create_metrics(config.metrics)
+
+        self.governor: QualityGovernor | None = None
+        if config.target_fps:
+            self.governor = QualityGovernor(
+                self.segmenter,
+                self.background_processor,
+                config.target_fps,
+                config.governor,
+                pipelined=config.pipelined,
+            )
 
     def process(self, frame: np.ndarray) -> np.ndarray:
+        self.metrics.increment("frames_in")
 
-        mask = self.segmenter.segment(frame)
+        with self.metrics.timer("process"):
+            mask = self.segment(frame)
 
-        out = self.background_processor.apply(frame, mask)
+            out = self.composite(frame, mask)
+
+        self.metrics.increment("frames_out")
         return out
+
+    def segment(self, frame: np.ndarray) -> np.ndarray:
+        """Выполняет этап сегментации кадра
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :return np.ndarray: Маска объектов (H, W)
+        """
+        with self.metrics.timer("segment"):
+            return self._observed("segment", self.segmenter.segment, frame)
+
+    def composite(self, frame: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Выполняет этап замены фона
+
+        :param np.ndarray frame: Входной кадр (H, W, 3)
+        :param np.ndarray mask: Маска объектов (H, W)
+        :return np.ndarray: Кадр с примененным эффектом для фона
+        """
+        with self.metrics.timer("composite"):
+            return self._observed("composite", self.background_processor.apply, frame, mask)
+
+    def close(self) -> None:
+        """Останавливает процессы сегментации и выгрузку метрик, отправляя приемникам последний снимок"""
+        self.segmenter.close()
+        self.metrics.stop_reporting()
+
+    def _observed(self, stage: str, fn, *args) -> np.ndarray:
+        """Выполняет этап, передавая его длительность регулятору качества
+
+        :param str stage: Название этапа
+        :param fn: Функция этапа
+        :return np.ndarray: Результат этапа
+        """
+        if self.governor is None:
+            return fn(*args)
+
+        start = time.perf_counter()
+        result = fn(*args)
+        self.governor.observe(stage, time.perf_counter() - start)
+
+        return result
+
+    @staticmethod
+    def _adaptive(config: SegmenterConfig) -> SegmenterConfig:
+        """Добавляет слои сегментации, параметры которых меняет регулятор качества
+
+        Слои создаются с исходным качеством: уменьшение кадра отключено, а ключевым
+        является каждый кадр, пока регулятор не увеличит интервал.
+
+        :param SegmenterConfig config: Параметры сегментации
+        :return SegmenterConfig: Параметры с обязательными слоями уменьшения кадра и ключевых кадров
+        """
+        return replace(
+            config,
+            inference_size=config.inference_size or 0,
+            temporal=config.temporal or TemporalConfig(policy='interval', interval=1),
+        )
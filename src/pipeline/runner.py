@@ -0,0 +1,244 @@
+import queue
+import threading
+from typing import Any, Literal
+from collections.abc import Callable, Iterable, Iterator
+
+import numpy as np
+
+from src.metrics import Metrics, NullMetrics
+
+from .pipeline import FramePipeline
+
+DropPolicy = Literal['block', 'drop_oldest', 'drop_newest']
+
+_END = object()
+
+
+class _Failure:
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class StageQueue:
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        policy: DropPolicy,
+        stop_event: threading.Event,
+        metrics: Metrics | None = None,
+    ):
+        self.name = name
+        self.policy = policy
+        self.dropped: int = 0
+        self.metrics = metrics or NullMetrics()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._stop_event = stop_event
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, item: Any) -> None:
+        """Помещает элемент в очередь с учетом политики переполнения
+
+        :param Any item: Пара (номер кадра, данные) или служебный маркер
+        """
+        if self.policy == 'block' or item is _END or isinstance(item, _Failure):
+            self._put_blocking(item)
+            return
+
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                if self.policy == 'drop_newest':
+                    self._record_drop()
+                    return
+
+            try:
+                self._queue.get_nowait()
+                self._record_drop()
+            except queue.Empty:
+                pass
+
+    def get(self) -> Any:
+        """Извлекает элемент из очереди, периодически проверяя флаг остановки
+
+        :return Any: Элемент очереди или маркер завершения при остановке
+        """
+        while not self._stop_event.is_set():
+            try:
+                return self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+        return _END
+
+    def drain(self) -> None:
+        """Очищает очередь, освобождая заблокированных производителей"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _record_drop(self) -> None:
+        self.dropped += 1
+        self.metrics.increment("frames_dropped")
+
+    def _put_blocking(self, item: Any) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+class PipelinedRunner:
+
+    def __init__(
+        self,
+        pipeline: FramePipeline,
+        queue_size: int | None = None,
+        drop_policy: DropPolicy | None = None,
+        postprocess: Callable[[np.ndarray], np.ndarray] | None = None,
+    ):
+        self.pipeline = pipeline
+        self.queue_size = queue_size or pipeline.config.queue_size
+        self.drop_policy = drop_policy or pipeline.config.drop_policy
+        self.postprocess = postprocess
+
+        # Выход этапа композиции живет в очереди, у потребителя и в момент записи следующего кадра
+        self.pipeline.background_processor.reserve_buffers(self.queue_size + 2)
+
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._queues: list[StageQueue] = []
+
+    def queue_depths(self) -> dict[str, int]:
+        """Возвращает текущее количество кадров во входной очереди каждого этапа
+
+        :return dict[str, int]: Глубина очереди по названию этапа
+        """
+        return {q.name: q.qsize() for q in self._queues}
+
+    def dropped_frames(self) -> dict[str, int]:
+        """Возвращает количество кадров, выброшенных на входе каждого этапа
+
+        :return dict[str, int]: Количество выброшенных кадров по названию этапа
+        """
+        return {q.name: q.dropped for q in self._queues}
+
+    def run(self, frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """Запускает этапы конвейера в отдельных потоках и возвращает результаты по порядку
+
+        :param Iterable[np.ndarray] frames: Источник входных кадров
+        :raises BaseException: Исключение, возникшее на любом из этапов
+        :return Iterator[np.ndarray]: Обработанные кадры в порядке поступления
+        """
+        stages: list[tuple[str, Callable[[Any], Any]]] = [
+            ("segment", lambda frame: (frame, self.pipeline.segment(frame))),
+            ("composite", lambda item: self.pipeline.composite(*item)),
+        ]
+        if self.postprocess is not None:
+            stages.append(("postprocess", self._postprocess))
+
+        metrics = self.pipeline.metrics
+
+        self._stop_event.clear()
+        self._queues = [
+            StageQueue(name, self.queue_size, self.drop_policy, self._stop_event, metrics)
+            for name in [name for name, _ in stages] + ["output"]
+        ]
+
+        self._threads = [
+            threading.Thread(
+                target=self._capture_worker,
+                args=(frames, self._queues[0]),
+                name="pipeline-capture",
+                daemon=True,
+            )
+        ]
+        for (name, fn), in_queue, out_queue in zip(stages, self._queues, self._queues[1:]):
+            self._threads.append(
+                threading.Thread(
+                    target=self._stage_worker,
+                    args=(fn, in_queue, out_queue),
+                    name=f"pipeline-{name}",
+                    daemon=True,
+                )
+            )
+
+        for thread in self._threads:
+            thread.start()
+
+        try:
+            while True:
+                item = self._queues[-1].get()
+
+                if item is _END:
+                    return
+                if isinstance(item, _Failure):
+                    raise item.error
+
+                _, result = item
+                metrics.increment("frames_out")
+                yield result
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Останавливает все потоки конвейера"""
+        self._stop_event.set()
+
+        for q in self._queues:
+            q.drain()
+
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+
+        self._threads = []
+
+    def _postprocess(self, frame: np.ndarray) -> np.ndarray:
+        with self.pipeline.metrics.timer("postprocess"):
+            return self.postprocess(frame)
+
+    def _capture_worker(self, frames: Iterable[np.ndarray], out_queue: StageQueue) -> None:
+        metrics = self.pipeline.metrics
+
+        try:
+            for seq, frame in enumerate(metrics.timed_iter(frames, "capture")):
+                if self._stop_event.is_set():
+                    return
+                metrics.increment("frames_in")
+                out_queue.put((seq, frame))
+        except BaseException as e:
+            out_queue.put(_Failure(e))
+            return
+
+        out_queue.put(_END)
+
+    def _stage_worker(self, fn: Callable[[Any], Any], in_queue: StageQueue, out_queue: StageQueue) -> None:
+        while True:
+            item = in_queue.get()
+
+            if item is _END or isinstance(item, _Failure):
+                out_queue.put(item)
+                return
+
+            in_queue.metrics.set_gauge(f"queue_depth_{in_queue.name}", in_queue.qsize())
+
+            seq, payload = item
+            try:
+                result = fn(payload)
+            except BaseException as e:
+                out_queue.put(_Failure(e))
+                return
+
+            out_queue.put((seq, result))
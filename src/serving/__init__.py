@@ -0,0 +1,10 @@
+from .batcher import MicroBatcher, QueueFullError
+from .service import InferenceService, encode_mask, decode_image
+
+__all__ = [
+    'InferenceService',
+    'MicroBatcher',
+    'QueueFullError',
+    'decode_image',
+    'encode_mask',
+]
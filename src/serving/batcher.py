@@ -0,0 +1,140 @@
+import time
+import asyncio
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.metrics import Metrics, NullMetrics
+
+
+class QueueFullError(Exception):
+    """Очередь запросов переполнена"""
+
+
+class MicroBatcher:
+
+    # Запросы, пришедшие в течение window_ms после первого, объединяются в один вызов модели;
+    # пока модель занята, новые запросы копятся в очереди и попадают в следующий батч
+    def __init__(
+        self,
+        segment_batch: Callable[[Sequence[np.ndarray]], list[np.ndarray]],
+        max_batch: int = 8,
+        window_ms: float = 5.0,
+        max_queue: int = 64,
+        metrics: Metrics | None = None,
+    ):
+        self.segment_batch = segment_batch
+        self.max_batch = max(1, max_batch)
+        self.window_ms = window_ms
+        self.max_queue = max_queue
+        self.metrics = metrics or NullMetrics()
+
+        # Корзина на каждый возможный размер батча, чтобы гистограмма давала точное распределение
+        self.metrics.register_histogram("batch_size", tuple(range(1, self.max_batch + 1)))
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+        # Модель вызывается в одном потоке, чтобы цикл событий продолжал принимать запросы
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serving-inference")
+
+    @property
+    def depth(self) -> int:
+        """Количество запросов, ожидающих попадания в батч"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Запускает сборку батчей в текущем цикле событий"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, image: np.ndarray) -> np.ndarray:
+        """Ставит изображение в очередь и ожидает его маску
+
+        :param np.ndarray image: Изображение (H, W, 3) в формате RGB
+        :return np.ndarray: Маска (H, W)
+        :raises QueueFullError: Если в очереди уже max_queue запросов
+        """
+        if self._queue.qsize() >= self.max_queue:
+            self.metrics.increment("requests_rejected")
+            raise QueueFullError(f"В очереди уже {self.max_queue} запросов")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((image, future, time.perf_counter()))
+        self.metrics.set_gauge("queue_depth", self._queue.qsize())
+
+        return await future
+
+    async def close(self) -> None:
+        """Останавливает сборку батчей и отменяет ожидающие запросы"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+
+        self._executor.shutdown(wait=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window_ms / 1000
+
+            while len(batch) < self.max_batch:
+                # Запросы, накопившиеся во время предыдущего батча, забираются без ожидания
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            self.metrics.set_gauge("queue_depth", self._queue.qsize())
+            await self._infer(batch)
+
+    async def _infer(self, batch: list[tuple[np.ndarray, asyncio.Future, float]]) -> None:
+        """Сегментирует батч одним вызовом модели и возвращает маски ожидающим запросам
+
+        :param list batch: Изображение, ожидающий результата future и время постановки в очередь
+        """
+        # Запросы, клиенты которых уже отключились, в модель не передаются
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            self.metrics.observe("queue_wait", (started - enqueued) * 1000)
+
+        images = [image for image, _, _ in batch]
+        try:
+            masks = await asyncio.get_running_loop().run_in_executor(self._executor, self.segment_batch, images)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        finished = time.perf_counter()
+        self.metrics.observe("inference", (finished - started) * 1000)
+        self.metrics.record("batch_size", len(batch))
+        self.metrics.increment("batches")
+
+        for (_, future, enqueued), mask in zip(batch, masks):
+            self.metrics.observe("request", (finished - enqueued) * 1000)
+            if not future.done():
+                future.set_result(mask)
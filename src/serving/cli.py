@@ -0,0 +1,53 @@
+import time
+import logging
+import argparse
+
+from src.config import ServingConfig, SegmenterConfig
+from src.config.path import DEFAULT_MODEL_PATHS
+
+from .service import InferenceService
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Локальный HTTP-сервис сегментации с объединением запросов в батчи")
+
+    parser.add_argument('--model', type=str, default='yolo', choices=['yolo', 'yolo_onnx', 'mediapipe'], help='Бэкенд сегментации')
+    parser.add_argument('--model_path', type=str, default=None, help='Путь до модели сегментации')
+    parser.add_argument('--inference_size', type=int, default=None, help='Размер большей стороны изображения для инференса')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Адрес сервиса')
+    parser.add_argument('--port', type=int, default=8090, help='Порт сервиса')
+    parser.add_argument('--max_batch', type=int, default=8, help='Максимальный размер батча')
+    parser.add_argument('--batch_window_ms', type=float, default=5.0, help='Окно сбора батча после первого запроса, мс')
+    parser.add_argument('--max_queue', type=int, default=64, help='Максимальное количество ожидающих запросов')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    config = ServingConfig(
+        segmenter=SegmenterConfig(
+            model=args.model,
+            model_path=args.model_path or str(DEFAULT_MODEL_PATHS[args.model]),
+            inference_size=args.inference_size,
+            warmup=True,
+        ),
+        host=args.host,
+        port=args.port,
+        max_batch=args.max_batch,
+        batch_window_ms=args.batch_window_ms,
+        max_queue=args.max_queue,
+    )
+
+    service = InferenceService(config)
+    service.start()
+
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
@@ -0,0 +1,270 @@
+import json
+import math
+import asyncio
+import logging
+import threading
+from http import HTTPStatus
+
+import cv2
+import numpy as np
+
+from src.config import ServingConfig
+from src.metrics import Metrics, render_prometheus
+from src.modules import Segmenter
+from src.streaming.protocol import HTTPRequest, ProtocolError, read_body, read_request
+from src.streaming.protocol import send_response
+
+from .batcher import MicroBatcher, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+# Сырое изображение передается как байты (H, W, 3) RGB, размер задается заголовками
+RAW_CONTENT_TYPE = "application/octet-stream"
+
+
+class InferenceService:
+
+    def __init__(self, config: ServingConfig):
+        if config.segmenter.temporal is not None or config.segmenter.roi is not None:
+            raise ValueError("Сегментация с состоянием потока не поддерживается для независимых запросов")
+
+        self.config = config
+        self.metrics = Metrics()
+
+        self.segmenter = Segmenter(**config.segmenter.asdict())
+        self.batcher = MicroBatcher(
+            self.segmenter.segment_batch,
+            max_batch=config.max_batch,
+            window_ms=config.batch_window_ms,
+            max_queue=config.max_queue,
+            metrics=self.metrics,
+        )
+
+        self.host = config.host
+        self.port = config.port
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped: asyncio.Event | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        """Запускает сервис в отдельном потоке с собственным циклом событий
+
+        :raises OSError: Если не удалось занять адрес сервиса
+        """
+        started = threading.Event()
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            try:
+                asyncio.run(self._serve(started))
+            except BaseException as e:
+                errors.append(e)
+                started.set()
+
+        self._thread = threading.Thread(target=run, name="serving", daemon=True)
+        self._thread.start()
+        started.wait()
+
+        if errors:
+            raise errors[0]
+
+        logger.info(
+            "Сервис сегментации доступен по адресу %s (батч до %d, окно %.1f мс)",
+            self.url,
+            self.config.max_batch,
+            self.config.batch_window_ms,
+        )
+
+    def stop(self) -> None:
+        """Останавливает сервис и освобождает модель"""
+        if self._loop is not None and self._stopped is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass
+
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+
+        self.segmenter.close()
+
+    def stats(self) -> dict:
+        """Возвращает глубину очереди, распределение размеров батчей и перцентили латентности
+
+        :return dict: Сводка метрик сервиса
+        """
+        snapshot = self.metrics.snapshot()
+
+        # Границы корзин гистограммы размеров батча — сами размеры, поэтому разность
+        # накопленных количеств соседних корзин дает число батчей каждого размера
+        batch_sizes = {}
+        previous = 0
+        for bound, cumulative in snapshot["histograms"].get("batch_size", {"buckets": []})["buckets"]:
+            if cumulative > previous and not math.isinf(bound):
+                batch_sizes[int(bound)] = cumulative - previous
+            previous = cumulative
+
+        latency = {
+            stage: {key: value for key, value in stats.items() if key != "buckets"}
+            for stage, stats in snapshot["stages"].items()
+        }
+
+        return {
+            "queue_depth": self.batcher.depth,
+            "requests": snapshot["counters"].get("requests", 0),
+            "requests_rejected": snapshot["counters"].get("requests_rejected", 0),
+            "batches": snapshot["counters"].get("batches", 0),
+            "batch_sizes": batch_sizes,
+            "latency": latency,
+        }
+
+    async def _serve(self, started: threading.Event) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+
+        self.batcher.start()
+        started.set()
+
+        async with server:
+            await self._stopped.wait()
+            server.close()
+
+            # Постоянные соединения закрываются, чтобы их обработчики завершились до остановки цикла
+            for writer in list(self._connections):
+                writer.close()
+            while self._connections:
+                await asyncio.sleep(0.01)
+
+        await self.batcher.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+
+                await self._route(request, reader, writer)
+
+                if not request.keep_alive:
+                    break
+
+        except ProtocolError as e:
+            await send_response(writer, HTTPStatus.BAD_REQUEST, str(e).encode())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _route(self, request: HTTPRequest, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обрабатывает запрос
+
+        :param HTTPRequest request: Запрос
+        :param asyncio.StreamReader reader: Поток чтения соединения
+        :param asyncio.StreamWriter writer: Поток записи соединения
+        """
+        if request.method == "GET" and request.path == "/health":
+            await send_response(writer, HTTPStatus.OK, b"ok")
+            return
+
+        if request.method == "GET" and request.path == "/stats":
+            await send_response(writer, HTTPStatus.OK, json.dumps(self.stats()).encode(), "application/json")
+            return
+
+        if request.method == "GET" and request.path == "/metrics":
+            self.metrics.set_gauge("queue_depth", self.batcher.depth)
+            body = render_prometheus(self.metrics.snapshot(), prefix="serving").encode()
+            await send_response(writer, HTTPStatus.OK, body, "text/plain; version=0.0.4; charset=utf-8")
+            return
+
+        if request.path != "/segment":
+            await send_response(writer, HTTPStatus.NOT_FOUND, "Не найдено".encode())
+            return
+
+        if request.method != "POST":
+            await send_response(writer, HTTPStatus.METHOD_NOT_ALLOWED, "Ожидается POST".encode())
+            return
+
+        body = await read_body(reader, request, self.config.max_body_mb << 20)
+        self.metrics.increment("requests")
+
+        try:
+            image = decode_image(request, body)
+        except ValueError as e:
+            await send_response(writer, HTTPStatus.BAD_REQUEST, str(e).encode())
+            return
+
+        try:
+            mask = await self.batcher.submit(image)
+        except QueueFullError as e:
+            await send_response(writer, HTTPStatus.SERVICE_UNAVAILABLE, str(e).encode(), headers={"Retry-After": "1"})
+            return
+        except Exception as e:
+            logger.exception("Ошибка сегментации")
+            await send_response(writer, HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}".encode())
+            return
+
+        content_type, payload = encode_mask(request, mask)
+        headers = {"X-Width": str(mask.shape[1]), "X-Height": str(mask.shape[0])}
+        await send_response(writer, HTTPStatus.OK, payload, content_type, headers)
+
+
+def decode_image(request: HTTPRequest, body: bytes) -> np.ndarray:
+    """Декодирует изображение из тела запроса
+
+    Сырое изображение передается с типом application/octet-stream и заголовками
+    X-Width и X-Height; остальные типы декодируются OpenCV (PNG, JPEG).
+
+    :param HTTPRequest request: Запрос
+    :param bytes body: Тело запроса
+    :return np.ndarray: Изображение (H, W, 3) в формате RGB
+    :raises ValueError: Если изображение не удалось декодировать
+    """
+    content_type = request.headers.get("content-type", RAW_CONTENT_TYPE).split(";")[0].strip()
+
+    if content_type == RAW_CONTENT_TYPE:
+        try:
+            width, height = int(request.headers["x-width"]), int(request.headers["x-height"])
+        except (KeyError, ValueError) as e:
+            raise ValueError("Для сырого изображения нужны заголовки X-Width и X-Height") from e
+
+        if len(body) != width * height * 3:
+            raise ValueError(f"Размер тела {len(body)} не совпадает с изображением {width}x{height}x3")
+
+        return np.frombuffer(body, dtype=np.uint8).reshape(height, width, 3)
+
+    image = cv2.imdecode(np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError(f"Не удалось декодировать изображение типа {content_type}")
+
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def encode_mask(request: HTTPRequest, mask: np.ndarray) -> tuple[str, bytes]:
+    """Кодирует маску в формате запроса: PNG для сжатых изображений, иначе сырые байты (H, W)
+
+    :param HTTPRequest request: Запрос
+    :param np.ndarray mask: Маска (H, W)
+    :return tuple[str, bytes]: Тип содержимого и тело ответа
+    """
+    accept = request.headers.get("accept", "")
+    content_type = request.headers.get("content-type", RAW_CONTENT_TYPE)
+
+    if "image/png" in accept or (not content_type.startswith(RAW_CONTENT_TYPE) and RAW_CONTENT_TYPE not in accept):
+        ok, png = cv2.imencode(".png", mask)
+        if ok:
+            return "image/png", png.tobytes()
+
+    return RAW_CONTENT_TYPE, np.ascontiguousarray(mask, dtype=np.uint8).tobytes()
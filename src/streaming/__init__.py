@@ -0,0 +1,7 @@
+from .server import StreamServer
+from .broadcaster import FrameBroadcaster
+
+__all__ = [
+    'StreamServer',
+    'FrameBroadcaster',
+]
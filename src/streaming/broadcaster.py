@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import threading
+import contextlib
+from collections.abc import Iterator
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FrameBroadcaster:
+
+    # Кадры конвейера кодируются в JPEG один раз в отдельном потоке и раздаются всем клиентам;
+    # клиент всегда получает самый свежий кадр, а кадры, вышедшие, пока он был занят, пропускаются
+    def __init__(self, jpeg_quality: int = 80):
+        self.jpeg_quality = jpeg_quality
+
+        self.published: int = 0
+        self.encoded: int = 0
+        self.clients: int = 0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._next: asyncio.Future | None = None
+        self._latest: tuple[int, bytes] | None = None
+
+        self._pending: np.ndarray | None = None
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def latest(self) -> tuple[int, bytes] | None:
+        """Номер и JPEG последнего закодированного кадра"""
+        return self._latest
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "stream_clients": self.clients,
+            "stream_frames_published": self.published,
+            "stream_frames_encoded": self.encoded,
+        }
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Запускает поток кодирования, раздающий кадры в цикле событий сервера
+
+        :param asyncio.AbstractEventLoop loop: Цикл событий, в котором работают клиенты
+        """
+        self._loop = loop
+        self._next = loop.create_future()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._encode_loop, name="stream-encoder", daemon=True)
+        self._thread.start()
+
+    def publish(self, frame: np.ndarray) -> None:
+        """Передает кадр на раздачу, не дожидаясь кодирования
+
+        Если предыдущий кадр еще не закодирован, он заменяется новым. Без подключенных
+        клиентов кадр не копируется и не кодируется.
+
+        :param np.ndarray frame: Кадр (H, W, 3) в формате BGR
+        """
+        self.published += 1
+        if not self.clients:
+            return
+
+        # Копия нужна, потому что конвейер может переиспользовать буфер выходного кадра
+        with self._condition:
+            self._pending = frame.copy()
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def subscribe(self) -> Iterator[None]:
+        """Учитывает клиента на время его подключения: кадры кодируются, только пока есть клиенты"""
+        self.clients += 1
+        try:
+            yield
+        finally:
+            self.clients -= 1
+
+    async def frames(self, after: int = 0) -> tuple[int, bytes]:
+        """Ожидает кадр новее заданного
+
+        :param int after: Номер последнего полученного клиентом кадра
+        :return tuple[int, bytes]: Номер кадра и JPEG
+        """
+        while self._latest is None or self._latest[0] <= after:
+            await asyncio.shield(self._next)
+
+        return self._latest
+
+    def close(self) -> None:
+        """Останавливает поток кодирования"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _encode_loop(self) -> None:
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality]
+
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+
+                if self._closed:
+                    return
+
+                frame, self._pending = self._pending, None
+
+            ok, jpeg = cv2.imencode(".jpg", frame, params)
+            if not ok:
+                logger.warning("Не удалось закодировать кадр %dx%d в JPEG", frame.shape[1], frame.shape[0])
+                continue
+
+            self.encoded += 1
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, jpeg.tobytes())
+            except RuntimeError:
+                # Цикл событий уже закрыт
+                return
+
+    def _deliver(self, jpeg: bytes) -> None:
+        """Сохраняет закодированный кадр и будит ожидающих клиентов; вызывается в цикле событий
+
+        :param bytes jpeg: Закодированный кадр
+        """
+        seq = self._latest[0] + 1 if self._latest is not None else 1
+        self._latest = seq, jpeg
+
+        waiters, self._next = self._next, self._loop.create_future()
+        waiters.set_result(None)
@@ -0,0 +1,215 @@
+import base64
+import struct
+import asyncio
+import hashlib
+from http import HTTPStatus
+from dataclasses import field, dataclass
+from urllib.parse import parse_qs, urlsplit
+
+# Ограничения на заголовки запроса, чтобы клиент не мог занять память сервера
+MAX_HEADER_LINES = 100
+MAX_LINE_BYTES = 8192
+
+_WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+WS_TEXT = 0x1
+WS_BINARY = 0x2
+WS_CLOSE = 0x8
+WS_PING = 0x9
+WS_PONG = 0xA
+
+
+class ProtocolError(Exception):
+    """Некорректный HTTP-запрос или кадр WebSocket"""
+
+
+@dataclass
+class HTTPRequest:
+    """HTTP-запрос без тела.
+
+    :param str method: Метод запроса
+    :param str path: Путь без параметров
+    :param dict[str, list[str]] query: Параметры строки запроса
+    :param dict[str, str] headers: Заголовки с названиями в нижнем регистре
+    """
+    method: str
+    path: str
+    query: dict[str, list[str]] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def content_length(self) -> int:
+        return int(self.headers.get("content-length", 0) or 0)
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+    @property
+    def is_websocket(self) -> bool:
+        return (
+            self.headers.get("upgrade", "").lower() == "websocket"
+            and "upgrade" in self.headers.get("connection", "").lower()
+        )
+
+
+async def read_request(reader: asyncio.StreamReader) -> HTTPRequest | None:
+    """Читает строку запроса и заголовки
+
+    :param asyncio.StreamReader reader: Поток чтения соединения
+    :return HTTPRequest | None: Запрос или None, если клиент закрыл соединение
+    :raises ProtocolError: Если запрос не соответствует HTTP/1.1
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+
+    if len(line) > MAX_LINE_BYTES:
+        raise ProtocolError("Слишком длинная строка запроса")
+
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError as e:
+        raise ProtocolError(f"Некорректная строка запроса: {line!r}") from e
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+        if len(line) > MAX_LINE_BYTES:
+            raise ProtocolError("Слишком длинный заголовок")
+
+        name, sep, value = line.decode("latin-1").partition(":")
+        if not sep:
+            raise ProtocolError(f"Некорректный заголовок: {line!r}")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ProtocolError("Слишком много заголовков")
+
+    url = urlsplit(target)
+    return HTTPRequest(method.upper(), url.path, parse_qs(url.query), headers)
+
+
+async def read_body(reader: asyncio.StreamReader, request: HTTPRequest, limit: int) -> bytes:
+    """Читает тело запроса по заголовку Content-Length
+
+    :param asyncio.StreamReader reader: Поток чтения соединения
+    :param HTTPRequest request: Запрос
+    :param int limit: Максимальный размер тела, байт
+    :return bytes: Тело запроса
+    :raises ProtocolError: Если тело больше limit
+    """
+    length = request.content_length
+    if length > limit:
+        raise ProtocolError(f"Тело запроса больше {limit} байт")
+
+    return await reader.readexactly(length) if length else b""
+
+
+def response_head(
+    status: HTTPStatus | int,
+    headers: dict[str, str] | None = None,
+    content_length: int | None = None,
+) -> bytes:
+    """Формирует строку статуса и заголовки ответа
+
+    :param HTTPStatus | int status: Код ответа
+    :param dict[str, str] | None headers: Дополнительные заголовки
+    :param int | None content_length: Размер тела; None — заголовок не добавляется
+    :return bytes: Начало ответа, заканчивающееся пустой строкой
+    """
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+
+    for name, value in (headers or {}).items():
+        lines.append(f"{name}: {value}")
+
+    if content_length is not None:
+        lines.append(f"Content-Length: {content_length}")
+
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_response(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus | int,
+    body: bytes = b"",
+    content_type: str = "text/plain; charset=utf-8",
+    headers: dict[str, str] | None = None,
+) -> None:
+    """Отправляет ответ с телом известного размера
+
+    :param asyncio.StreamWriter writer: Поток записи соединения
+    :param HTTPStatus | int status: Код ответа
+    :param bytes body: Тело ответа
+    :param str content_type: Тип содержимого
+    :param dict[str, str] | None headers: Дополнительные заголовки
+    """
+    headers = {"Content-Type": content_type, **(headers or {})}
+    writer.write(response_head(status, headers, len(body)) + body)
+    await writer.drain()
+
+
+def websocket_accept(request: HTTPRequest) -> bytes:
+    """Формирует ответ на запрос перехода на протокол WebSocket
+
+    :param HTTPRequest request: Запрос с заголовком Upgrade: websocket
+    :return bytes: Ответ 101 Switching Protocols
+    :raises ProtocolError: Если в запросе нет ключа Sec-WebSocket-Key
+    """
+    key = request.headers.get("sec-websocket-key")
+    if not key:
+        raise ProtocolError("В запросе нет заголовка Sec-WebSocket-Key")
+
+    accept = base64.b64encode(hashlib.sha1((key + _WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+
+    return response_head(
+        HTTPStatus.SWITCHING_PROTOCOLS,
+        {"Upgrade": "websocket", "Connection": "Upgrade", "Sec-WebSocket-Accept": accept},
+    )
+
+
+def websocket_frame(payload: bytes, opcode: int = WS_BINARY) -> bytes:
+    """Формирует заголовок кадра WebSocket от сервера; данные сервер не маскирует
+
+    :param bytes payload: Данные кадра
+    :param int opcode: Тип кадра
+    :return bytes: Заголовок кадра; данные отправляются следом без копирования
+    """
+    length = len(payload)
+
+    if length < 126:
+        return struct.pack("!BB", 0x80 | opcode, length)
+    if length < 1 << 16:
+        return struct.pack("!BBH", 0x80 | opcode, 126, length)
+    return struct.pack("!BBQ", 0x80 | opcode, 127, length)
+
+
+async def read_websocket_frame(reader: asyncio.StreamReader, limit: int = 1 << 20) -> tuple[int, bytes]:
+    """Читает кадр WebSocket от клиента и снимает маску
+
+    :param asyncio.StreamReader reader: Поток чтения соединения
+    :param int limit: Максимальный размер данных кадра, байт
+    :return tuple[int, bytes]: Тип кадра и данные
+    :raises ProtocolError: Если кадр больше limit
+    """
+    first, second = await reader.readexactly(2)
+    opcode, masked, length = first & 0x0F, second & 0x80, second & 0x7F
+
+    if length == 126:
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", await reader.readexactly(8))
+
+    if length > limit:
+        raise ProtocolError(f"Кадр WebSocket больше {limit} байт")
+
+    mask = await reader.readexactly(4) if masked else b""
+    payload = await reader.readexactly(length)
+
+    if masked:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+    return opcode, payload
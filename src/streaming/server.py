@@ -0,0 +1,258 @@
+import json
+import asyncio
+import logging
+import threading
+from http import HTTPStatus
+
+import numpy as np
+
+from .protocol import WS_PING, WS_PONG, WS_CLOSE, HTTPRequest, ProtocolError
+from .protocol import read_request, response_head, send_response, websocket_frame
+from .protocol import websocket_accept, read_websocket_frame
+from .broadcaster import FrameBroadcaster
+
+logger = logging.getLogger(__name__)
+
+_BOUNDARY = "frame"
+
+_INDEX_PAGE = """<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>Video stream</title></head>
+<body style="margin:0;background:#000;display:flex;justify-content:center;align-items:center;height:100vh">
+<img src="/stream.mjpg" style="max-width:100%;max-height:100%">
+</body>
+</html>
+"""
+
+
+class StreamServer:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        jpeg_quality: int = 80,
+        max_clients: int = 32,
+        write_timeout: float = 10.0,
+    ):
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+        self.write_timeout = write_timeout
+
+        self.broadcaster = FrameBroadcaster(jpeg_quality)
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped: asyncio.Event | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def stats(self) -> dict[str, int]:
+        return self.broadcaster.stats()
+
+    def start(self) -> None:
+        """Запускает сервер в отдельном потоке с собственным циклом событий
+
+        :raises OSError: Если не удалось занять адрес сервера
+        """
+        started = threading.Event()
+        errors: list[BaseException] = []
+
+        def run() -> None:
+            try:
+                asyncio.run(self._serve(started))
+            except BaseException as e:
+                errors.append(e)
+                started.set()
+
+        self._thread = threading.Thread(target=run, name="stream-server", daemon=True)
+        self._thread.start()
+        started.wait()
+
+        if errors:
+            raise errors[0]
+
+        logger.info("Трансляция доступна по адресу %s (MJPEG: /stream.mjpg, WebSocket: /ws)", self.url)
+
+    def publish(self, frame: np.ndarray) -> None:
+        """Передает обработанный кадр клиентам трансляции без ожидания отправки
+
+        :param np.ndarray frame: Кадр (H, W, 3) в формате BGR
+        """
+        self.broadcaster.publish(frame)
+
+    def stop(self) -> None:
+        """Отключает клиентов и останавливает сервер"""
+        if self._loop is not None and self._stopped is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._stopped.set)
+            except RuntimeError:
+                pass
+
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+        self.broadcaster.close()
+
+    async def _serve(self, started: threading.Event) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+        self.broadcaster.start(self._loop)
+        started.set()
+
+        async with self._server:
+            await self._stopped.wait()
+
+            self._server.close()
+            # Клиенты трансляции не завершаются сами, поэтому их задачи отменяются
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+
+                if request.method != "GET":
+                    await send_response(writer, HTTPStatus.METHOD_NOT_ALLOWED, "Поддерживается только GET".encode())
+                    break
+
+                if not await self._route(request, reader, writer) or not request.keep_alive:
+                    break
+
+        except ProtocolError as e:
+            await send_response(writer, HTTPStatus.BAD_REQUEST, str(e).encode())
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        except asyncio.CancelledError:
+            # Задачи клиентов отменяются при остановке сервера; соединение закрывается ниже
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, request: HTTPRequest, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Обрабатывает запрос
+
+        :param HTTPRequest request: Запрос
+        :param asyncio.StreamReader reader: Поток чтения соединения
+        :param asyncio.StreamWriter writer: Поток записи соединения
+        :return bool: Можно ли использовать соединение для следующего запроса
+        """
+        if request.path == "/":
+            await send_response(writer, HTTPStatus.OK, _INDEX_PAGE.encode(), "text/html; charset=utf-8")
+            return True
+
+        if request.path == "/stats":
+            await send_response(writer, HTTPStatus.OK, json.dumps(self.stats()).encode(), "application/json")
+            return True
+
+        if request.path not in ("/stream.mjpg", "/snapshot.jpg", "/ws"):
+            await send_response(writer, HTTPStatus.NOT_FOUND, "Не найдено".encode())
+            return True
+
+        if self.broadcaster.clients >= self.max_clients:
+            await send_response(writer, HTTPStatus.SERVICE_UNAVAILABLE, "Слишком много клиентов".encode())
+            return False
+
+        with self.broadcaster.subscribe():
+            if request.path == "/snapshot.jpg":
+                _, jpeg = await asyncio.wait_for(self.broadcaster.frames(), self.write_timeout)
+                await send_response(writer, HTTPStatus.OK, jpeg, "image/jpeg", {"Access-Control-Allow-Origin": "*"})
+                return True
+
+            if request.path == "/ws":
+                await self._stream_websocket(request, reader, writer)
+            else:
+                await self._stream_mjpeg(writer)
+
+        return False
+
+    async def _stream_mjpeg(self, writer: asyncio.StreamWriter) -> None:
+        """Отправляет кадры частями multipart/x-mixed-replace, пока клиент не отключится
+
+        :param asyncio.StreamWriter writer: Поток записи соединения
+        """
+        writer.write(response_head(HTTPStatus.OK, {
+            "Content-Type": f"multipart/x-mixed-replace; boundary={_BOUNDARY}",
+            "Cache-Control": "no-cache, no-store",
+            "Access-Control-Allow-Origin": "*",
+            "Connection": "close",
+        }))
+
+        seq = 0
+        while True:
+            seq, jpeg = await self.broadcaster.frames(seq)
+
+            writer.write(f"--{_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode())
+            writer.write(jpeg)
+            writer.write(b"\r\n")
+
+            # Пока клиент принимает кадр, новые кадры не накапливаются: следующим будет отправлен самый свежий
+            await asyncio.wait_for(writer.drain(), self.write_timeout)
+
+    async def _stream_websocket(
+        self,
+        request: HTTPRequest,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Отправляет кадры бинарными сообщениями WebSocket, пока клиент не закроет соединение
+
+        :param HTTPRequest request: Запрос на переход на протокол WebSocket
+        :param asyncio.StreamReader reader: Поток чтения соединения
+        :param asyncio.StreamWriter writer: Поток записи соединения
+        """
+        if not request.is_websocket:
+            await send_response(writer, HTTPStatus.BAD_REQUEST, "Ожидается запрос Upgrade: websocket".encode())
+            return
+
+        writer.write(websocket_accept(request))
+        closed = asyncio.ensure_future(self._read_websocket(reader, writer))
+
+        try:
+            seq = 0
+            while not closed.done():
+                next_frame = asyncio.ensure_future(self.broadcaster.frames(seq))
+                await asyncio.wait([next_frame, closed], return_when=asyncio.FIRST_COMPLETED)
+
+                if not next_frame.done():
+                    next_frame.cancel()
+                    break
+
+                seq, jpeg = next_frame.result()
+                writer.write(websocket_frame(jpeg))
+                writer.write(jpeg)
+                await asyncio.wait_for(writer.drain(), self.write_timeout)
+        finally:
+            closed.cancel()
+
+    @staticmethod
+    async def _read_websocket(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Читает управляющие кадры клиента: отвечает на ping и завершается при закрытии соединения
+
+        :param asyncio.StreamReader reader: Поток чтения соединения
+        :param asyncio.StreamWriter writer: Поток записи соединения
+        """
+        try:
+            while True:
+                opcode, payload = await read_websocket_frame(reader)
+
+                if opcode == WS_PING:
+                    writer.write(websocket_frame(payload, WS_PONG) + payload)
+                elif opcode == WS_CLOSE:
+                    writer.write(websocket_frame(payload[:2], WS_CLOSE) + payload[:2])
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ProtocolError):
+            return
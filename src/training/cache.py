@@ -0,0 +1,310 @@
+import os
+import glob
+import json
+import math
+import time
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+from ultralytics.data.utils import IMG_FORMATS, check_det_dataset
+from ultralytics.utils.patches import imread
+
+logger = logging.getLogger(__name__)
+
+# Манифест кеша: размер, шарды и положение каждого изображения в них
+MANIFEST_NAME = "manifest.json"
+
+# Версия формата кеша: кеш другой версии перестраивается целиком
+CACHE_VERSION = 1
+
+# Количество изображений в одном шарде; шард imgsz=640 занимает около 1.2 ГБ
+SHARD_SIZE = 1024
+
+
+def resize_long_side(image: np.ndarray, imgsz: int) -> np.ndarray:
+    """Масштабирует изображение так, чтобы длинная сторона была равна imgsz, с сохранением пропорций
+
+    Повторяет масштабирование ultralytics BaseDataset.load_image, поэтому изображения
+    из кеша совпадают с прочитанными с диска.
+
+    :param np.ndarray image: Изображение (H, W, 3)
+    :param int imgsz: Размер входа модели
+    :return np.ndarray: Масштабированное изображение
+    """
+    h0, w0 = image.shape[:2]
+    r = imgsz / max(h0, w0)
+
+    if r == 1:
+        return image
+
+    size = (min(math.ceil(w0 * r), imgsz), min(math.ceil(h0 * r), imgsz))
+    return cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)
+
+
+class ImageCache:
+
+    # Изображения, приведенные к размеру обучения, хранятся в шардах .npy формы (N, imgsz, imgsz, 3):
+    # изображение занимает левый верхний угол слота, а его размер записан в манифесте.
+    # Шарды открываются через np.memmap, поэтому чтение изображения — копирование из страничного кеша ОС
+    def __init__(self, cache_dir: str | Path, imgsz: int, shard_size: int = SHARD_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.imgsz = imgsz
+        self.shard_size = shard_size
+
+        # Путь изображения -> (шард, строка, исходные H и W, H и W после масштабирования)
+        self._entries: dict[str, tuple[int, int, int, int, int, int]] = {}
+        self._shard_names: list[str] = []
+        self._shards: dict[int, np.ndarray] = {}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_dir / MANIFEST_NAME
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str | Path) -> bool:
+        return _key(path) in self._entries
+
+    def update(self, files: list[str | Path], workers: int | None = None) -> bool:
+        """Открывает кеш, если в нем есть все изображения без изменений, иначе перестраивает его
+
+        :param list[str | Path] files: Пути изображений
+        :param int | None workers: Количество процессов подготовки
+        :return bool: True, если кеш был перестроен
+        """
+        if self.load(files):
+            return False
+
+        self.build(files, workers)
+        return True
+
+    def load(self, files: list[str | Path] | None = None) -> bool:
+        """Читает манифест кеша
+
+        :param list[str | Path] | None files: Изображения, которые должны быть в кеше без изменений с момента его сборки
+        :return bool: True, если кеш прочитан и подходит
+        """
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if manifest.get("version") != CACHE_VERSION or manifest.get("imgsz") != self.imgsz:
+            return False
+
+        images = manifest["images"]
+
+        for path in files or []:
+            entry = images.get(_key(path))
+            if entry is None or entry[-1] != _mtime_ns(path):
+                return False
+
+        self._shard_names = manifest["shards"]
+        self._entries = {path: tuple(entry[:-1]) for path, entry in images.items()}
+        self._shards.clear()
+        return True
+
+    def build(self, files: list[str | Path], workers: int | None = None) -> None:
+        """Декодирует и масштабирует изображения в пуле процессов и записывает их в шарды
+
+        Каждая задача пула заполняет свою часть шарда, открытого через np.memmap,
+        поэтому пиксели не передаются между процессами.
+
+        :param list[str | Path] files: Пути изображений
+        :param int | None workers: Количество процессов подготовки
+        """
+        started = time.perf_counter()
+        files = sorted({_key(path) for path in files})
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        for stale in self.cache_dir.glob("shard_*.npy"):
+            stale.unlink()
+        self.manifest_path.unlink(missing_ok=True)
+
+        shard_names, tasks = [], []
+        for shard, start in enumerate(range(0, len(files), self.shard_size)):
+            chunk = files[start:start + self.shard_size]
+            name = f"shard_{shard:05d}.npy"
+            shard_names.append(name)
+
+            np.lib.format.open_memmap(
+                self.cache_dir / name,
+                mode="w+",
+                dtype=np.uint8,
+                shape=(len(chunk), self.imgsz, self.imgsz, 3),
+            ).flush()
+
+            # Шард делится между задачами, чтобы его заполняли несколько процессов
+            step = max(1, math.ceil(len(chunk) / max(1, workers or os.cpu_count() or 1)))
+            for row in range(0, len(chunk), step):
+                tasks.append((str(self.cache_dir / name), shard, row, chunk[row:row + step], self.imgsz))
+
+        images, failed = {}, 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for written in pool.map(_write_rows, tasks):
+                for path, entry in written:
+                    if entry is None:
+                        failed += 1
+                        continue
+                    images[path] = entry
+
+        manifest = {
+            "version": CACHE_VERSION,
+            "imgsz": self.imgsz,
+            "shards": shard_names,
+            "images": images,
+        }
+
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        self._shard_names = shard_names
+        self._entries = {path: tuple(entry[:-1]) for path, entry in images.items()}
+        self._shards.clear()
+
+        logger.info(
+            "Кеш изображений %s собран за %.1f с: изображений %d, шардов %d, не прочитано %d",
+            self.cache_dir,
+            time.perf_counter() - started,
+            len(images),
+            len(shard_names),
+            failed,
+        )
+
+    def get(self, path: str | Path) -> tuple[np.ndarray, tuple[int, int], tuple[int, int]] | None:
+        """Возвращает масштабированное изображение из кеша
+
+        :param str | Path path: Путь изображения
+        :return tuple | None: Изображение (только для чтения), исходные (H, W) и (H, W) после масштабирования
+            или None, если изображения нет в кеше
+        """
+        entry = self._entries.get(_key(path))
+        if entry is None:
+            return None
+
+        shard, row, h0, w0, h, w = entry
+        return self._shard(shard)[row, :h, :w], (h0, w0), (h, w)
+
+    def _shard(self, shard: int) -> np.ndarray:
+        if shard not in self._shards:
+            self._shards[shard] = np.load(self.cache_dir / self._shard_names[shard], mmap_mode="r")
+        return self._shards[shard]
+
+    def __getstate__(self) -> dict:
+        # Процессы DataLoader открывают шарды заново, иначе np.memmap сериализуется вместе с данными
+        state = self.__dict__.copy()
+        state["_shards"] = {}
+        return state
+
+
+def _write_rows(task: tuple[str, int, int, list[str], int]) -> list[tuple[str, list[int] | None]]:
+    """Записывает изображения в строки шарда; выполняется в процессе пула
+
+    :param tuple task: Путь шарда, его номер, первая строка, пути изображений и размер входа модели
+    :return list: Путь изображения и запись манифеста: шард, строка, исходные H и W, H и W после
+        масштабирования и время изменения файла; None, если изображение не прочитано
+    """
+    shard_path, shard, first_row, paths, imgsz = task
+    array = np.load(shard_path, mmap_mode="r+")
+    written = []
+
+    for row, path in enumerate(paths, start=first_row):
+        image = imread(path, flags=cv2.IMREAD_COLOR)
+        if image is None:
+            logger.warning("Не удалось прочитать изображение: %s", path)
+            written.append((path, None))
+            continue
+
+        h0, w0 = image.shape[:2]
+        image = resize_long_side(image, imgsz)
+        h, w = image.shape[:2]
+        array[row, :h, :w] = image
+        written.append((path, [shard, row, h0, w0, h, w, _mtime_ns(path)]))
+
+    array.flush()
+    return written
+
+
+def dataset_images(data: str | Path) -> dict[str, list[str]]:
+    """Находит изображения обучающей и валидационной выборок датасета так же, как ultralytics
+
+    :param str | Path data: Путь к data.yaml
+    :return dict[str, list[str]]: Пути изображений по выборкам
+    """
+    dataset = check_det_dataset(str(data))
+    splits = {}
+
+    for split in ("train", "val"):
+        sources = dataset.get(split)
+        if not sources:
+            continue
+
+        files = []
+        for source in sources if isinstance(sources, list) else [sources]:
+            source = Path(source)
+            if source.is_dir():
+                files += glob.glob(str(Path(glob.escape(str(source))) / "**" / "*.*"), recursive=True)
+            elif source.is_file():
+                parent = str(source.parent) + os.sep
+                lines = source.read_text(encoding="utf-8").strip().splitlines()
+                files += [line.replace("./", parent, 1) if line.startswith("./") else line for line in lines]
+
+        splits[split] = sorted(path for path in files if path.rpartition(".")[-1].lower() in IMG_FORMATS)
+
+    return splits
+
+
+def default_cache_dir(data: str | Path) -> Path:
+    """Возвращает директорию кеша по умолчанию
+
+    :param str | Path data: Путь к data.yaml
+    :return Path: Директория .image_cache рядом с data.yaml
+    """
+    return Path(data).resolve().parent / ".image_cache"
+
+
+def _key(path: str | Path) -> str:
+    return os.path.abspath(path)
+
+
+def _mtime_ns(path: str | Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Подготовка кеша изображений для обучения")
+
+    parser.add_argument('--data', type=str, required=True, help='Путь к data.yaml')
+    parser.add_argument('--imgsz', type=int, default=640, help='Размер входного изображения')
+    parser.add_argument('--cache_dir', type=str, default=None, help='Директория кеша; по умолчанию рядом с data.yaml')
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов подготовки')
+    parser.add_argument('--shard_size', type=int, default=SHARD_SIZE, help='Количество изображений в шарде')
+
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir(args.data)
+
+    for split, files in dataset_images(args.data).items():
+        cache = ImageCache(cache_dir / split, args.imgsz, args.shard_size)
+        if not cache.update(files, args.workers):
+            logger.info("Кеш %s актуален: изображений %d", cache.cache_dir, len(cache))
+
+
+if __name__ == '__main__':
+    main()
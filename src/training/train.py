@@ -1,7 +1,10 @@
 import argparse
+from functools import partial
 
 from ultralytics import YOLO
 
+from src.training.trainer import CachedSegmentationTrainer
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Train YOLOv11 Segmentation with custom parameters")
@@ -16,6 +19,20 @@ def parse_args():
     parser.add_argument('--weight_decay', type=float, default=0.0005, help='Weight decay')
     parser.add_argument('--optimizer', type=str, default='auto', help='Оптимизатор: SGD или Adam')
 
+    parser.add_argument('--workers', type=int, default=8, help='Количество процессов загрузки данных')
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default='mmap',
+        choices=['none', 'ram', 'disk', 'mmap'],
+        help='Кеш изображений: mmap - шарды с изображениями размера imgsz, ram и disk - кеш ultralytics',
+    )
+    parser.add_argument('--cache_dir', type=str, default=None, help='Директория кеша mmap; по умолчанию рядом с data.yaml')
+    parser.add_argument('--device', type=str, default=None, help='Устройство: cpu, 0, 0,1')
+    parser.add_argument('--amp', action=argparse.BooleanOptionalAction, default=True, help='Смешанная точность')
+    parser.add_argument('--resume', type=str, default=None, help='Продолжить обучение с чекпоинта last.pt')
+    parser.add_argument('--project', type=str, default=None, help='Директория результатов')
+    parser.add_argument('--name', type=str, default=None, help='Имя запуска')
 
     parser.add_argument('--hsv_h', type=float, default=0.015, help='Hue augmentation')
     parser.add_argument('--hsv_s', type=float, default=0.7, help='Saturation augmentation')
@@ -31,13 +48,17 @@ def parse_args():
 def main():
     args = parse_args()
 
-    augment = bool(args.augment)
-    project = bool(args.project)
+    if args.resume:
+        # Параметры обучения восстанавливаются из чекпоинта
+        model = YOLO(args.resume)
+        model.train(resume=True, trainer=_trainer(args), workers=args.workers, device=args.device)
+        return
 
     model = YOLO(args.model)
 
     model.train(
         data=args.data,
+        trainer=_trainer(args),
 
         imgsz=args.imgsz,
         batch=args.batch,
@@ -46,6 +67,13 @@ def main():
         weight_decay=args.weight_decay,
         optimizer=args.optimizer,
 
+        workers=args.workers,
+        cache=args.cache if args.cache in ('ram', 'disk') else False,
+        device=args.device,
+        amp=args.amp,
+        project=args.project,
+        name=args.name,
+
         hsv_h=args.hsv_h,
         hsv_s=args.hsv_s,
         hsv_v=args.hsv_v,
@@ -55,5 +83,12 @@ def main():
     )
 
 
+def _trainer(args):
+    if args.cache != 'mmap':
+        return None
+
+    return partial(CachedSegmentationTrainer, cache_dir=args.cache_dir)
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,72 @@
+import os
+import logging
+from pathlib import Path
+
+import numpy as np
+from ultralytics.utils import DEFAULT_CFG
+from ultralytics.data.base import BaseDataset
+from ultralytics.models.yolo.segment import SegmentationTrainer
+
+from .cache import ImageCache, default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+class CachedImageLoader:
+
+    # Заменяет load_image датасета ultralytics: изображения берутся из ImageCache вместо
+    # декодирования с диска; остальные режимы и отсутствующие в кеше файлы читаются как обычно
+    def __init__(self, dataset: BaseDataset, cache: ImageCache):
+        self.dataset = dataset
+        self.cache = cache
+
+    def __call__(
+        self, i: int, rect_mode: bool = True, resize_short: bool = False
+    ) -> tuple[np.ndarray, tuple[int, int], tuple[int, int]]:
+        dataset = self.dataset
+
+        if dataset.ims[i] is not None:
+            return dataset.ims[i], dataset.im_hw0[i], dataset.im_hw[i]
+
+        cached = self.cache.get(dataset.im_files[i]) if rect_mode and not resize_short else None
+        if cached is None or dataset.channels != 3:
+            return type(dataset).load_image(dataset, i, rect_mode, resize_short)
+
+        # Копия из отображенного шарда: аугментации изменяют изображение на месте
+        image, hw0, hw = cached
+        image = np.array(image)
+
+        # Буфер нужен мозаике: из него выбираются изображения для смешивания
+        if dataset.augment:
+            dataset.ims[i], dataset.im_hw0[i], dataset.im_hw[i] = image, hw0, hw
+            dataset.buffer.append(i)
+            if 1 < len(dataset.buffer) >= dataset.max_buffer_length:
+                j = dataset.buffer.pop(0)
+                dataset.ims[j], dataset.im_hw0[j], dataset.im_hw[j] = None, None, None
+
+        return image, hw0, hw
+
+
+class CachedSegmentationTrainer(SegmentationTrainer):
+
+    # Обучение сегментации на изображениях из ImageCache; кеш каждой выборки
+    # собирается при первом запуске и переиспользуется, пока изображения не изменятся
+    def __init__(
+        self,
+        cfg=DEFAULT_CFG,
+        overrides: dict | None = None,
+        _callbacks: dict | None = None,
+        cache_dir: str | Path | None = None,
+    ):
+        super().__init__(cfg, overrides, _callbacks)
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir(self.args.data)
+
+    def build_dataset(self, img_path: str, mode: str = "train", batch: int | None = None):
+        dataset = super().build_dataset(img_path, mode, batch)
+
+        cache = ImageCache(self.cache_dir / mode, self.args.imgsz)
+        cache.update(dataset.im_files, workers=max(1, self.args.workers or os.cpu_count() or 1))
+        dataset.load_image = CachedImageLoader(dataset, cache)
+
+        logger.info("Выборка %s читается из кеша %s: изображений %d", mode, cache.cache_dir, len(cache))
+        return dataset
@@ -0,0 +1,13 @@
+from .chunks import Chunk, VideoInfo, plan_chunks, probe_video, probe_keyframes
+from .stitch import stitch_chunks
+from .transcoder import VideoTranscoder
+
+__all__ = [
+    'VideoTranscoder',
+    'Chunk',
+    'VideoInfo',
+    'plan_chunks',
+    'probe_video',
+    'probe_keyframes',
+    'stitch_chunks',
+]
@@ -0,0 +1,126 @@
+import shutil
+import subprocess
+from pathlib import Path
+from dataclasses import dataclass
+
+import cv2
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Непрерывный отрезок видео, обрабатываемый одним процессом.
+
+    :param Path source: Путь до исходного видео
+    :param int index: Порядковый номер отрезка в видео
+    :param int start: Номер первого кадра
+    :param int | None end: Номер кадра, следующего за последним; None — до конца видео
+    :param Path output: Путь для сохранения обработанного отрезка
+    """
+    source: Path
+    index: int
+    start: int
+    end: int | None
+    output: Path
+
+
+@dataclass(frozen=True)
+class VideoInfo:
+    """Параметры видеопотока.
+
+    :param int width: Ширина кадра
+    :param int height: Высота кадра
+    :param float fps: Частота кадров
+    :param int frame_count: Количество кадров по данным контейнера
+    """
+    width: int
+    height: int
+    fps: float
+    frame_count: int
+
+
+def probe_video(path: str | Path) -> VideoInfo:
+    """Считывает параметры видео
+
+    :param str | Path path: Путь до видео
+    :raises ValueError: Если видео не удалось открыть
+    :return VideoInfo: Параметры видеопотока
+    """
+    cap = cv2.VideoCapture(str(path))
+
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Не удалось открыть видео: {path}")
+
+        return VideoInfo(
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(cap.get(cv2.CAP_PROP_FPS) or 30.0),
+            frame_count=int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        )
+    finally:
+        cap.release()
+
+
+def probe_keyframes(path: str | Path, fps: float) -> list[int] | None:
+    """Определяет номера ключевых кадров по пакетам контейнера без декодирования
+
+    :param str | Path path: Путь до видео
+    :param float fps: Частота кадров
+    :return list[int] | None: Номера ключевых кадров или None, если ffprobe недоступен
+    """
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+
+    command = [
+        ffprobe, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", str(path),
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    keyframes = []
+    for line in output.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            keyframes.append(round(float(pts_time) * fps))
+
+    return sorted(set(keyframes)) or None
+
+
+def plan_chunks(
+    frame_count: int,
+    chunks: int,
+    gop_size: int = 250,
+    keyframes: list[int] | None = None,
+    min_chunk_frames: int = 50,
+) -> list[tuple[int, int | None]]:
+    """Делит видео на отрезки, начинающиеся с ключевых кадров
+
+    Начало отрезка на ключевом кадре позволяет процессу начать декодирование без
+    чтения предыдущей группы кадров. Если ключевые кадры неизвестны, границы
+    выравниваются по размеру группы кадров.
+
+    :param int frame_count: Количество кадров в видео
+    :param int chunks: Желаемое количество отрезков
+    :param int gop_size: Размер группы кадров, если ключевые кадры неизвестны
+    :param list[int] | None keyframes: Номера ключевых кадров
+    :param int min_chunk_frames: Минимальная длина отрезка в кадрах
+    :return list[tuple[int, int | None]]: Пары (первый кадр, следующий за последним кадр); у последнего отрезка конец None
+    """
+    if frame_count <= 0 or chunks <= 1:
+        return [(0, None)]
+
+    candidates = keyframes if keyframes else list(range(0, frame_count, max(1, gop_size)))
+
+    boundaries = [0]
+    for i in range(1, chunks):
+        ideal = frame_count * i / chunks
+        boundary = min(candidates, key=lambda frame: abs(frame - ideal))
+
+        if boundary - boundaries[-1] >= max(1, min_chunk_frames) and frame_count - boundary >= min_chunk_frames:
+            boundaries.append(boundary)
+
+    return list(zip(boundaries, boundaries[1:] + [None]))
@@ -0,0 +1,54 @@
+import argparse
+
+from src.config import PipelineConfig, SegmenterConfig, BackgroundConfig
+from src.config.path import DEFAULT_MODEL_PATHS
+from src.modules.background import SolidColorBackground
+
+from .transcoder import VideoTranscoder
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Пакетная обработка записанных видео конвейером замены фона")
+
+    parser.add_argument('input', type=str, help='Путь до видео или директории с видео')
+    parser.add_argument('--output', type=str, required=True, help='Директория для обработанных видео')
+    parser.add_argument('--model', type=str, default='yolo', choices=['yolo', 'yolo_onnx', 'mediapipe'], help='Бэкенд сегментации')
+    parser.add_argument('--model_path', type=str, default=None, help='Путь до модели сегментации')
+    parser.add_argument('--inference_size', type=int, default=None, help='Размер большей стороны кадра для инференса')
+    parser.add_argument('--color', type=int, nargs=3, default=[0, 255, 0], help='Цвет фона, RGB')
+    parser.add_argument('--blending', type=str, default='hard', choices=['hard', 'soft'], help='Режим смешивания')
+
+    parser.add_argument('--workers', type=int, default=None, help='Количество процессов; по умолчанию — по числу ядер')
+    parser.add_argument('--chunks_per_worker', type=int, default=2, help='Количество отрезков видео на процесс')
+    parser.add_argument('--gop', type=int, default=250, help='Размер группы кадров, если ключевые кадры не определены')
+    parser.add_argument('--threads', type=int, default=1, help='Количество потоков вычислительных библиотек на процесс')
+    parser.add_argument('--fourcc', type=str, default='mp4v', help='Кодек выходного видео')
+    parser.add_argument('--suffix', type=str, default='.mp4', help='Расширение выходного видео')
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    config = PipelineConfig(
+        segmenter=SegmenterConfig(
+            model=args.model,
+            model_path=args.model_path or str(DEFAULT_MODEL_PATHS[args.model]),
+            inference_size=args.inference_size,
+        ),
+        background=BackgroundConfig(SolidColorBackground(tuple(args.color)), blending=args.blending),
+    )
+
+    transcoder = VideoTranscoder(
+        config,
+        workers=args.workers,
+        chunks_per_worker=args.chunks_per_worker,
+        gop_size=args.gop,
+        fourcc=args.fourcc,
+        suffix=args.suffix,
+        threads_per_worker=args.threads,
+    )
+
+    for output in transcoder.transcode(transcoder.collect_inputs(args.input), args.output):
+        print(output)
@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+from collections.abc import Sequence
+
+import cv2
+
+
+def stitch_chunks(
+    chunks: Sequence[Path],
+    output: Path,
+    fourcc: str,
+    fps: float,
+    size: tuple[int, int],
+) -> None:
+    """Склеивает обработанные отрезки в одно видео в заданном порядке
+
+    При наличии ffmpeg отрезки склеиваются без перекодирования, иначе кадры
+    перезаписываются через cv2.VideoWriter.
+
+    :param Sequence[Path] chunks: Пути до отрезков в порядке следования
+    :param Path output: Путь до итогового видео
+    :param str fourcc: Кодек итогового видео
+    :param float fps: Частота кадров
+    :param tuple[int, int] size: Размер кадра (W, H)
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    if len(chunks) == 1:
+        shutil.move(chunks[0], output)
+        return
+
+    if not _concat_ffmpeg(chunks, output):
+        _concat_opencv(chunks, output, fourcc, fps, size)
+
+
+def _concat_ffmpeg(chunks: Sequence[Path], output: Path) -> bool:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return False
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for chunk in chunks:
+            path = str(Path(chunk).resolve()).replace("'", r"'\''")
+            listing.write(f"file '{path}'\n")
+
+    try:
+        command = [ffmpeg, "-v", "error", "-y", "-f", "concat", "-safe", "0", "-i", listing.name, "-c", "copy", str(output)]
+        return subprocess.run(command, capture_output=True).returncode == 0
+    except OSError:
+        return False
+    finally:
+        os.unlink(listing.name)
+
+
+def _concat_opencv(chunks: Sequence[Path], output: Path, fourcc: str, fps: float, size: tuple[int, int]) -> None:
+    writer = cv2.VideoWriter(str(output), cv2.VideoWriter_fourcc(*fourcc), fps, size)
+
+    try:
+        for chunk in chunks:
+            cap = cv2.VideoCapture(str(chunk))
+            try:
+                while True:
+                    ok, frame = cap.read()
+                    if not ok:
+                        break
+                    writer.write(frame)
+            finally:
+                cap.release()
+    finally:
+        writer.release()
@@ -0,0 +1,146 @@
+import os
+import shutil
+import multiprocessing
+from pathlib import Path
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tqdm import tqdm
+
+from src.config import PipelineConfig
+from src.dataset_tools.extensions import VideoExtensions
+
+from .chunks import Chunk, VideoInfo, plan_chunks, probe_video, probe_keyframes
+from .stitch import stitch_chunks
+from .worker import init_worker, process_chunk
+
+
+class VideoTranscoder:
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        workers: int | None = None,
+        chunks_per_worker: int = 2,
+        gop_size: int = 250,
+        fourcc: str = 'mp4v',
+        suffix: str = '.mp4',
+        threads_per_worker: int = 1,
+    ):
+        self.config = config
+        self.workers = workers or os.cpu_count() or 1
+        self.chunks_per_worker = chunks_per_worker
+        self.gop_size = gop_size
+        self.fourcc = fourcc
+        self.suffix = suffix
+        self.threads_per_worker = threads_per_worker
+
+    @staticmethod
+    def collect_inputs(path: str | Path) -> list[Path]:
+        """Возвращает видео для обработки
+
+        :param str | Path path: Путь до видео или директории с видео
+        :raises FileNotFoundError: Если путь не существует
+        :return list[Path]: Пути до видео
+        """
+        path = Path(path)
+
+        if not path.exists():
+            raise FileNotFoundError(f"Путь не найден: {path}")
+
+        if path.is_file():
+            return [path]
+
+        extensions = VideoExtensions.get_extensions()
+        return sorted(p for p in path.iterdir() if p.is_file() and p.suffix.lower() in extensions)
+
+    def transcode(self, inputs: Iterable[str | Path], output_dir: str | Path) -> list[Path]:
+        """Обрабатывает видео конвейером кадров в пуле процессов
+
+        Отрезки всех видео обрабатываются общим пулом, поэтому процессы остаются
+        загруженными и при большом количестве коротких записей.
+
+        :param Iterable[str | Path] inputs: Пути до видео
+        :param str | Path output_dir: Директория для обработанных видео
+        :raises ValueError: Если у видео совпадают имена без расширения или директория
+            для обработанных видео совпадает с директорией исходного видео
+        :return list[Path]: Пути до обработанных видео в порядке входных
+        """
+        output_dir = Path(output_dir)
+        sources = list(dict.fromkeys(map(Path, inputs)))
+
+        # Выходное видео и директория отрезков называются по имени без расширения,
+        # поэтому a.mp4 и a.mov перезаписали бы друг друга
+        stems = [source.stem for source in sources]
+        duplicates = sorted({stem for stem in stems if stems.count(stem) > 1})
+        if duplicates:
+            raise ValueError(f"Видео с одинаковыми именами без расширения: {', '.join(duplicates)}")
+
+        # Обработанное видео с тем же именем и суффиксом перезаписало бы исходное
+        for source in sources:
+            if source.resolve().parent == output_dir.resolve():
+                raise ValueError(f"Директория для обработанных видео совпадает с директорией исходного видео: {source}")
+
+        videos: dict[Path, tuple[VideoInfo, list[Chunk], Path]] = {}
+        for source in sources:
+            info = probe_video(source)
+            output = output_dir / f"{source.stem}{self.suffix}"
+            videos[source] = (info, self._plan(source, info, output_dir), output)
+
+        pending: dict[Path, set[int]] = {source: {c.index for c in chunks} for source, (_, chunks, _) in videos.items()}
+        frames_total = sum(info.frame_count for info, _, _ in videos.values())
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=init_worker,
+            initargs=(self.config, self.threads_per_worker),
+        ) as executor:
+            futures = {
+                executor.submit(process_chunk, chunk, self.fourcc, info.fps, (info.width, info.height)): source
+                for source, (info, chunks, _) in videos.items()
+                for chunk in chunks
+            }
+
+            try:
+                with tqdm(total=frames_total, unit="frame", desc="Обработка видео") as progress:
+                    for future in as_completed(futures):
+                        source = futures[future]
+                        index, written = future.result()
+                        progress.update(written)
+
+                        pending[source].discard(index)
+                        if not pending[source]:
+                            self._finish(source, *videos[source])
+            except BaseException:
+                # Ожидающие отрезки отменяются, чтобы ошибка не ждала обработки всех остальных видео
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        return [output for _, _, output in videos.values()]
+
+    def _plan(self, source: Path, info: VideoInfo, output_dir: Path) -> list[Chunk]:
+        """Делит видео на отрезки по ключевым кадрам
+
+        :param Path source: Путь до видео
+        :param VideoInfo info: Параметры видеопотока
+        :param Path output_dir: Директория для обработанных видео
+        :return list[Chunk]: Отрезки видео
+        """
+        keyframes = probe_keyframes(source, info.fps)
+        bounds = plan_chunks(info.frame_count, self.workers * self.chunks_per_worker, self.gop_size, keyframes)
+
+        chunk_dir = self._chunk_dir(source, output_dir)
+        return [
+            Chunk(source, i, start, end, chunk_dir / f"{i:05d}{self.suffix}")
+            for i, (start, end) in enumerate(bounds)
+        ]
+
+    def _finish(self, source: Path, info: VideoInfo, chunks: list[Chunk], output: Path) -> None:
+        stitch_chunks([chunk.output for chunk in chunks], output, self.fourcc, info.fps, (info.width, info.height))
+        shutil.rmtree(self._chunk_dir(source, output.parent), ignore_errors=True)
+
+    @staticmethod
+    def _chunk_dir(source: Path, output_dir: Path) -> Path:
+        return output_dir / f".{source.stem}.chunks"
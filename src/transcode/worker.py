@@ -0,0 +1,78 @@
+import os
+import sys
+
+import cv2
+
+from src.config import PipelineConfig
+
+from .chunks import Chunk
+
+# Экземпляр конвейера текущего процесса, создаваемый один раз при запуске процесса
+_pipeline = None
+
+
+def init_worker(config: PipelineConfig, threads: int = 1) -> None:
+    """Создает конвейер в процессе пула
+
+    Число потоков библиотек ограничивается до загрузки модели, чтобы процессы
+    не конкурировали за ядра и производительность росла с их количеством.
+
+    :param PipelineConfig config: Параметры конвейера
+    :param int threads: Количество потоков вычислительных библиотек на процесс
+    """
+    global _pipeline
+
+    for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    cv2.setNumThreads(threads)
+
+    from src.pipeline import FramePipeline
+
+    _pipeline = FramePipeline(config)
+
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+
+def process_chunk(chunk: Chunk, fourcc: str, fps: float, size: tuple[int, int]) -> tuple[int, int]:
+    """Обрабатывает отрезок видео и сохраняет результат
+
+    :param Chunk chunk: Отрезок видео
+    :param str fourcc: Кодек выходного видео
+    :param float fps: Частота кадров выходного видео
+    :param tuple[int, int] size: Размер кадра (W, H)
+    :raises RuntimeError: Если процесс не инициализирован или видео не удалось открыть
+    :return tuple[int, int]: Номер отрезка и количество записанных кадров
+    """
+    if _pipeline is None:
+        raise RuntimeError("Процесс не инициализирован: init_worker не был вызван")
+
+    cap = cv2.VideoCapture(str(chunk.source))
+    if not cap.isOpened():
+        raise RuntimeError(f"Не удалось открыть видео: {chunk.source}")
+
+    chunk.output.parent.mkdir(parents=True, exist_ok=True)
+    writer = cv2.VideoWriter(str(chunk.output), cv2.VideoWriter_fourcc(*fourcc), fps, size)
+
+    # Состояние временной сегментации не должно переходить между отрезками
+    _pipeline.segmenter.reset()
+
+    written = 0
+    try:
+        if chunk.start:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, chunk.start)
+
+        while chunk.end is None or chunk.start + written < chunk.end:
+            ok, frame = cap.read()
+            if not ok:
+                break
+
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            out = _pipeline.process(frame)
+            writer.write(cv2.cvtColor(out, cv2.COLOR_RGB2BGR))
+            written += 1
+    finally:
+        cap.release()
+        writer.release()
+
+    return chunk.index, written
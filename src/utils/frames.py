@@ -0,0 +1,30 @@
+import cv2
+import numpy as np
+
+
+def synthetic_frames(count: int, size: tuple[int, int], seed: int = 0) -> list[np.ndarray]:
+    """Генерирует кадры с фоном-градиентом и движущимся силуэтом
+
+    :param int count: Количество кадров
+    :param tuple[int, int] size: Ширина и высота кадра
+    :param int seed: Зерно генератора шума
+    :return list[np.ndarray]: Кадры (H, W, 3) в формате RGB
+    """
+    width, height = size
+    rng = np.random.default_rng(seed)
+
+    gradient = np.linspace(40, 200, width, dtype=np.float32)
+    background = np.repeat(np.tile(gradient, (height, 1))[..., np.newaxis], 3, axis=2)
+
+    frames = []
+    for i in range(count):
+        frame = background + rng.normal(0, 4, background.shape).astype(np.float32)
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+
+        cx = int(width * (0.5 + 0.1 * np.sin(i / 15)))
+        cv2.ellipse(frame, (cx, int(height * 0.35)), (width // 14, height // 8), 0, 0, 360, (220, 180, 150), -1)
+        cv2.ellipse(frame, (cx, height), (width // 6, height // 2), 0, 180, 360, (30, 60, 120), -1)
+
+        frames.append(frame)
+
+    return frames
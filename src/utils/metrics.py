@@ -0,0 +1,90 @@
+import cv2
+import numpy as np
+
+
+def mask_iou(pred: np.ndarray, target: np.ndarray) -> float:
+    """Считает IoU переднего плана двух масок
+
+    :param np.ndarray pred: Предсказанная маска (H, W); 0 — фон
+    :param np.ndarray target: Эталонная маска (H, W); 0 — фон
+    :return float: IoU; 1.0, если обе маски пусты
+    """
+    pred = pred != 0
+    target = target != 0
+
+    union = np.count_nonzero(pred | target)
+    if union == 0:
+        return 1.0
+
+    return np.count_nonzero(pred & target) / union
+
+
+def mask_boundary(mask: np.ndarray, width: int) -> np.ndarray:
+    """Выделяет внутреннюю границу переднего плана заданной ширины
+
+    :param np.ndarray mask: Маска (H, W); 0 — фон
+    :param int width: Ширина границы в пикселях
+    :return np.ndarray: Бинарная маска границы (H, W)
+    """
+    mask = (mask != 0).astype(np.uint8)
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * width + 1, 2 * width + 1))
+    eroded = cv2.erode(mask, kernel, borderType=cv2.BORDER_CONSTANT, borderValue=0)
+
+    return (mask - eroded).astype(bool)
+
+
+def boundary_iou(pred: np.ndarray, target: np.ndarray, dilation_ratio: float = 0.02) -> float:
+    """Считает Boundary IoU переднего плана двух масок
+
+    :param np.ndarray pred: Предсказанная маска (H, W); 0 — фон
+    :param np.ndarray target: Эталонная маска (H, W); 0 — фон
+    :param float dilation_ratio: Ширина границы относительно диагонали кадра
+    :return float: Boundary IoU; 1.0, если границы обеих масок пусты
+    """
+    h, w = target.shape[:2]
+    width = max(1, round(dilation_ratio * np.hypot(h, w)))
+
+    pred_boundary = mask_boundary(pred, width)
+    target_boundary = mask_boundary(target, width)
+
+    union = np.count_nonzero(pred_boundary | target_boundary)
+    if union == 0:
+        return 1.0
+
+    return np.count_nonzero(pred_boundary & target_boundary) / union
+
+
+def boundary_fscore(pred: np.ndarray, target: np.ndarray, tolerance_ratio: float = 0.0075) -> float:
+    """Считает F-меру границ переднего плана двух масок
+
+    Пиксель границы одной маски считается совпавшим, если на расстоянии не больше
+    допуска есть пиксель границы другой маски.
+
+    :param np.ndarray pred: Предсказанная маска (H, W); 0 — фон
+    :param np.ndarray target: Эталонная маска (H, W); 0 — фон
+    :param float tolerance_ratio: Допуск относительно диагонали кадра
+    :return float: F-мера границ; 1.0, если границы обеих масок пусты
+    """
+    h, w = target.shape[:2]
+    tolerance = max(1, round(tolerance_ratio * np.hypot(h, w)))
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * tolerance + 1, 2 * tolerance + 1))
+
+    pred_boundary = mask_boundary(pred, 1)
+    target_boundary = mask_boundary(target, 1)
+
+    pred_count = np.count_nonzero(pred_boundary)
+    target_count = np.count_nonzero(target_boundary)
+    if pred_count == 0 and target_count == 0:
+        return 1.0
+    if pred_count == 0 or target_count == 0:
+        return 0.0
+
+    pred_near = cv2.dilate(pred_boundary.astype(np.uint8), kernel).astype(bool)
+    target_near = cv2.dilate(target_boundary.astype(np.uint8), kernel).astype(bool)
+
+    precision = np.count_nonzero(pred_boundary & target_near) / pred_count
+    recall = np.count_nonzero(target_boundary & pred_near) / target_count
+    if precision + recall == 0:
+        return 0.0
+
+    return 2 * precision * recall / (precision + recall)